@@ -1,145 +1,127 @@
 import math
-from SRPT_Selector import select_next_job_optimized as srpt_select_next_job
-from BAL_Selector import select_starving_job, select_starving_job_optimized
+from SRPT_Selector import SRPTSelector
+from Sim_Kernel import Policy, simulate
+from Job_Set import JobSet, as_job_set
+from Flow_Metrics import completion_path, save_completion_times
+import heapq
 import os
 import csv
 import re
 import glob
-import copy
 import logging
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
-def Bal(jobs):
+def starvation_time(arrival_time, remaining_time, starvation_threshold):
+    """First integer time t at which (t - arrival_time) / max(1, remaining_time) > starvation_threshold."""
+    scale = max(1, remaining_time)
+    t = math.floor(arrival_time + starvation_threshold * scale) + 1
+    # Settle float rounding against the exact ratio test used by the scheduler
+    while (t - 1 - arrival_time) / scale > starvation_threshold:
+        t -= 1
+    while not (t - arrival_time) / scale > starvation_threshold:
+        t += 1
+    return t
+
+class BALPolicy(Policy):
     """
-    Optimized BAL scheduler:
+    BAL on the shared Sim_Kernel:
     - Starvation rule: waiting_time_ratio = (t - arrival_time) / max(1, remaining_time);
-      a job becomes starving when this ratio > N^(2/3) (N = total jobs). We store its first
-      starving_time and prefer the earliest starving_time, then larger ratio, then smaller index.
-    - Event-driven time advance: run selected job until min(next_arrival, completion).
+      a job becomes starving when this ratio > starvation_threshold (default N^(2/3), N = total
+      jobs). We store its first starving_time and prefer the earliest starving_time, then
+      larger ratio, then smaller index.
+    - A waiting job's remaining time is fixed, so its crossing time is predictable
+      (starvation_time); crossings sit in a min-heap of predicted deadlines and are
+      policy events, so no per-event scan over the queue is needed.
     - Selection:
-        * If starving jobs exist: use select_starving_job_optimized (heap-backed).
-        * Else: use SRPT selector (heap-backed) on (remaining_time, arrival_time, job_index).
-    Returns (avg_flow_time, l2_norm_flow_time,max_flow_time).
+        * If starving jobs exist: earliest starving_time group; within it the largest current
+          ratio, then smallest index (ratios of jobs in one group can reorder over time, so they
+          are compared at selection time).
+        * Else: pop the persistent SRPTSelector heap on (remaining_time, arrival_time, job).
+    - queue_type picks the SRPTSelector backend: 'heap' (heapq) or 'bucket' (integer sizes).
     """
-    # Normalize jobs & index
-    norm = [{"arrival_time": int(j["arrival_time"]), "job_size": int(j["job_size"]), "job_index": i}
-            for i, j in enumerate(jobs)]
-    norm.sort(key=lambda x: x["arrival_time"])
-
-    total_jobs = len(norm)
-    if total_jobs == 0:
-        return 0.0, 0.0,0.0
 
-    starvation_threshold = total_jobs ** (2/3)
+    def __init__(self, queue_type='heap', starvation_threshold=None):
+        self.queue_type = queue_type
+        self.starvation_threshold = starvation_threshold
 
-    t = 0
-    i = 0  # next arrival pointer
-    q = []  # waiting queue of dicts with runtime fields
-    completed = []
+    def bind(self, kernel):
+        super().bind(kernel)
+        if self.starvation_threshold is None:
+            self.starvation_threshold = kernel.n_jobs ** (2/3)
+        self.srpt_queue = SRPTSelector(self.queue_type)  # non-starving waiting jobs
+        self.deadlines = []  # min-heap: (starvation_time, job, remaining_time when predicted)
+        self.starving_groups = {}  # starving_time -> jobs that became starving then
+        self.starving_times = []  # min-heap of keys of starving_groups
+        self.starving_time_of = {}  # job -> starving_time
 
-    while len(completed) < total_jobs:
-        # Admit arrivals up to time t
-        while i < total_jobs and norm[i]["arrival_time"] <= t:
-            q.append({
-                "arrival_time": norm[i]["arrival_time"],
-                "job_index": norm[i]["job_index"],
-                "remaining_time": norm[i]["job_size"],
-                "start_time": None,
-                "completion_time": None,
-                "starving_time": None,
-                "waiting_time_ratio": 0.0,
-            })
-            i += 1
+    def on_arrival(self, job, t):
+        """Queue a non-starving job and predict when it starts starving."""
+        arrival_time, remaining_time = self.kernel.arrival[job], self.kernel.remaining[job]
+        self.srpt_queue.add_job(job, arrival_time, remaining_time)
+        heapq.heappush(self.deadlines, (starvation_time(arrival_time, remaining_time, self.starvation_threshold),
+                                        job, remaining_time))
 
-        # Update ratios and starving_time stamps
-        if q:
-            for job in q:
-                if job["remaining_time"] > 0:
-                    job["waiting_time_ratio"] = (t - job["arrival_time"]) / max(1, job["remaining_time"])
-                    if job["waiting_time_ratio"] > starvation_threshold and job["starving_time"] is None:
-                        job["starving_time"] = t
+    def _next_deadline(self):
+        # Drop predictions of jobs that ran, finished or started starving since they were made
+        deadlines = self.deadlines
+        live = self.srpt_queue.remaining
+        while deadlines and live.get(deadlines[0][1]) != deadlines[0][2]:
+            heapq.heappop(deadlines)
+        return deadlines[0][0] if deadlines else None
 
-        # Separate starving / non-starving
-        starving = [job for job in q if job["waiting_time_ratio"] > starvation_threshold]
+    def select(self, t):
+        # Starvation crossings up to time t: stamp starving_time and move to the starving set
+        deadline = self._next_deadline()
+        while deadline is not None and deadline <= t:
+            _, job, _ = heapq.heappop(self.deadlines)
+            self.srpt_queue.remove_job(job)
+            self.starving_time_of[job] = t
+            if t not in self.starving_groups:
+                self.starving_groups[t] = []
+                heapq.heappush(self.starving_times, t)
+            self.starving_groups[t].append(job)
+            deadline = self._next_deadline()
 
-        # Choose job
-        selected = None
-        if starving:
-            picked = select_starving_job_optimized(starving)
-            # locate the exact dict in q
-            sel_idx = None
-            for idx, job in enumerate(q):
-                if job is picked or (job.get("starving_time") == picked.get("starving_time") and
-                                     job.get("waiting_time_ratio") == picked.get("waiting_time_ratio") and
-                                     job.get("job_index") == picked.get("job_index")):
-                    sel_idx = idx; break
-            if sel_idx is None:
-                # fallback: compute by key
-                sel_idx = min(range(len(q)),
-                              key=lambda k: (
-                                  0 if q[k] in starving else 1,
-                                  q[k].get("starving_time", float("inf")),
-                                  -float(q[k].get("waiting_time_ratio", 0.0)),
-                                  q[k].get("job_index", 0)))
-            selected = q.pop(sel_idx)
-        elif q:
-            # SRPT selection among waiting jobs
-            picked = srpt_select_next_job([
-                {"remaining_time": j["remaining_time"], "arrival_time": j["arrival_time"], "job_index": j["job_index"]}
-                for j in q
-            ])
-            sel_idx = min(range(len(q)),
-                          key=lambda k: (q[k]["remaining_time"], q[k]["arrival_time"], q[k]["job_index"]))
-            for k, j in enumerate(q):
-                if (j["remaining_time"], j["arrival_time"], j["job_index"]) == \
-                   (picked["remaining_time"], picked["arrival_time"], picked["job_index"]):
-                    sel_idx = k; break
-            selected = q.pop(sel_idx)
+        starving_times = self.starving_times
+        while starving_times and not self.starving_groups[starving_times[0]]:
+            del self.starving_groups[heapq.heappop(starving_times)]
+        if starving_times:
+            arrival, remaining, order = self.kernel.arrival, self.kernel.remaining, self.kernel.order
+            return min(self.starving_groups[starving_times[0]],
+                       key=lambda k: (-((t - arrival[k]) / max(1, remaining[k])), order[k]))
+        picked = self.srpt_queue.pop_next_job()
+        return None if picked is None else picked[2]
 
-        # If nothing to run, jump to next arrival
-        if selected is None:
-            if i < total_jobs:
-                t = max(t, norm[i]["arrival_time"])
-                continue
-            else:
-                break
+    def next_policy_event(self, job, t):
+        # Starvation crossing of a waiting job
+        return self._next_deadline()
 
-        # Start time record
-        if selected["start_time"] is None:
-            selected["start_time"] = t
+    def on_preempt(self, job, t):
+        # Starving jobs keep their place; others go back for reconsideration at the new time
+        if job not in self.starving_time_of:
+            self.on_arrival(job, t)
 
-        # Compute next arrival time
-        next_arrival_t = norm[i]["arrival_time"] if i < total_jobs else None
+    def on_complete(self, job, t):
+        if job in self.starving_time_of:
+            self.starving_groups[self.starving_time_of[job]].remove(job)
 
-        if next_arrival_t is None:
-            # No more arrivals: run to completion
-            t += selected["remaining_time"]
-            selected["completion_time"] = t
-            selected["remaining_time"] = 0
-            completed.append(selected)
-        else:
-            # Run until either next arrival or completion
-            delta = min(selected["remaining_time"], max(1, next_arrival_t - t))
-            t += delta
-            selected["remaining_time"] -= delta
-            if selected["remaining_time"] == 0:
-                selected["completion_time"] = t
-                completed.append(selected)
-            else:
-                # Put back to queue for reconsideration at new time
-                q.append(selected)
+def Bal(jobs, queue_type='heap', starvation_threshold=None, return_completion_times=False):
+    """
+    Optimized BAL scheduler: BALPolicy on the shared Sim_Kernel (event-driven time advance to
+    min(next_arrival, next starvation crossing, completion)).
+    starvation_threshold defaults to N^(2/3) for N = len(jobs).
+    Returns (avg_flow_time, l2_norm_flow_time,max_flow_time), plus the int64 completion
+    times in original job order when return_completion_times is set.
+    """
+    # Normalize jobs (a JobSet is simulated straight from its arrays)
+    if isinstance(jobs, JobSet):
+        norm = jobs.as_int()
+    else:
+        norm = [(int(j["arrival_time"]), int(j["job_size"])) for j in jobs]
+    return simulate(norm, BALPolicy(queue_type, starvation_threshold), return_completion_times)
 
-    # Metrics
-    flows = [c["completion_time"] - c["arrival_time"] for c in completed]
-    n = len(flows)
-    if n == 0:
-        return 0.0, 0.0,0.0
-    avg_flow = sum(flows) / n
-    l2 = (sum(f * f for f in flows)) ** 0.5
-    max_flow = max(flows)
-    return avg_flow, l2, max_flow
 def extract_version_from_path(folder_path):
     """Extract version number (1-10) from folder path like 'avg_30_2' or 'freq_16_2'"""
     # Match patterns like avg_30_1, freq_16_2, softrandom_3, etc.
@@ -186,20 +168,28 @@ def parse_freq_from_folder(folder_name):
     if match:
         return int(match.group(1))
     return None
-def run(jobs):
-    #Create a deep copy to ensure each mode gets fresh job data
-    jobs_copy = copy.deepcopy(jobs)
-    _, l2_norm_flow_time ,_ = Bal(jobs_copy)
+def run(jobs, completion_file=None):
+    # Bal never writes to a JobSet, so no per-run copy is needed
+    if completion_file is None:
+        _, l2_norm_flow_time ,_ = Bal(as_job_set(jobs))
+    else:
+        # Also persist the per-job completion times (original job order) as .npy
+        _, l2_norm_flow_time, _, completion_times = Bal(as_job_set(jobs), return_completion_times=True)
+        save_completion_times(completion_file, completion_times)
     logger.info(f"BAL: L2 norm = {l2_norm_flow_time:.4f}")
     return l2_norm_flow_time
 
-def run_random(jobs):
-    jobs_copy = copy.deepcopy(jobs)
-    _, l2_norm_flow_time, max_flow = Bal(jobs_copy)
+def run_random(jobs, completion_file=None):
+    if completion_file is None:
+        _, l2_norm_flow_time, max_flow = Bal(as_job_set(jobs))
+    else:
+        _, l2_norm_flow_time, max_flow, completion_times = Bal(as_job_set(jobs), return_completion_times=True)
+        save_completion_times(completion_file, completion_times)
     logger.info(f"BAL: L2 norm = {l2_norm_flow_time:.4f}, maximum flow time = {max_flow:.4f}")
     return l2_norm_flow_time, max_flow
-def process_avg_folders( data_dir, output_dir,algo_name="BAL"):
-    """Process all avg_30_*, avg_60_*, avg_90_* folders"""
+def process_avg_folders( data_dir, output_dir,algo_name="BAL", completion_dir=None):
+    """Process all avg_30_*, avg_60_*, avg_90_* folders.
+    With completion_dir set, each run's completion times are also saved there as .npy."""
     
     # Find all avg folders with version numbers
     avg_patterns = ['avg_30_*']
@@ -248,7 +238,8 @@ def process_avg_folders( data_dir, output_dir,algo_name="BAL"):
                     continue
                 
                 # Run Algorithm
-                _results = run(jobs)
+                completion_file = completion_path(completion_dir, data_dir, csv_file, algo_name) if completion_dir else None
+                _results = run(jobs, completion_file)
                 
                 # Store results
                 if arrival_rate not in results_by_arrival_rate:
@@ -286,8 +277,9 @@ def process_avg_folders( data_dir, output_dir,algo_name="BAL"):
                         writer.writerow(row)
                 
                 logger.info(f"  Saved results for arrival_rate={arrival_rate} to {output_file}")
-def process_random_folders(data_dir, output_dir):
-    """Process all freq_* folders for random files"""
+def process_random_folders(data_dir, output_dir, completion_dir=None):
+    """Process all freq_* folders for random files.
+    With completion_dir set, each run's completion times are also saved there as .npy."""
     
     # Create output directory
     random_result_dir = os.path.join(output_dir, 'random_result')
@@ -332,7 +324,8 @@ def process_random_folders(data_dir, output_dir):
             
             # Run algorithm and unpack results
             try:
-                l2_results, max_flow_results = run_random(jobs)
+                completion_file = completion_path(completion_dir, data_dir, random_file, "BAL") if completion_dir else None
+                l2_results, max_flow_results = run_random(jobs, completion_file)
                 logger.info(f"  Results: L2={l2_results:.4f}, Max Flow={max_flow_results:.4f}")
             except Exception as e:
                 logger.error(f"Error processing {random_file}: {e}")
@@ -380,8 +373,9 @@ def process_random_folders(data_dir, output_dir):
             
             logger.info(f"Successfully saved random results (version {version}) to {output_file}")
             
-def process_softrandom_folders(data_dir, output_dir):
-    """Process all softrandom_* folders"""
+def process_softrandom_folders(data_dir, output_dir, completion_dir=None):
+    """Process all softrandom_* folders.
+    With completion_dir set, each run's completion times are also saved there as .npy."""
     
     # Create output directory
     softrandom_result_dir = os.path.join(output_dir, 'softrandom_result')
@@ -431,7 +425,8 @@ def process_softrandom_folders(data_dir, output_dir):
                     continue
                 
                 # FIXED: Unpack both L2 norm and maximum flow time results
-                l2_results, max_flow_results = run_random(jobs)
+                completion_file = completion_path(completion_dir, data_dir, softrandom_file, "BAL") if completion_dir else None
+                l2_results, max_flow_results = run_random(jobs, completion_file)
                 
                 # Group results by version
                 if base_version not in results_by_version:
@@ -1,11 +1,17 @@
 import math
 import csv
 import copy
+from collections import deque
 import os
 import re
 import glob
-from SRPT_Selector import select_next_job_optimized as srpt_select_next_job
-from FCFS_Selector import select_next_job_optimized as fcfs_select_next_job
+from SRPT_Selector import SRPTSelector
+from FCFS_Kernel import fcfs_completion_times, fcfs_flow_times, flow_time_sums
+from Sim_Kernel import Policy, Kernel
+from Flow_Metrics import completion_array, completion_path, save_completion_times
+from Job_Set import JobSet, as_job_set
+import heapq
+import numpy as np
 import logging
 from typing import List, Dict, Tuple, Optional
 from multiprocessing import Pool, cpu_count,freeze_support
@@ -13,108 +19,164 @@ logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(
 logger = logging.getLogger(__name__)
 
 # -----------------------------
-# Optimized, API-compatible SRPT
+# Resumable SRPT / FCFS simulators
 # -----------------------------
-def Srpt(jobs: List[Dict]) -> Tuple[float, float,float]:
+class SrptState:
     """
-    Optimized SRPT simulator (same I/O, same results).
-    - Event-driven time advance: run until next arrival or completion (min step).
-    - Avoid per-tick loops; drastically fewer iterations.
-    - Keeps selectors and outputs identical to the old version.
+    Resumable SRPT simulator (the engine behind Srpt).
+    - feed(jobs) admits a JobSet (usually a round view) in arrival order and advances time up to the admission of the
+      last fed job, which is as far as SRPT can go without knowing the next arrival.
+      Feeding more jobs later resumes from there (same result as one feed of all jobs).
+    - finish() drains a copy of the backlog as if nothing else arrives and returns the
+      (avg, L2, max) that Srpt would report for every job fed so far; the state is untouched.
+    - snapshot() returns an independent copy, e.g. to branch a window at a round boundary.
     """
-    if not jobs:
-        return 0.0, 0.0,0.0
 
-    # Assign job indices (stable and explicit)
-    for idx, job in enumerate(jobs):
-        job['job_index'] = idx
-
-    # Sort by arrival once
-    jobs_sorted = sorted(jobs, key=lambda x: x['arrival_time'])
-    total_jobs = len(jobs_sorted)
-
-    current_time = 0
-    jobs_pointer = 0  # next job to admit
-    completed_jobs: List[Dict] = []
-    job_queue: List[Dict] = []  # waiting jobs
-
-    # Helper to admit all arrivals up to current_time
-    def admit_until_now(t: int):
-        nonlocal jobs_pointer
-        while jobs_pointer < total_jobs and jobs_sorted[jobs_pointer]['arrival_time'] <= t:
-            j = jobs_sorted[jobs_pointer]
-            job_queue.append({
-                'arrival_time': j['arrival_time'],
-                'job_size': j['job_size'],
-                'remaining_time': j['job_size'],
-                'job_index': j['job_index'],
-                'completion_time': None,
-                'start_time': None,
-            })
-            jobs_pointer += 1
-
-    while len(completed_jobs) < total_jobs:
-        # Admit any arrived jobs for current_time
-        admit_until_now(current_time)
-
-        # Pick next job (SRPT) using optimized selector
-        selected_job = srpt_select_next_job(job_queue) if job_queue else None
+    def __init__(self):
+        self.current_time = 0
+        self.selector = SRPTSelector()  # persistent (remaining_time, arrival_time, job_index) queue
+        self.pending = deque()  # fed but not yet admitted: (arrival_time, job_size, job_index)
+        self.n_jobs = 0
+        self.total_flow = 0
+        self.sum_sq_flow = 0
+        self.max_flow = None
+
+    def snapshot(self) -> 'SrptState':
+        clone = copy.copy(self)
+        clone.selector = self.selector.copy()
+        clone.pending = deque(self.pending)
+        return clone
+
+    def feed(self, jobs: JobSet) -> 'SrptState':
+        self.pending.extend(zip(jobs.arrival.tolist(), jobs.size.tolist(), jobs.index.tolist()))
+        self.n_jobs += len(jobs)
+        self._advance()
+        return self
+
+    def _record(self, flow):
+        self.total_flow += flow
+        self.sum_sq_flow += flow ** 2
+        if self.max_flow is None or flow > self.max_flow:
+            self.max_flow = flow
+
+    def _advance(self):
+        pending = self.pending
+        selector = self.selector
+        current_time = self.current_time
+        while pending:
+            # Admit any arrived jobs for current_time
+            while pending and pending[0][0] <= current_time:
+                arrival_time, job_size, job_index = pending.popleft()
+                selector.add_job(job_index, arrival_time, job_size)
+            if not pending:
+                break  # the next step depends on arrivals not fed yet
+
+            picked = selector.pop_next_job()
+            if picked is None:
+                # Idle: jump to next arrival
+                current_time = max(current_time, pending[0][0])
+                continue
 
-        if selected_job:
-            # Determine delta until next arrival (if any) to keep preemption points correct
-            next_arrival_t = jobs_sorted[jobs_pointer]['arrival_time'] if jobs_pointer < total_jobs else None
-            if next_arrival_t is None:
-                # No more arrivals: run to completion
-                delta = selected_job['remaining_time']
-            else:
-                # Run only until either next arrival or completion
-                gap = max(1, next_arrival_t - current_time)  # at least 1 time unit
-                delta = min(selected_job['remaining_time'], gap)
-
-            # Remove selected from queue (find by identity keys, stable)
-            for idx, j in enumerate(job_queue):
-                if (j['job_index'] == selected_job['job_index'] and
-                    j['arrival_time'] == selected_job['arrival_time'] and
-                    j['job_size'] == selected_job['job_size'] and
-                    j['remaining_time'] == selected_job['remaining_time']):
-                    job = job_queue.pop(idx)
-                    break
+            # Run only until either next arrival or completion
+            remaining_time, arrival_time, job_index = picked
+            delta = min(remaining_time, max(1, pending[0][0] - current_time))  # at least 1 time unit
+            remaining_time -= delta
+            current_time += delta
+            if remaining_time == 0:
+                self._record(current_time - arrival_time)
             else:
-                # Fallback (shouldn't happen): just pop first
-                job = job_queue.pop(0)
+                # Push back for potential preemption
+                selector.add_job(job_index, arrival_time, remaining_time)
+        self.current_time = current_time
+
+    def finish(self) -> Tuple[float, float, float]:
+        if self.n_jobs == 0:
+            return 0.0, 0.0, 0.0
+        total_flow, sum_sq_flow, max_flow = self.total_flow, self.sum_sq_flow, self.max_flow
+        # No more arrivals: every queued job runs to completion in SRPT order
+        current_time = self.current_time
+        backlog = sorted(self.selector.active_entries())
+        for remaining_time, arrival_time, _ in backlog:
+            current_time += remaining_time
+            flow = current_time - arrival_time
+            total_flow += flow
+            sum_sq_flow += flow ** 2
+            if max_flow is None or flow > max_flow:
+                max_flow = flow
+        return total_flow / self.n_jobs, math.sqrt(sum_sq_flow), max_flow
+
+
+class FcfsState:
+    """
+    Resumable FCFS simulator with the same feed/finish/snapshot API as SrptState.
+    Non-preemptive FCFS serves jobs in (arrival_time, job_size, job_index) order, so only the
+    jobs sharing the latest fed arrival time can still be reordered by a later feed; everything
+    before them is finalized on feed with the vectorized FCFS_Kernel scan.
+    """
 
-            # Start time - ensure it's at or after arrival time
-            if job['start_time'] is None:
-                job['start_time'] = max(current_time, job['arrival_time'])
+    def __init__(self):
+        self.finish_time = 0  # completion time of the last finalized job
+        self.tail = []  # fed jobs sharing the latest arrival time: (arrival_time, job_size, job_index)
+        self.n_jobs = 0
+        self.total_flow = 0
+        self.sum_sq_flow = 0
+        self.max_flow = None
+
+    def snapshot(self) -> 'FcfsState':
+        clone = copy.copy(self)
+        clone.tail = list(self.tail)
+        return clone
+
+    def feed(self, jobs: JobSet) -> 'FcfsState':
+        if not len(jobs):
+            return self
+        batch = self.tail + list(zip(jobs.arrival.tolist(), jobs.size.tolist(), jobs.index.tolist()))
+        self.n_jobs += len(jobs)
+        last_arrival = batch[-1][0]
+        cut = len(batch)
+        while cut > 0 and batch[cut - 1][0] == last_arrival:
+            cut -= 1
+        self._finalize(batch[:cut])
+        self.tail = batch[cut:]
+        return self
+
+    def _finalize(self, batch):
+        if not batch:
+            return
+        batch.sort()
+        arrivals = np.array([b[0] for b in batch])
+        completions = fcfs_completion_times(arrivals, np.array([b[1] for b in batch]), self.finish_time)
+        total_flow, sum_sq_flow, max_flow = flow_time_sums(completions - arrivals)
+        self.total_flow += total_flow
+        self.sum_sq_flow += sum_sq_flow
+        if self.max_flow is None or max_flow > self.max_flow:
+            self.max_flow = max_flow
+        self.finish_time = completions[-1].item()
+
+    def finish(self) -> Tuple[float, float, float]:
+        if self.n_jobs == 0:
+            return 0.0, 0.0, 0.0
+        state = self.snapshot()
+        state._finalize(state.tail)
+        return state.total_flow / self.n_jobs, state.sum_sq_flow ** 0.5, state.max_flow
 
-            # Execute
-            job['remaining_time'] -= delta
-            current_time += delta
 
-            if job['remaining_time'] == 0:
-                job['completion_time'] = current_time
-                completed_jobs.append(job)
-            else:
-                # Re-queue for potential preemption
-                job_queue.append(job)
-        else:
-            # Idle: jump to next arrival
-            if jobs_pointer < total_jobs:
-                current_time = max(current_time, jobs_sorted[jobs_pointer]['arrival_time'])
-            else:
-                break  # nothing left
-
-    # Metrics (identical to old version)
-    total_flow_time = sum(job['completion_time'] - job['arrival_time'] for job in completed_jobs)
-    max_flow = max(job['completion_time'] - job['arrival_time'] for job in completed_jobs)
-    if total_jobs > 0:
-        avg_flow_time = total_flow_time / total_jobs
-        l2_norm_flow_time = math.sqrt(sum((job['completion_time'] - job['arrival_time']) ** 2 for job in completed_jobs))
-    else:
-        avg_flow_time = 0
-        l2_norm_flow_time = 0
+# -----------------------------
+# Optimized, API-compatible SRPT
+# -----------------------------
+def Srpt(jobs: List[Dict]) -> Tuple[float, float,float]:
+    """
+    Optimized SRPT simulator (same I/O, same results).
+    - Event-driven time advance: run until next arrival or completion (min step).
+    - Avoid per-tick loops; drastically fewer iterations.
+    - One persistent SRPTSelector heap across events (O(log n) per preemption).
+    - Thin wrapper over SrptState, which also supports resuming with more arrivals.
+    """
+    if not len(jobs):
+        return 0.0, 0.0,0.0
 
-    return avg_flow_time, l2_norm_flow_time,max_flow
+    # Job indices are input positions (JobSet.index); sort by arrival once
+    return SrptState().feed(as_job_set(jobs).sorted_by_arrival()).finish()
 
 
 # -----------------------------
@@ -123,89 +185,21 @@ def Srpt(jobs: List[Dict]) -> Tuple[float, float,float]:
 def Fcfs(jobs: List[Dict]) -> Tuple[float, float,float]:
     """
     Optimized FCFS simulator (same I/O, same results):
-    - Event-driven; non-preemptive job runs to completion.
-    - Avoid per-tick loops; admit arrivals in batches.
+    - Non-preemptive; completion times come from the vectorized FCFS_Kernel scan.
+    - Service order (arrival_time, job_size, job_index), as FCFS_Selector.
+    - FcfsState offers the same computation resumable round by round.
     """
-    if not jobs:
+    if not len(jobs):
         return 0.0, 0.0,0.0
 
-    # Assign job indices
-    for idx, job in enumerate(jobs):
-        job['job_index'] = idx
-
-    jobs_sorted = sorted(jobs, key=lambda x: x['arrival_time'])
-    total_jobs = len(jobs_sorted)
-
-    current_time = 0
-    jobs_pointer = 0
-    completed_jobs: List[Dict] = []
-    waiting_queue: List[Dict] = []
-    current_job: Optional[Dict] = None
-
-    def admit_until_now(t: int):
-        nonlocal jobs_pointer
-        while jobs_pointer < total_jobs and jobs_sorted[jobs_pointer]['arrival_time'] <= t:
-            j = jobs_sorted[jobs_pointer]
-            waiting_queue.append({
-                'arrival_time': j['arrival_time'],
-                'job_size': j['job_size'],
-                'remaining_time': j['job_size'],
-                'job_index': j['job_index'],
-                'completion_time': None,
-                'start_time': None,
-            })
-            jobs_pointer += 1
-
-    while len(completed_jobs) < total_jobs:
-        admit_until_now(current_time)
-
-        if current_job is None and waiting_queue:
-            # FCFS selector picks earliest arrival using optimized selector
-            selected = fcfs_select_next_job(waiting_queue)
-            # Remove the selected item
-            for idx, j in enumerate(waiting_queue):
-                if (j['job_index'] == selected['job_index'] and
-                    j['arrival_time'] == selected['arrival_time'] and
-                    j['job_size'] == selected['job_size']):
-                    current_job = waiting_queue.pop(idx)
-                    break
-            else:
-                current_job = waiting_queue.pop(0)
-
-            if current_job['start_time'] is None:
-                # Ensure start time is at or after arrival
-                current_time = max(current_time, current_job['arrival_time'])
-                current_job['start_time'] = current_time
-
-        if current_job is not None:
-            # Non-preemptive: run to completion in one step
-            current_time += current_job['remaining_time']
-            current_job['remaining_time'] = 0
-            current_job['completion_time'] = current_time
-            completed_jobs.append(current_job)
-            current_job = None
-            continue
-
-        # If nothing to run, jump to next arrival
-        if jobs_pointer < total_jobs:
-            current_time = max(current_time, jobs_sorted[jobs_pointer]['arrival_time'])
-        else:
-            break
-
-    total_flow_time = sum(job['completion_time'] - job['arrival_time'] for job in completed_jobs)
-    max_flow = max(job['completion_time'] - job['arrival_time'] for job in completed_jobs)
-    if total_jobs > 0:
-        avg_flow_time = total_flow_time / total_jobs
-        l2_norm_flow_time = (sum((job['completion_time'] - job['arrival_time']) ** 2 for job in completed_jobs))**0.5
-    else:
-        avg_flow_time = 0
-        l2_norm_flow_time = 0
-
-    return avg_flow_time, l2_norm_flow_time, max_flow
+    jobs = as_job_set(jobs)
+    flows = fcfs_flow_times(jobs.arrival, jobs.size)
+    total_flow_time, sum_sq_flow, max_flow = flow_time_sums(flows)
+    return total_flow_time / len(jobs), sum_sq_flow ** 0.5, max_flow
 
 
 # ----------------------------------
-# FIXED AND OPTIMIZED DYNAMIC
+# Dynamic analysis output
 # ----------------------------------
 def save_analysis_results(input_file_path, nJobsPerRound, mode, algorithm_history, total_rounds):
     """Save analysis results to CSV file with version handling"""
@@ -323,7 +317,145 @@ def save_round_details(input_file_path, nJobsPerRound, mode, algorithm_history,
         for i, algo in enumerate(algorithm_history, 1):
             writer.writerow([i, algo])
 
-def DYNAMIC(jobs, nJobsPerRound = 100, mode=1, input_file_name=None):
+# ----------------------------------
+# Per-trace planning of round verdicts
+# ----------------------------------
+def dynamic_history_window(mode: int, current_round: int) -> Optional[Tuple[int, int]]:
+    """
+    Rounds (first, last), 1-based and inclusive, that DYNAMIC re-simulates when deciding
+    `current_round` (>= 2) under `mode`, including the mode-1 fallback rules.
+    Returns None for unknown modes (DYNAMIC then simulates an empty window, i.e. SRPT).
+    """
+    effective_mode = mode
+    if mode == 2 and current_round < 3:
+        effective_mode = 1
+    elif mode == 3 and current_round < 5:
+        effective_mode = 1
+    elif mode == 4 and current_round < 9:
+        effective_mode = 1
+    elif mode == 5 and current_round < 17:
+        effective_mode = 1
+
+    if effective_mode in (1, 2, 3, 4, 5):
+        span = 2 ** (effective_mode - 1)
+        return max(1, current_round - span + 1), current_round
+    if effective_mode == 6:
+        return 1, current_round
+    if effective_mode == 7:
+        return max(1, current_round - math.ceil(current_round * 0.5) + 1), current_round
+    return None
+
+def plan_dynamic_decisions(jobs, nJobsPerRound=100, modes=range(1, 8)) -> Dict[int, List[bool]]:
+    """
+    Precompute DYNAMIC's per-round SRPT/FCFS verdicts for several modes at once.
+
+    Round r always holds the jobs at positions [(r-1)*nJobsPerRound, r*nJobsPerRound) of the
+    arrival-sorted trace, whatever schedule is running, so the window a mode re-simulates at
+    round r is a fixed slice of the trace. Each distinct window is simulated only once and
+    shared by every mode that needs it (e.g. the mode 2-5 fallbacks all reuse the mode-1 window).
+    Windows that start at the same round are evaluated on one resumable SrptState/FcfsState
+    pair fed round by round (zero-copy JobSet round views), so mode 6's growing history costs one pass over the trace and
+    mode 7's half-history windows share their simulation in pairs.
+
+    Returns {mode: decisions} where decisions[r-1] is True when round r runs SRPT.
+    """
+    jobs_sorted = as_job_set(jobs).sorted_by_arrival()
+    n_rounds = len(jobs_sorted) // nJobsPerRound
+
+    windows = {mode: [dynamic_history_window(mode, r) for r in range(2, n_rounds + 1)] for mode in modes}
+
+    # Group the distinct windows by their first round
+    ends_by_start: Dict[int, set] = {}
+    for mode_windows in windows.values():
+        for window in mode_windows:
+            if window is not None:
+                ends_by_start.setdefault(window[0], set()).add(window[1])
+
+    verdicts: Dict[Tuple[int, int], bool] = {}
+    for first, ends in ends_by_start.items():
+        srpt_state, fcfs_state = SrptState(), FcfsState()
+        fed = first - 1
+        for last in sorted(ends):
+            round_jobs = jobs_sorted[fed * nJobsPerRound:last * nJobsPerRound]
+            srpt_state.feed(round_jobs)
+            fcfs_state.feed(round_jobs)
+            fed = last
+            _, srpt_l2, _ = srpt_state.finish()
+            _, fcfs_l2, _ = fcfs_state.finish()
+            verdicts[(first, last)] = srpt_l2 <= fcfs_l2
+
+    plans = {}
+    for mode, mode_windows in windows.items():
+        decisions = [True] if n_rounds >= 1 else []
+        decisions.extend(verdicts[window] if window is not None else True for window in mode_windows)
+        plans[mode] = decisions
+    return plans
+
+def dynamic_algorithm_history(decisions, total_jobs, nJobsPerRound=100) -> List[str]:
+    """
+    Algorithm ('SRPT' / 'FCFS') DYNAMIC reports for each round of a total_jobs trace;
+    the last incomplete round keeps the algorithm of the last closed one.
+    """
+    n_full_rounds = total_jobs // nJobsPerRound
+    algorithm_history = ['SRPT' if decisions[r] else 'FCFS' for r in range(n_full_rounds)]
+    if total_jobs % nJobsPerRound:
+        is_srpt_better = decisions[n_full_rounds - 1] if n_full_rounds else True
+        algorithm_history.append('SRPT' if is_srpt_better else 'FCFS')
+    return algorithm_history
+
+class DynamicPolicy(Policy):
+    """
+    DYNAMIC's live schedule on the shared Sim_Kernel.
+    Every nJobsPerRound admitted jobs close a round; after round r closes the schedule is
+    SRPT if decisions[r-1] else FCFS (round 1 starts as SRPT). SRPT rounds preempt at
+    arrivals on (remaining_time, arrival_time, job); FCFS rounds run the (arrival_time,
+    job_size, job) minimum to completion. Both orders are kept over the same ready set.
+    """
+
+    def __init__(self, decisions, nJobsPerRound=100):
+        self.decisions = decisions
+        self.nJobsPerRound = nJobsPerRound
+
+    def bind(self, kernel):
+        super().bind(kernel)
+        self.srpt_queue = SRPTSelector()  # ready jobs; its remaining dict is the ready set
+        self.fcfs_queue = []  # min-heap: (arrival_time, job_size, job), stale entries skipped
+        self.n_arrivals = 0
+        self.is_srpt_better = True  # Start with SRPT by default for first round
+
+    @property
+    def preemptive(self):
+        # FCFS mode inside DYNAMIC is non-preemptive: run to completion
+        return self.is_srpt_better
+
+    def on_arrival(self, job, t):
+        kernel = self.kernel
+        self.srpt_queue.add_job(job, kernel.arrival[job], kernel.remaining[job])
+        heapq.heappush(self.fcfs_queue, (kernel.arrival[job], kernel.size[job], job))
+        self.n_arrivals += 1
+        if self.n_arrivals % self.nJobsPerRound == 0:
+            # Round closed: its verdict decides the schedule from now on
+            self.is_srpt_better = self.decisions[self.n_arrivals // self.nJobsPerRound - 1]
+
+    def select(self, t):
+        if self.is_srpt_better:
+            picked = self.srpt_queue.pop_next_job()
+            return None if picked is None else picked[2]
+        fcfs_queue, ready = self.fcfs_queue, self.srpt_queue.remaining
+        while fcfs_queue and fcfs_queue[0][2] not in ready:
+            heapq.heappop(fcfs_queue)
+        if not fcfs_queue:
+            return None
+        job = heapq.heappop(fcfs_queue)[2]
+        self.srpt_queue.remove_job(job)
+        return job
+
+    def on_preempt(self, job, t):
+        # Only SRPT rounds preempt, and the job's FCFS entry is still queued
+        self.srpt_queue.add_job(job, self.kernel.arrival[job], self.kernel.remaining[job])
+
+def DYNAMIC(jobs, nJobsPerRound = 100, mode=1, input_file_name=None, decisions=None,
+            return_completion_times=False):
     """
     Dynamic scheduling algorithm with 6 modes:
     Mode 1: Use jobs from previous round to decide current round's schedule
@@ -335,193 +467,31 @@ def DYNAMIC(jobs, nJobsPerRound = 100, mode=1, input_file_name=None):
     Mode 7: At round n: Re-execute the most recent ceil(0.5 * total_jobs) jobs
     
     If current round doesn't meet mode requirements, fallback to mode 1
+
+    decisions: optional precomputed verdict vector from plan_dynamic_decisions
+    (decisions[r-1] is True when round r runs SRPT). When omitted it is planned
+    here for this mode; passing it lets several modes share one planning pass.
+
+    return_completion_times: also return the completion times in original job order.
     
-    BUG FIX: Properly carry over excess jobs to next round count
-    OPTIMIZATION: Use optimized selectors
+    The live schedule is DynamicPolicy on the shared Sim_Kernel.
     """
     total_jobs = len(jobs)
 
-    current_time = 0
-    active_jobs = []
-    completed_jobs = []
-    n_arrival_jobs = 0  # Jobs counted for current round
-    n_completed_jobs = 0
-    is_srpt_better = True  # Start with SRPT by default for first round
-    jobs_pointer = 0
-    jobs_in_current_round = []  # Jobs arriving in current round
-    current_job = None
-    
-    # Store all jobs from each round for future simulations
-    round_jobs_history = []  # List of lists, each containing jobs from a round
-    current_round = 1
-    
-    # Track which algorithm was used in each round
-    algorithm_history = []
-
-    # Assign job indices and initialize jobs
-    for idx, job in enumerate(jobs):
-        job['job_index'] = idx
-        job['remaining_time'] = job['job_size']
-        job['completion_time'] = None
-        job['start_time'] = None
-
-    # Sort jobs by arrival time
-    jobs.sort(key=lambda x: x['arrival_time'])
-
-    while n_completed_jobs < total_jobs:
-        # Admit all jobs up to current_time (batch, not tick-by-tick)
-        while jobs_pointer < total_jobs and jobs[jobs_pointer]['arrival_time'] <= current_time:
-            job = jobs[jobs_pointer]
-            job_copy = {
-                'arrival_time': job['arrival_time'],
-                'job_size': job['job_size'],
-                'remaining_time': job['remaining_time'],
-                'job_index': job['job_index'],
-                'completion_time': None,
-                'start_time': None
-            }
-            active_jobs.append(job_copy)
-            
-            # Track only essential fields for history
-            jobs_in_current_round.append({
-                'arrival_time': job['arrival_time'],
-                'job_size': job['job_size'],
-                'job_index': job['job_index']
-            })
-            
-            n_arrival_jobs += 1
-            jobs_pointer += 1
-
-        # Checkpoint logic when we have nJobsPerRound arrivals
-        # BUG FIX: Properly handle excess jobs
-        while n_arrival_jobs >= nJobsPerRound:
-            # Process exactly nJobsPerRound jobs for this round
-            jobs_for_this_round = jobs_in_current_round[:nJobsPerRound]
-            
-            if jobs_for_this_round:
-                # Store the current round's jobs
-                round_jobs_history.append(list(jobs_for_this_round))
-                
-                # Decide which algorithm to use for the CURRENT round
-                if current_round == 1:
-                    is_srpt_better = True
-                    algorithm_history.append('SRPT')
-                else:
-                    # Fallback rules to mode 1 when not enough history yet
-                    effective_mode = mode
-                    if mode == 2 and current_round < 3:
-                        effective_mode = 1
-                    elif mode == 3 and current_round < 5:
-                        effective_mode = 1
-                    elif mode == 4 and current_round < 9:
-                        effective_mode = 1
-                    elif mode == 5 and current_round < 17:
-                        effective_mode = 1
-                    
-                    # Collect jobs from previous rounds per effective mode
-                    jobs_to_simulate = []
-                    if effective_mode == 1:
-                        jobs_to_simulate = list(round_jobs_history[-1])
-                    elif effective_mode == 2:
-                        for r in round_jobs_history[-2:]:
-                            jobs_to_simulate.extend(r)
-                    elif effective_mode == 3:
-                        for r in round_jobs_history[-4:]:
-                            jobs_to_simulate.extend(r)
-                    elif effective_mode == 4:
-                        for r in round_jobs_history[-8:]:
-                            jobs_to_simulate.extend(r)
-                    elif effective_mode == 5:
-                        for r in round_jobs_history[-16:]:
-                            jobs_to_simulate.extend(r)
-                    elif effective_mode == 6:
-                        for r in round_jobs_history:
-                            jobs_to_simulate.extend(r)
-                    elif effective_mode == 7:
-                        for r in round_jobs_history[-math.ceil(current_round*0.5):]:
-                            jobs_to_simulate.extend(r)
-                    
-                    # Run SRPT and FCFS on the collected jobs
-                    srpt_avg, srpt_l2,max_flow_srpt = Srpt([{'arrival_time': j['arrival_time'], 'job_size': j['job_size']} for j in jobs_to_simulate])
-                    fcfs_avg, fcfs_l2,max_flow_fcfs = Fcfs([{'arrival_time': j['arrival_time'], 'job_size': j['job_size']} for j in jobs_to_simulate])
-                         
-                    # Choose algorithm based on L2 norm comparison
-                    is_srpt_better = srpt_l2 <= fcfs_l2
-                    algorithm_history.append('SRPT' if is_srpt_better else 'FCFS')
-                
-                current_round += 1
-            
-            # Move excess jobs to next round
-            jobs_in_current_round = jobs_in_current_round[nJobsPerRound:]
-            n_arrival_jobs -= nJobsPerRound
-
-        # Select next job based on the current scheduling policy
-        if active_jobs:
-            if is_srpt_better:
-                selected_job = srpt_select_next_job(active_jobs)
-            else:
-                selected_job = fcfs_select_next_job(active_jobs)
-        else:
-            selected_job = None
-
-        if selected_job:
-            # Decide event-driven step:
-            next_arrival_t = jobs[jobs_pointer]['arrival_time'] if jobs_pointer < total_jobs else None
-            if is_srpt_better:
-                # SRPT: allow preemption at arrivals, run until min(next arrival, completion)
-                if next_arrival_t is None:
-                    delta = selected_job['remaining_time']
-                else:
-                    delta = min(selected_job['remaining_time'], max(1, next_arrival_t - current_time))
-            else:
-                # FCFS mode inside DYNAMIC is non-preemptive: run to completion
-                delta = selected_job['remaining_time']
-
-            # Remove selected
-            for idx, j in enumerate(active_jobs):
-                if (j['job_index'] == selected_job['job_index'] and
-                    j['arrival_time'] == selected_job['arrival_time'] and
-                    j['job_size'] == selected_job['job_size'] and
-                    j['remaining_time'] == selected_job['remaining_time']):
-                    job = active_jobs.pop(idx)
-                    break
-            else:
-                job = active_jobs.pop(0)
-
-            # Set start time if not set (ensure >= arrival_time)
-            if job['start_time'] is None:
-                job['start_time'] = max(current_time, job['arrival_time'])
+    # What-if verdicts depend only on arrival order, so they are planned up front
+    if decisions is None:
+        decisions = plan_dynamic_decisions(jobs, nJobsPerRound, modes=[mode])[mode]
 
-            job['remaining_time'] -= delta
-            current_time += delta
-
-            if job['remaining_time'] == 0:
-                job['completion_time'] = current_time
-                completed_jobs.append(job)
-                n_completed_jobs += 1
-            else:
-                # Only SRPT can be preempted here
-                active_jobs.append(job)
-        else:
-            # No job to run; jump to next arrival
-            if jobs_pointer < total_jobs:
-                current_time = max(current_time, jobs[jobs_pointer]['arrival_time'])
-            else:
-                break
+    kernel = Kernel(jobs, DynamicPolicy(decisions, nJobsPerRound)).run()
 
-    # Process any remaining jobs in the last incomplete round
-    if jobs_in_current_round and n_arrival_jobs > 0:
-        round_jobs_history.append(list(jobs_in_current_round))
-        # The last round uses the same algorithm as determined for current state
-        algorithm_history.append('SRPT' if is_srpt_better else 'FCFS')
-        current_round += 1
+    algorithm_history = dynamic_algorithm_history(decisions, total_jobs, nJobsPerRound)
+    current_round = len(algorithm_history) + 1
 
     # Metrics
-    total_flow_time = sum(job['completion_time'] - job['arrival_time'] for job in completed_jobs)
-    max_flow = max(job['completion_time'] - job['arrival_time'] for job in completed_jobs)
     if total_jobs > 0:
+        total_flow_time, sum_sq_flow, max_flow = flow_time_sums(kernel.flow_times())
         avg_flow_time = total_flow_time / total_jobs
-        l2_norm_flow_time = math.sqrt(sum((job['completion_time'] - job['arrival_time']) ** 2 for job in completed_jobs))
+        l2_norm_flow_time = math.sqrt(sum_sq_flow)
     else:
         avg_flow_time = 0
         l2_norm_flow_time = 0
@@ -531,6 +501,8 @@ def DYNAMIC(jobs, nJobsPerRound = 100, mode=1, input_file_name=None):
     if input_file_name:
         save_analysis_results(input_file_name, nJobsPerRound, mode, algorithm_history, current_round - 1)
 
+    if return_completion_times:
+        return avg_flow_time, l2_norm_flow_time, max_flow, completion_array(kernel.completion_times())
     return avg_flow_time, l2_norm_flow_time, max_flow
 
 
@@ -581,19 +553,37 @@ def parse_freq_from_folder(folder_name):
     if match:
         return int(match.group(1))
     return None
-def run_all_modes_for_file_normal(jobs, nJobsPerRound, input_file_path=None):
+def mode_completion_files(completion_dir, data_dir, trace_file, nJobsPerRound):
+    """{mode: .npy path} for the completion times of every DYNAMIC mode on trace_file (None without completion_dir)"""
+    if not completion_dir:
+        return None
+    return {mode: completion_path(completion_dir, data_dir, trace_file, f"Dynamic_njobs{nJobsPerRound}_mode{mode}")
+            for mode in range(1, 8)}
+
+def run_dynamic_mode(job_set, nJobsPerRound, mode, input_file_path, decisions, completion_files=None):
+    """DYNAMIC for one mode; with completion_files, also saves its completion times to completion_files[mode]"""
+    if completion_files is None:
+        return DYNAMIC(job_set, nJobsPerRound=nJobsPerRound, mode=mode,
+                       input_file_name=input_file_path, decisions=decisions)
+    avg_flow_time, l2_norm_flow_time, max_flow_time, completion_times = DYNAMIC(
+        job_set, nJobsPerRound=nJobsPerRound, mode=mode, input_file_name=input_file_path,
+        decisions=decisions, return_completion_times=True)
+    save_completion_times(completion_files[mode], completion_times)
+    return avg_flow_time, l2_norm_flow_time, max_flow_time
+
+def run_all_modes_for_file_normal(jobs, nJobsPerRound, input_file_path=None, completion_files=None):
     """Run all 7 modes for NORMAL cases - ONLY return L2 norm results"""
     mode_results = {}
     
+    # What-if verdicts depend only on arrival order: compute each window once for all modes
+    # (one JobSet shared by every mode; the engines never write to it)
+    job_set = as_job_set(jobs)
+    plans = plan_dynamic_decisions(job_set, nJobsPerRound)
+    
     for mode in range(1, 8):
         try:
-            jobs_copy = [{'arrival_time': j['arrival_time'], 'job_size': j['job_size']} for j in jobs]
-            result = DYNAMIC(
-                jobs_copy,
-                nJobsPerRound=nJobsPerRound,
-                mode=mode,
-                input_file_name=input_file_path
-            )
+            result = run_dynamic_mode(job_set, nJobsPerRound, mode, input_file_path,
+                                      plans[mode], completion_files)
             
             # Handle both old and new return formats
             if len(result) == 3:
@@ -608,20 +598,20 @@ def run_all_modes_for_file_normal(jobs, nJobsPerRound, input_file_path=None):
             mode_results[mode] = None
     
     return mode_results  # Returns dictionary, not tuple
-def run_all_modes_for_file_frequency(jobs, nJobsPerRound, input_file_path=None):
+def run_all_modes_for_file_frequency(jobs, nJobsPerRound, input_file_path=None, completion_files=None):
     """Run all 6 modes for a given job set and return results with max flow time"""
     mode_results = {}
     max_flow_results = {}  # NEW: Track max flow time results
     
+    # What-if verdicts depend only on arrival order: compute each window once for all modes
+    # (one JobSet shared by every mode; the engines never write to it)
+    job_set = as_job_set(jobs)
+    plans = plan_dynamic_decisions(job_set, nJobsPerRound)
+    
     for mode in range(1, 8):
         try:
-            jobs_copy = [{'arrival_time': j['arrival_time'], 'job_size': j['job_size']} for j in jobs]
-            avg_flow_time, l2_norm_flow_time, max_flow_time = DYNAMIC(  # CHANGED: Capture third value
-                jobs_copy,
-                nJobsPerRound=nJobsPerRound,
-                mode=mode,
-                input_file_name=input_file_path
-            )
+            avg_flow_time, l2_norm_flow_time, max_flow_time = run_dynamic_mode(  # CHANGED: Capture third value
+                job_set, nJobsPerRound, mode, input_file_path, plans[mode], completion_files)
             mode_results[mode] = l2_norm_flow_time
             max_flow_results[mode] = max_flow_time  # NEW: Store max flow time
             logger.info(f"    Mode {mode}: L2 norm = {l2_norm_flow_time:.4f}, Max flow = {max_flow_time:.4f}")
@@ -631,8 +621,9 @@ def run_all_modes_for_file_frequency(jobs, nJobsPerRound, input_file_path=None):
             max_flow_results[mode] = None
     
     return mode_results, max_flow_results
-def process_avg_folders(data_dir, output_dir, nJobsPerRound):
-    """Process all avg_30_*, avg_60_*, avg_90_* folders"""
+def process_avg_folders(data_dir, output_dir, nJobsPerRound, completion_dir=None):
+    """Process all avg_30_*, avg_60_*, avg_90_* folders.
+    With completion_dir set, every mode's completion times are also saved there as .npy."""
     
     # Find all avg folders with version numbers
     avg_patterns = ['avg_30_*']
@@ -681,7 +672,8 @@ def process_avg_folders(data_dir, output_dir, nJobsPerRound):
                     continue
                 
                 # Run all 6 modes
-                mode_results = run_all_modes_for_file_normal(jobs, nJobsPerRound, csv_file)
+                completion_files = mode_completion_files(completion_dir, data_dir, csv_file, nJobsPerRound)
+                mode_results = run_all_modes_for_file_normal(jobs, nJobsPerRound, csv_file, completion_files)
                 
                 # Store results
                 if arrival_rate not in results_by_arrival_rate:
@@ -722,8 +714,9 @@ def process_avg_folders(data_dir, output_dir, nJobsPerRound):
                 
                 logger.info(f"  Saved results for arrival_rate={arrival_rate} to {output_file}")
 
-def process_random_folders(data_dir, output_dir, nJobsPerRound):
-    """Process all freq_* folders for random files"""
+def process_random_folders(data_dir, output_dir, nJobsPerRound, completion_dir=None):
+    """Process all freq_* folders for random files.
+    With completion_dir set, every mode's completion times are also saved there as .npy."""
     
     # Create output directory
     random_result_dir = os.path.join(output_dir, 'random_result')
@@ -762,7 +755,8 @@ def process_random_folders(data_dir, output_dir, nJobsPerRound):
                 continue
             
             # FIXED: Properly unpack the tuple returned by frequency function
-            mode_results, max_flow_results = run_all_modes_for_file_frequency(jobs, nJobsPerRound, None)
+            completion_files = mode_completion_files(completion_dir, data_dir, random_file, nJobsPerRound)
+            mode_results, max_flow_results = run_all_modes_for_file_frequency(jobs, nJobsPerRound, None, completion_files)
             
             # Group results by version
             if version not in results_by_version:
@@ -811,8 +805,9 @@ def process_random_folders(data_dir, output_dir, nJobsPerRound):
             
             logger.info(f"  Saved random results (version {version}) to {output_file}")
 
-def process_softrandom_folders(data_dir, output_dir, nJobsPerRound):
-    """Process all softrandom_* folders"""
+def process_softrandom_folders(data_dir, output_dir, nJobsPerRound, completion_dir=None):
+    """Process all softrandom_* folders.
+    With completion_dir set, every mode's completion times are also saved there as .npy."""
     
     # Create output directory
     softrandom_result_dir = os.path.join(output_dir, 'softrandom_result')
@@ -862,7 +857,8 @@ def process_softrandom_folders(data_dir, output_dir, nJobsPerRound):
                     continue
                 
                 # FIXED: Properly unpack the tuple returned by frequency function
-                mode_results, max_flow_results = run_all_modes_for_file_frequency(jobs, nJobsPerRound, None)
+                completion_files = mode_completion_files(completion_dir, data_dir, softrandom_file, nJobsPerRound)
+                mode_results, max_flow_results = run_all_modes_for_file_frequency(jobs, nJobsPerRound, None, completion_files)
                 
                 # Group results by version
                 if base_version not in results_by_version:
@@ -1,6 +1,10 @@
 import math
 import csv
-from FCFS_Selector import select_next_job_optimized as fcfs_select
+import numpy as np
+from FCFS_Kernel import fcfs_flow_times, flow_time_sums
+from Sim_Kernel import Policy
+from Job_Set import JobSet
+import heapq
 import time
 import os
 import csv
@@ -14,83 +18,56 @@ import process_random_folders as prf
 import process_softrandom_folders as psf
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
-def Fcfs(jobs):
+
+class FCFSPolicy(Policy):
     """
-    Optimized non-preemptive FCFS:
-    - Event-driven time advance (jump to next arrival or completion).
-    - Heap-based pick via fcfs_select (O(log n)) for large queues, linear for small queues.
-    - Returns (avg_flow_time, l2_norm_flow_time).
+    Non-preemptive FCFS on the shared Sim_Kernel, order (arrival_time, job_size, job) as
+    fcfs_select. Fcfs itself uses the closed-form FCFS_Kernel; this policy is for
+    kernel-level drivers (fused or chunked runs).
     """
-    # Normalize & index
-    jobs = [{"arrival_time": int(j["arrival_time"]), "job_size": int(j["job_size"]), "job_index": i} 
-            for i, j in enumerate(jobs)]
-    # Sort by arrival time once
-    jobs.sort(key=lambda x: x["arrival_time"])
+    preemptive = False
 
-    total_jobs = len(jobs)
-    if total_jobs == 0:
-        return 0.0, 0.0
+    def bind(self, kernel):
+        super().bind(kernel)
+        self.ready = []  # min-heap: (arrival_time, job_size, job)
 
-    t = 0
-    i = 0
-    waiting = []
-    current = None
-    completed = []
+    def on_arrival(self, job, t):
+        heapq.heappush(self.ready, (self.kernel.arrival[job], self.kernel.size[job], job))
 
-    while len(completed) < total_jobs:
-        # Add arrivals up to current time
-        while i < total_jobs and jobs[i]["arrival_time"] <= t:
-            waiting.append({
-                "arrival_time": jobs[i]["arrival_time"],
-                "job_size": jobs[i]["job_size"],
-                "job_index": jobs[i]["job_index"],
-                "remaining_time": jobs[i]["job_size"],
-                "start_time": None,
-                "completion_time": None,
-            })
-            i += 1
+    def select(self, t):
+        return heapq.heappop(self.ready)[2] if self.ready else None
 
-        if current is None and waiting:
-            picked = fcfs_select(waiting)  # dict
-            # locate same dict (by identity keys)
-            sel_idx = min(
-                range(len(waiting)),
-                key=lambda k: (waiting[k]["arrival_time"], waiting[k].get("job_size", 0), waiting[k].get("job_index", 0))
-            )
-            # Better: match exact picked
-            for k, w in enumerate(waiting):
-                if (w["arrival_time"], w.get("job_size", 0), w.get("job_index", 0)) == \
-                   (picked["arrival_time"], picked.get("job_size", 0), picked.get("job_index", 0)):
-                    sel_idx = k
-                    break
-            current = waiting.pop(sel_idx)
-            if current["start_time"] is None:
-                current["start_time"] = t
+    def closed_form_flows(self, arrival, size):
+        # Same (arrival_time, job_size, job) order as the ready heap
+        return fcfs_flow_times(arrival, size)
 
-        if current is not None:
-            # Non-preemptive: run to completion
-            t += current["remaining_time"]
-            current["completion_time"] = t
-            current["remaining_time"] = 0
-            completed.append(current)
-            current = None
-            continue  # loop to admit more arrivals or pick next
+def Fcfs(jobs, return_completion_times=False):
+    """
+    Optimized non-preemptive FCFS:
+    - Closed-form completion times from the shared FCFS_Kernel max-plus scan (no Python loop).
+    - Service order (arrival_time, job_size, job_index), as fcfs_select.
+    - Returns (avg_flow_time, l2_norm_flow_time, max_flow_time), plus the int64 completion
+      times in original job order when return_completion_times is set.
+    """
+    # Normalize (a JobSet's int64 arrays are used as is)
+    if isinstance(jobs, JobSet):
+        jobs = jobs.as_int()
+        arrivals, sizes = jobs.arrival, jobs.size
+    else:
+        arrivals = np.fromiter((int(j["arrival_time"]) for j in jobs), dtype=np.int64, count=len(jobs))
+        sizes = np.fromiter((int(j["job_size"]) for j in jobs), dtype=np.int64, count=len(jobs))
 
-        # If idle, jump to next arrival (no 1-tick loops)
-        if i < total_jobs:
-            t = max(t, jobs[i]["arrival_time"])
-            continue
-        else:
-            break  # no jobs left
+    total_jobs = len(arrivals)
+    if total_jobs == 0:
+        return 0.0, 0.0
 
     # Metrics
-    flows = [c["completion_time"] - c["arrival_time"] for c in completed]
-    n = len(flows)
-    if n == 0:
-        return 0.0, 0.0,0.0
-    avg_flow = sum(flows) / n
-    l2 = (sum(f * f for f in flows)) ** 0.5
-    max_flow = max(flows)
+    flows = fcfs_flow_times(arrivals, sizes)
+    total_flow, sum_sq_flow, max_flow = flow_time_sums(flows)
+    avg_flow = total_flow / total_jobs
+    l2 = sum_sq_flow ** 0.5
+    if return_completion_times:
+        return avg_flow, l2, max_flow, flows + arrivals
     return avg_flow, l2, max_flow
 
 def main():
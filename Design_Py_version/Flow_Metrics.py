@@ -0,0 +1,103 @@
+import os
+import numpy as np
+import pandas as pd
+from FCFS_Kernel import flow_time_sums
+
+def completion_array(values):
+    """Completion times as a NumPy array: int64 for integer traces, float64 otherwise."""
+    values = np.asarray(values)
+    if np.issubdtype(values.dtype, np.integer):
+        return values.astype(np.int64, copy=False)
+    return values.astype(np.float64, copy=False)
+
+def completion_path(completion_dir, data_dir, trace_file, algo_name):
+    """
+    Where the completion times of algo_name on trace_file are stored: one .npy per
+    trace x algorithm, mirroring the trace's place under data_dir, e.g.
+    data/avg_30_1/(20, 4.073_262144).csv -> <completion_dir>/avg_30_1/(20, 4.073_262144)/SRPT.npy
+    """
+    relative = os.path.relpath(os.path.splitext(trace_file)[0], data_dir)
+    return os.path.join(completion_dir, relative, f"{algo_name}.npy")
+
+def save_completion_times(path, completion_times):
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    np.save(path, completion_array(completion_times))
+
+def load_completion_times(path, mmap=True):
+    """Stored completion times (memory-mapped by default, so large traces load lazily)."""
+    return np.load(path, mmap_mode='r' if mmap else None)
+
+def load_trace_arrays(trace_file):
+    """(arrival_times, job_sizes) int64 arrays of a trace CSV, in file order."""
+    df = pd.read_csv(trace_file, usecols=['arrival_time', 'job_size'])
+    return df['arrival_time'].to_numpy(dtype=np.int64), df['job_size'].to_numpy(dtype=np.int64)
+
+def flow_times(completion_times, arrival_times):
+    return np.asarray(completion_times) - np.asarray(arrival_times)
+
+def slowdowns(completion_times, arrival_times, job_sizes):
+    """Flow time over job size (sizes below 1 count as 1)."""
+    return flow_times(completion_times, arrival_times) / np.maximum(np.asarray(job_sizes), 1)
+
+def flow_statistics(completion_times, arrival_times, job_sizes, percentiles=(50, 95, 99)):
+    """
+    Summary of one run, all derived from the completion-time array:
+    avg / L2 norm / max flow (same values the engines return), flow percentiles and
+    mean / max slowdown.
+    """
+    flows = flow_times(completion_times, arrival_times)
+    n = len(flows)
+    if n == 0:
+        return {'num_jobs': 0}
+    total_flow, sum_sq_flow, max_flow = flow_time_sums(flows)
+    stats = {
+        'num_jobs': n,
+        'avg_flow_time': total_flow / n,
+        'l2_norm_flow_time': sum_sq_flow ** 0.5,
+        'max_flow_time': max_flow,
+    }
+    for p, value in zip(percentiles, np.percentile(flows, percentiles)):
+        stats[f'p{p:g}_flow_time'] = float(value)
+    slowdown = slowdowns(completion_times, arrival_times, job_sizes)
+    stats['avg_slowdown'] = float(slowdown.mean())
+    stats['max_slowdown'] = float(slowdown.max())
+    return stats
+
+def size_class_breakdown(completion_times, arrival_times, job_sizes, bins=None):
+    """
+    Per-size-class flow statistics. bins are class edges [lo, hi); by default powers of two
+    covering the trace (1, 2, 4, ..., 2^ceil(log2 H)).
+    Returns a DataFrame with one row per nonempty class.
+    """
+    sizes = np.asarray(job_sizes)
+    flows = flow_times(completion_times, arrival_times).astype(np.float64)
+    if len(sizes) == 0:
+        return pd.DataFrame()
+    if bins is None:
+        top = int(np.ceil(np.log2(max(int(sizes.max()), 1)))) + 1
+        bins = 2 ** np.arange(top + 1)
+    bins = np.asarray(bins)
+    classes = np.searchsorted(bins, sizes, side='right') - 1
+
+    df = pd.DataFrame({
+        'size_class': classes,
+        'flow_time': flows,
+        'squared_flow_time': flows * flows,
+        'slowdown': flows / np.maximum(sizes, 1),
+    })
+    grouped = df.groupby('size_class')
+    result = pd.DataFrame({
+        'num_jobs': grouped['flow_time'].size(),
+        'avg_flow_time': grouped['flow_time'].mean(),
+        'l2_norm_flow_time': np.sqrt(grouped['squared_flow_time'].sum()),
+        'max_flow_time': grouped['flow_time'].max(),
+        'avg_slowdown': grouped['slowdown'].mean(),
+    }).reset_index()
+    result.insert(1, 'size_lo', [bins[c] if 0 <= c < len(bins) else np.nan for c in result['size_class']])
+    result.insert(2, 'size_hi', [bins[c + 1] if 0 <= c + 1 < len(bins) else np.inf for c in result['size_class']])
+    return result
+
+def trace_statistics(trace_file, completion_file, percentiles=(50, 95, 99)):
+    """flow_statistics of a stored run, read back from the trace CSV and its .npy (no re-simulation)."""
+    arrival_times, job_sizes = load_trace_arrays(trace_file)
+    return flow_statistics(load_completion_times(completion_file), arrival_times, job_sizes, percentiles)
@@ -90,11 +90,23 @@ class MLF:
     
     def increase(self, job: Job):
         """Process job and handle MLFQ queue transitions"""
+        self.advance(job, 1)
+    
+    def ticks_until_event(self, job: Job) -> int:
+        """Whole time units until the job completes or uses up its current quantum"""
+        to_completion = math.ceil(job.processing_time) - job.executing_time
+        to_demotion = math.ceil(self.calculate_target(job)) - job.time_in_current_queue
+        return int(max(1, min(to_completion, to_demotion)))
+    
+    def advance(self, job: Job, amount: int):
+        """Process job for `amount` time units and handle MLFQ queue transitions.
+        Equivalent to `amount` increase() calls as long as amount <= ticks_until_event(job),
+        since the quantum can then only expire on the last unit."""
         if job not in self.active_jobs:
             return
             
-        job.executing_time += 1
-        job.time_in_current_queue += 1
+        job.executing_time += amount
+        job.time_in_current_queue += amount
         
         # Check if job has used its time quantum
         target = self.calculate_target(job)
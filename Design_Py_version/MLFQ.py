@@ -1,58 +1,141 @@
 import numpy as np
 from collections import deque
 import pandas as pd
+import os
+import process_avg_folders as paf
+import process_random_folders as prf
+import process_softrandom_folders as psf
+from FCFS_Kernel import flow_time_sums
+from Flow_Metrics import completion_array
+from Job_Set import JobSet
+import logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
 def Read_csv(filename):
 # Read the CSV file into a DataFrame 
     data_frame = pd.read_csv(filename)
     data_list = data_frame.values.tolist()
     return data_list
-def Mlfq(jobs, num_queues=100):
+
+def Mlfq(jobs, num_queues=100, return_completion_times=False):
+    """
+    Multi-Level Feedback Queue: level i runs a job for a quantum of 2^i (a full quantum
+    once started), then demotes it to level i + 1; the last level is round robin.
+    - `nonempty` is an integer bitmask of nonempty levels; its lowest set bit is the next level.
+    - Job state lives in parallel arrays (arrival, remaining, first_executed_time) and
+      the level deques hold job indices only.
+    - When nothing is runnable, time jumps to the next arrival.
+
+    Args:
+        jobs: [[arrival_time, job_size], ...] or [{'arrival_time': int, 'job_size': int}, ...]
+
+    Returns:
+        Tuple of (average_flow_time, l2_norm_flow_time, maximum_flow_time), plus the int64
+        completion times in original job order when return_completion_times is set
+    """
+    if isinstance(jobs, JobSet):
+        jobs = jobs.pairs()
+    elif jobs and isinstance(jobs[0], dict):
+        jobs = [(job['arrival_time'], job['job_size']) for job in jobs]
+    order = sorted(range(len(jobs)), key=lambda i: jobs[i][0])  # arrival rank -> original index
+    jobs = [jobs[i] for i in order]
+    n = len(jobs)
+    if n == 0:
+        return 0.0, 0.0, 0.0
+
+    arrival = [job[0] for job in jobs]
+    remaining = [job[1] for job in jobs]
+    first_executed_time = [None] * n
+    flow_times = np.zeros(n, dtype=np.result_type(np.asarray(arrival), np.asarray(remaining)))
+
     queues = [deque() for _ in range(num_queues)]
     time_quanta = [2 ** i for i in range(num_queues)]
-    
+    nonempty = 0
+    last_level = num_queues - 1
+
     current_time = 0
-    flow_times = []
-    jobs_in_system = len(jobs)
-    logs = []  # Initialize logs list
-    
-    # Convert job tuples to lists to allow modification
-    jobs = [[job[0], job[1]] for job in jobs]  # Format: [arrival_time, job_size]
-    jobs.sort(key=lambda x: x[0])
     job_index = 0
+    jobs_in_system = n
 
     while jobs_in_system > 0:
-        while job_index < len(jobs) and jobs[job_index][0] <= current_time:
-            queues[0].append([jobs[job_index], current_time, 0, None, False])  # Include job as list
-            job_index += 1
-
-        for i, queue in enumerate(queues):
-            if queue:
-                job, start_time, _, first_executed_time, _ = queue.popleft()
-                quantum = min(time_quanta[i], job[1])
-                
-                if first_executed_time is None:
-                    first_executed_time = current_time
-                
-                job[1] -= quantum
-                current_time += quantum
-                
-                if job[1] == 0:
-                    flow_times.append(current_time - job[0])
-                    jobs_in_system -= 1
-                    logs.append({'arrival_time': job[0], 'first_executed_time': first_executed_time, 'ifdone': True})
-                elif i < num_queues - 1:
-                    queues[i + 1].append([job, start_time, i + 1, first_executed_time, False])
-                else:
-                    queues[i].append([job, start_time, i, first_executed_time, False])
-                
-                break
+        if job_index < n and arrival[job_index] <= current_time:
+            while job_index < n and arrival[job_index] <= current_time:
+                queues[0].append(job_index)
+                job_index += 1
+            nonempty |= 1
+
+        if not nonempty:
+            # Nothing runnable: jump to the next arrival
+            current_time = arrival[job_index]
+            continue
+
+        i = (nonempty & -nonempty).bit_length() - 1
+        queue = queues[i]
+        k = queue.popleft()
+        if not queue:
+            nonempty &= ~(1 << i)
+
+        quantum = min(time_quanta[i], remaining[k])
+        if first_executed_time[k] is None:
+            first_executed_time[k] = current_time
+        remaining[k] -= quantum
+        current_time += quantum
+
+        if remaining[k] == 0:
+            flow_times[k] = current_time - arrival[k]
+            jobs_in_system -= 1
         else:
-            if job_index < len(jobs):
-                current_time = jobs[job_index][0]
-            else:
-                current_time += 1
+            level = i + 1 if i < last_level else i
+            queues[level].append(k)
+            nonempty |= 1 << level
+
+    total_flow_time, squared_flow_time, max_flow = flow_time_sums(flow_times)
+    average_flow_time = total_flow_time / n
+    flow_time_l2_norm = squared_flow_time ** 0.5
 
-    average_flow_time = np.mean(flow_times)
-    flow_time_l2_norm = np.linalg.norm(flow_times)
+    if return_completion_times:
+        completion_times = np.empty_like(flow_times)
+        completion_times[order] = flow_times + np.asarray(arrival, dtype=flow_times.dtype)
+        return average_flow_time, flow_time_l2_norm, max_flow, completion_array(completion_times)
+    return average_flow_time, flow_time_l2_norm, max_flow
+
+def main():
+    """Main function to process all data"""
+    
+    # Configuration
+    data_dir = 'data'  # Base directory containing avg_30, freq_*, and softrandom folders
+    output_dir = 'MLFQ_result'  # Output directory for results
+    logger.info("="*60)
+    logger.info(f"Starting MLFQ batch processing:")
+    logger.info(f"  Data directory: {data_dir}")
+    logger.info(f"  Output directory: {output_dir}")
+    logger.info("="*60)
+    
+    # Create main output directory
+    os.makedirs(output_dir, exist_ok=True)
+    
+    # Process avg30 files
+    logger.info("\n" + "="*40)
+    logger.info("Processing avg_30 files...")
+    logger.info("="*40)
+    paf.process_avg_folders(Mlfq,'MLFQ',data_dir, output_dir)
+    
+    # Process random files
+    logger.info("\n" + "="*40)
+    logger.info("Processing random files...")
+    logger.info("="*40)
+    prf.process_random_folders(Mlfq,'MLFQ',data_dir, output_dir)
+    
+    # Process softrandom files
+    logger.info("\n" + "="*40)
+    logger.info("Processing softrandom files...")
+    logger.info("="*40)
+    psf.process_softrandom_folders(Mlfq,'MLFQ',data_dir, output_dir)
+    
+    logger.info("\n" + "="*60)
+    logger.info("MLFQ batch processing completed successfully!")
+    logger.info("="*60)
 
-    return average_flow_time, flow_time_l2_norm
\ No newline at end of file
+if __name__ == "__main__":
+    main()
\ No newline at end of file
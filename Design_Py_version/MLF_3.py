@@ -0,0 +1,206 @@
+from typing import Optional, List, Set
+import heapq
+import math
+import random
+
+class Job:
+    """Slotted job record; equality and hashing are by identity (one Job per scheduled job)."""
+    __slots__ = ('id', 'arrival_time', 'processing_time', 'beta',
+                 'executing_time', 'current_queue', 'time_in_current_queue', 'completion_time',
+                 'prev', 'next')
+
+    def __init__(self, id: int, arrival_time: float, processing_time: float, beta: float = 0.0):
+        self.id = id
+        self.arrival_time = arrival_time
+        self.processing_time = processing_time
+        self.beta = beta
+
+        # Dynamic properties
+        self.executing_time = 0.0
+        self.current_queue = 0
+        self.time_in_current_queue = 0.0
+        self.completion_time = 0.0
+
+        # Links of the queue the job currently sits in
+        self.prev: Optional['Job'] = None
+        self.next: Optional['Job'] = None
+
+    def get_remaining_time(self) -> float:
+        return self.processing_time - self.executing_time
+
+    def is_completed(self) -> bool:
+        return self.executing_time >= self.processing_time
+
+    def __repr__(self):
+        return (f"Job(id={self.id}, arrival_time={self.arrival_time}, processing_time={self.processing_time}, "
+                f"executing_time={self.executing_time}, current_queue={self.current_queue})")
+
+class MLFQueue:
+    """FIFO queue as an intrusive doubly linked list: O(1) enqueue, head pop and removal."""
+    __slots__ = ('level', 'head', 'tail', 'size')
+
+    def __init__(self, level: int):
+        self.level = level
+        self.head: Optional[Job] = None
+        self.tail: Optional[Job] = None
+        self.size = 0
+
+    def enqueue(self, job: Job):
+        job.prev = self.tail
+        job.next = None
+        if self.tail is None:
+            self.head = job
+        else:
+            self.tail.next = job
+        self.tail = job
+        self.size += 1
+        job.current_queue = self.level
+
+    def dequeue(self, job: Optional[Job] = None) -> Optional[Job]:
+        if job is None:
+            job = self.head
+            if job is None:
+                return None
+        if job.prev is None:
+            self.head = job.next
+        else:
+            job.prev.next = job.next
+        if job.next is None:
+            self.tail = job.prev
+        else:
+            job.next.prev = job.prev
+        job.prev = job.next = None
+        self.size -= 1
+        return job
+
+    @property
+    def is_empty(self) -> bool:
+        return self.size == 0
+
+    @property
+    def length(self) -> int:
+        return self.size
+
+    def __iter__(self):
+        job = self.head
+        while job is not None:
+            yield job
+            job = job.next
+
+    def get_jobs_list(self) -> List[Job]:
+        return list(self)
+
+class MLF:
+    """
+    Indexed MLF container, drop-in for MLF/MLF_2 (same insert/remove/increase and beta rules):
+    - queues are linked lists, so every queue operation is O(1);
+    - `nonempty` is a bitmap of nonempty levels, so first_job() (RMLF selection) is O(1);
+    - an arrival-ordered heap over the same job set answers earliest_job() (FCFS selection)
+      in O(log n) amortized, with completed jobs dropped lazily.
+    """
+    TAU = 12
+
+    def __init__(self, initial_queues: int = 1, first_level_quantum: float = 2.0):
+        self.queues = [MLFQueue(level) for level in range(initial_queues)]
+        self.nonempty = 0
+        self.active_jobs: Set[Job] = set()
+        self.arrival_index = []  # min-heap: (arrival_time, id, insert_seq, job)
+        self.finished_jobs: List[Job] = []
+        self.total_jobs = 0
+        self.first_level_quantum = first_level_quantum
+
+    def _enqueue(self, level: int, job: Job):
+        if level >= len(self.queues):
+            self.queues.extend(MLFQueue(k) for k in range(len(self.queues), level + 1))
+        self.queues[level].enqueue(job)
+        self.nonempty |= 1 << level
+
+    def _dequeue(self, job: Job):
+        queue = self.queues[job.current_queue]
+        queue.dequeue(job)
+        if queue.size == 0:
+            self.nonempty &= ~(1 << queue.level)
+
+    def insert(self, job: Job):
+        """Insert job into lowest queue"""
+        self.total_jobs += 1
+        job.beta = self.generate_beta(self.total_jobs)
+        job.current_queue = 0
+        job.time_in_current_queue = 0
+
+        self._enqueue(0, job)
+        self.active_jobs.add(job)
+        heapq.heappush(self.arrival_index, (job.arrival_time, job.id, self.total_jobs, job))
+
+    def remove(self, job: Job):
+        """Remove completed job"""
+        if job in self.active_jobs:
+            self.active_jobs.remove(job)
+            self.finished_jobs.append(job)
+            self._dequeue(job)
+
+    def first_job(self) -> Optional[Job]:
+        """Head of the lowest nonempty queue (RMLF selection)"""
+        if not self.nonempty:
+            return None
+        level = (self.nonempty & -self.nonempty).bit_length() - 1
+        return self.queues[level].head
+
+    def earliest_job(self) -> Optional[Job]:
+        """Active job with the earliest arrival, ties by job id (FCFS selection)"""
+        index = self.arrival_index
+        while index and index[0][3] not in self.active_jobs:
+            heapq.heappop(index)
+        return index[0][3] if index else None
+
+    def increase(self, job: Job):
+        """Process job and handle MLFQ queue transitions"""
+        self.advance(job, 1)
+
+    def ticks_until_event(self, job: Job) -> int:
+        """Whole time units until the job completes or uses up its current quantum"""
+        to_completion = math.ceil(job.processing_time) - job.executing_time
+        to_demotion = math.ceil(self.calculate_target(job)) - job.time_in_current_queue
+        return int(max(1, min(to_completion, to_demotion)))
+
+    def advance(self, job: Job, amount: int):
+        """Process job for `amount` time units and handle MLFQ queue transitions.
+        Equivalent to `amount` increase() calls as long as amount <= ticks_until_event(job),
+        since the quantum can then only expire on the last unit."""
+        if job not in self.active_jobs:
+            return
+
+        job.executing_time += amount
+        job.time_in_current_queue += amount
+
+        # Check if job has used its time quantum
+        target = self.calculate_target(job)
+        if job.time_in_current_queue >= target:
+            # Move to next lower priority queue (higher number)
+            self._dequeue(job)
+            self._enqueue(job.current_queue + 1, job)
+            job.time_in_current_queue = 0
+
+    def generate_beta(self, job_index: int) -> float:
+        if job_index <= 3:
+            return 2.0
+        return -math.log(1 - random.random()) / (self.TAU * math.log(job_index))
+
+    def calculate_target(self, job: Job) -> float:
+        if job.current_queue == 0:
+            base_target = max(1, self.first_level_quantum - job.beta)
+        else:
+            base_target = max(1, 2 - job.beta)
+
+        # Apply exponential growth for lower priority queues
+        if job.current_queue == 0:
+            return base_target
+        else:
+            return 2 ** (job.current_queue - 1) * base_target * 2
+
+    def get_queue_status(self) -> str:
+        status = []
+        for i, queue in enumerate(self.queues):
+            jobs_info = [f"{job.id}({job.get_remaining_time():.1f})" for job in queue.get_jobs_list()]
+            status.append(f"Queue {i}: {len(jobs_info)} jobs - [{', '.join(jobs_info)}]")
+        return "\n".join(status)
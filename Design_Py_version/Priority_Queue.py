@@ -0,0 +1,147 @@
+import heapq
+
+class HeapQueue:
+    """
+    Binary-heap priority queue (heapq) over tuple entries; the default for every engine.
+    Entries compare as tuples, so the first field is the priority and later fields break ties.
+    """
+    __slots__ = ('entries',)
+
+    def __init__(self, entries=None):
+        self.entries = list(entries) if entries else []
+        heapq.heapify(self.entries)
+
+    def push(self, entry):
+        heapq.heappush(self.entries, entry)
+
+    def pop(self):
+        """Remove and return the smallest entry (None if empty)."""
+        return heapq.heappop(self.entries) if self.entries else None
+
+    def peek(self):
+        """Smallest entry without removing it (None if empty)."""
+        return self.entries[0] if self.entries else None
+
+    def copy(self):
+        clone = HeapQueue()
+        clone.entries = list(self.entries)
+        return clone
+
+    def __iter__(self):
+        """Entries in no particular order."""
+        return iter(self.entries)
+
+    def __len__(self):
+        return len(self.entries)
+
+
+class BucketQueue:
+    """
+    Bucketed (calendar) priority queue for entries whose first field is a non-negative int,
+    e.g. (remaining_time, arrival_time, job_index) with ceil'd integer job sizes.
+    - One bucket per distinct priority; a bucket is a small heap ordering the tie-break fields.
+    - A hierarchical bitmap of nonempty priorities (64-ary levels, grown on demand) finds the
+      minimum in O(log_64 H) word operations, about 3 for H = 2^18; the current minimum
+      priority is cached, so peek() is O(1) and the bitmap is only walked when a bucket empties.
+    SRPT priorities are not monotone (an arrival can be smaller than the last pop), so a radix
+    heap does not apply; the bitmap supports arbitrary insert order.
+    """
+    __slots__ = ('buckets', 'levels', 'size', 'top')
+
+    def __init__(self, entries=None):
+        self.buckets = {}     # priority -> min-heap of entries
+        self.levels = [{}]    # levels[0]: bit per priority, levels[j + 1]: bit per nonzero word of levels[j]
+        self.size = 0
+        self.top = None       # smallest nonempty priority
+        for entry in entries or ():
+            self.push(entry)
+
+    def _mark(self, key):
+        while key >> (6 * len(self.levels)):
+            # Grow by one level; all current keys live under word 0 of the new top
+            top = self.levels[-1]
+            self.levels.append({0: 1} if top else {})
+        for level in self.levels:
+            word, bit = key >> 6, 1 << (key & 63)
+            old = level.get(word, 0)
+            level[word] = old | bit
+            if old:
+                break
+            key = word
+
+    def _unmark(self, key):
+        for level in self.levels:
+            word = key >> 6
+            value = level[word] & ~(1 << (key & 63))
+            if value:
+                level[word] = value
+                break
+            del level[word]
+            key = word
+
+    def _min_key(self):
+        key = 0
+        for level in reversed(self.levels):
+            value = level[key]
+            key = (key << 6) | ((value & -value).bit_length() - 1)
+        return key
+
+    def push(self, entry):
+        key = entry[0]
+        bucket = self.buckets.get(key)
+        if bucket is None:
+            self.buckets[key] = [entry]
+            self._mark(key)
+            if self.top is None or key < self.top:
+                self.top = key
+        else:
+            heapq.heappush(bucket, entry)
+        self.size += 1
+
+    def pop(self):
+        """Remove and return the smallest entry (None if empty)."""
+        if not self.size:
+            return None
+        key = self.top
+        bucket = self.buckets[key]
+        entry = heapq.heappop(bucket)
+        self.size -= 1
+        if not bucket:
+            del self.buckets[key]
+            self._unmark(key)
+            self.top = self._min_key() if self.size else None
+        return entry
+
+    def peek(self):
+        """Smallest entry without removing it (None if empty)."""
+        if not self.size:
+            return None
+        return self.buckets[self.top][0]
+
+    def copy(self):
+        clone = BucketQueue()
+        clone.buckets = {key: list(bucket) for key, bucket in self.buckets.items()}
+        clone.levels = [dict(level) for level in self.levels]
+        clone.size = self.size
+        clone.top = self.top
+        return clone
+
+    def __iter__(self):
+        """Entries in no particular order."""
+        for bucket in self.buckets.values():
+            yield from bucket
+
+    def __len__(self):
+        return self.size
+
+
+PRIORITY_QUEUES = {
+    'heap': HeapQueue,
+    'bucket': BucketQueue,
+}
+
+def make_priority_queue(queue_type='heap'):
+    """Priority queue factory used by the engines' queue_type parameter ('heap' or 'bucket')."""
+    if queue_type not in PRIORITY_QUEUES:
+        raise ValueError(f"Unknown queue_type {queue_type!r}, expected one of {sorted(PRIORITY_QUEUES)}")
+    return PRIORITY_QUEUES[queue_type]()
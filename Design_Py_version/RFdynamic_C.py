@@ -5,8 +5,8 @@ import os
 import re
 import pandas as pd
 from typing import Optional, List, Dict, Any, Tuple
-from MLF_2 import Job, MLF
-from itertools import count
+from MLF_3 import Job, MLF
+from Flow_Metrics import completion_array
 
 def extract_file_info(input_file_name):
     """Extract information from the input file path"""
@@ -199,31 +199,18 @@ def save_round_details(input_file_name, checkpoint, mode, algorithm_history):
         for i, algo in enumerate(algorithm_history, 1):
             writer.writerow([i, algo])
 
-def RFdynamic_C(jobs: List[Dict[str, Any]], checkpoint = 100, mode: int = 1, input_filename=None) -> Tuple[float, float]:
+def RFdynamic_C(jobs: List[Dict[str, Any]], checkpoint = 100, mode: int = 1, input_filename=None,
+                return_completion_times: bool = False) -> Tuple[float, float]:
     if not jobs:
         return 0.0, 0.0
 
     def fcfs_selector(mlf: MLF) -> Optional[Job]:
-        """Select next job using FCFS policy"""
-        earliest_job = None
-        earliest_arrival = float('inf')
-        
-        for job in mlf.active_jobs:
-            if job.arrival_time < earliest_arrival and not job.is_completed():
-                earliest_arrival = job.arrival_time
-                earliest_job = job
-                
-        return earliest_job
+        """Select next job using FCFS policy (arrival-ordered index, ties by job id)"""
+        return mlf.earliest_job()
 
     def rmlf_selector(mlf: MLF) -> Optional[Job]:
-        """Select next job using RMLF policy"""
-        for queue in mlf.queues:
-            if not queue.is_empty:
-                jobs_in_queue = queue.get_jobs_list()
-                for job in jobs_in_queue:
-                    if not job.is_completed():
-                        return job
-        return None
+        """Select next job using RMLF policy (head of the lowest nonempty queue)"""
+        return mlf.first_job()
     
     # Initialize MLF and variables
     initial_queues = 1
@@ -254,8 +241,16 @@ def RFdynamic_C(jobs: List[Dict[str, Any]], checkpoint = 100, mode: int = 1, inp
     job_progress = {job['job_index']: 0 for job in sorted_jobs}
     job_sizes = {job['job_index']: int(job['job_size']) for job in sorted_jobs}
     
-    # Main scheduling loop
-    for current_time in count():
+    # Active-set aggregates for the closed-form round score
+    n_active = 0
+    active_arrival_sum = 0
+    current_time = 0
+    
+    # Main scheduling loop (event-driven)
+    # Events are arrivals, completions, quantum expiries and round boundaries at multiples of
+    # checkpoint. Between two events the tick-by-tick schedule keeps running the same job on
+    # the same active set, so the per-tick score sum(t - arrival) is integrated in closed form.
+    while n_completed_jobs < n_jobs:
         # Process new job arrivals
         while (jobs_pointer < len(sorted_jobs) and 
                sorted_jobs[jobs_pointer]['arrival_time'] <= current_time):
@@ -265,6 +260,8 @@ def RFdynamic_C(jobs: List[Dict[str, Any]], checkpoint = 100, mode: int = 1, inp
                 processing_time=sorted_jobs[jobs_pointer]['job_size']
             )
             mlf.insert(new_job)
+            n_active += 1
+            active_arrival_sum += new_job.arrival_time
             jobs_pointer += 1
         
         # Start of new round
@@ -357,10 +354,24 @@ def RFdynamic_C(jobs: List[Dict[str, Any]], checkpoint = 100, mode: int = 1, inp
             current_job_id = None
             selected_job = None
         
+        # Length of this step: up to the next arrival or round boundary, and for a running
+        # job up to its completion or quantum expiry (after which the selection may change)
+        step = checkpoint - current_time % checkpoint
+        if jobs_pointer < len(sorted_jobs):
+            step = min(step, math.ceil(sorted_jobs[jobs_pointer]['arrival_time'] - current_time))
+        if selected_job is not None:
+            step = min(step, job_sizes[current_job_id] - job_progress[current_job_id],
+                       mlf.ticks_until_event(selected_job))
+        step = int(step)
+        last_tick = current_time + step - 1
+        
+        # Score of the active set over ticks current_time .. last_tick
+        step_score = n_active * (step * current_time + step * (step - 1) // 2) - active_arrival_sum * step
+        
         # Process selected job
         if selected_job and current_job_id is not None:
-            job_progress[current_job_id] += 1
-            mlf.increase(selected_job)
+            job_progress[current_job_id] += step
+            mlf.advance(selected_job, step)
             
             # Check for job completion
             if job_progress[current_job_id] >= job_sizes[current_job_id]:
@@ -369,16 +380,22 @@ def RFdynamic_C(jobs: List[Dict[str, Any]], checkpoint = 100, mode: int = 1, inp
                     'arrival_time': selected_job.arrival_time,
                     'job_size': selected_job.processing_time,
                     'job_index': selected_job.id,
-                    'completion_time': current_time + 1
+                    'completion_time': last_tick + 1
                 })
                 n_completed_jobs += 1
                 round_completed_jobs += 1
+                n_active -= 1
+                active_arrival_sum -= selected_job.arrival_time
                 
                 if n_completed_jobs == n_jobs:
                     break
+                
+                # A completed job no longer counts on its last tick
+                step_score -= last_tick - selected_job.arrival_time
         
         # Update round score
-        round_score += sum(current_time - job.arrival_time for job in mlf.active_jobs)
+        round_score += step_score
+        current_time = last_tick
         
         # End of round processing
         if current_time > 0 and (current_time + 1) % checkpoint == 0:
@@ -405,6 +422,8 @@ def RFdynamic_C(jobs: List[Dict[str, Any]], checkpoint = 100, mode: int = 1, inp
                 fcfs_scores_history.append(float('inf'))
 
             current_round += 1
+        
+        current_time += 1
     
     flow_times = [job['completion_time'] - job['arrival_time'] for job in completed_jobs]
     avg_flow_time = sum(flow_times) / len(flow_times) if flow_times else 0
@@ -414,4 +433,11 @@ def RFdynamic_C(jobs: List[Dict[str, Any]], checkpoint = 100, mode: int = 1, inp
     if input_filename:
         save_analysis_results(input_filename, checkpoint, mode, algorithm_history, current_round - 1)
     
+    if return_completion_times:
+        # Completion times in original job order
+        position = {job['job_index']: i for i, job in enumerate(jobs)}
+        completion_times = [0] * len(jobs)
+        for job in completed_jobs:
+            completion_times[position[job['job_index']]] = job['completion_time']
+        return avg_flow_time, l2_norm, completion_array(completion_times)
     return avg_flow_time, l2_norm
\ No newline at end of file
@@ -5,8 +5,11 @@ import os
 import copy
 import re
 import pandas as pd
+from collections import deque
 from typing import Optional, List, Dict, Any, Tuple
-from MLF_2 import Job, MLF
+from MLF_3 import Job, MLF
+from Flow_Metrics import completion_array
+from FCFS_Kernel import fcfs_flow_times, flow_time_sums
 from itertools import count
 
 def extract_file_info(input_file_name):
@@ -201,44 +204,20 @@ def save_round_details(input_file_name, checkpoint, mode, algorithm_history):
             writer.writerow([i, algo])
 
 def simulate_fcfs_on_jobs(job_pool):
-    """Simulate FCFS on a pool of jobs to get L2 norm"""
+    """Simulate FCFS on a pool of jobs to get L2 norm (closed-form FCFS_Kernel scan, arrival order then pool order)"""
     if not job_pool:
         return 0.0
     
-    jobs = sorted(job_pool, key=lambda x: x['arrival_time'])
-    current_time = 0
-    completed_jobs = []
-    waiting_queue = []
-    jobs_pointer = 0
-    current_job = None
-    
-    while len(completed_jobs) < len(jobs):
-        # Add jobs that arrive at current time
-        while jobs_pointer < len(jobs) and jobs[jobs_pointer]['arrival_time'] <= current_time:
-            waiting_queue.append(jobs[jobs_pointer].copy())
-            jobs_pointer += 1
-        
-        # Select next job if no current job
-        if current_job is None and waiting_queue:
-            current_job = waiting_queue.pop(0)
-        
-        # Process current job
-        if current_job:
-            current_job['remaining_time'] -= 1
-            if current_job['remaining_time'] == 0:
-                completion_time = current_time + 1
-                flow_time = completion_time - current_job['arrival_time']
-                completed_jobs.append(flow_time)
-                current_job = None
-        
-        current_time += 1
+    flow_times = fcfs_flow_times([job['arrival_time'] for job in job_pool],
+                                 [job['remaining_time'] for job in job_pool],
+                                 tie_break_by_size=False)
     
     # Calculate L2 norm
-    l2_norm = math.sqrt(sum(t * t for t in completed_jobs)) if completed_jobs else 0
-    return l2_norm
+    _, sum_sq_flow, _ = flow_time_sums(flow_times)
+    return math.sqrt(sum_sq_flow)
 
 def simulate_rmlf_on_jobs(job_pool):
-    """Simulate RMLF on a pool of jobs to get L2 norm"""
+    """Simulate RMLF on a pool of jobs to get L2 norm (event-driven, same flows as stepping one time unit at a time)"""
     if not job_pool:
         return 0.0
     
@@ -247,79 +226,49 @@ def simulate_rmlf_on_jobs(job_pool):
     current_time = 0
     completed_flow_times = []
     jobs_pointer = 0
-    job_progress = {}
-    
-    # Create MLF jobs
-    mlf_jobs = {}
-    for job in jobs:
-        mlf_job = Job(
-            id=job['job_index'],
-            arrival_time=job['arrival_time'],
-            processing_time=job['job_size']
-        )
-        mlf_jobs[job['job_index']] = mlf_job
-        job_progress[job['job_index']] = 0
     
     while len(completed_flow_times) < len(jobs):
-        # Add jobs that arrive at current time
+        # Add jobs that arrive by current time (inserted in arrival order, so betas are drawn in the same order)
         while jobs_pointer < len(jobs) and jobs[jobs_pointer]['arrival_time'] <= current_time:
-            mlf.insert(mlf_jobs[jobs[jobs_pointer]['job_index']])
+            job = jobs[jobs_pointer]
+            mlf.insert(Job(id=job['job_index'], arrival_time=job['arrival_time'], processing_time=job['job_size']))
             jobs_pointer += 1
         
+        next_arrival = jobs[jobs_pointer]['arrival_time'] if jobs_pointer < len(jobs) else None
+        
         # Select next job using RMLF
-        selected_job = None
-        for queue in mlf.queues:
-            if not queue.is_empty:
-                jobs_in_queue = queue.get_jobs_list()
-                for job in jobs_in_queue:
-                    if job_progress[job.id] < job.processing_time:
-                        selected_job = job
-                        break
-                if selected_job:
-                    break
+        selected_job = mlf.first_job()
+        if selected_job is None:
+            current_time = math.ceil(next_arrival)
+            continue
         
-        # Process selected job
-        if selected_job:
-            job_progress[selected_job.id] += 1
-            mlf.increase(selected_job)
-            
-            if job_progress[selected_job.id] >= selected_job.processing_time:
-                mlf.remove(selected_job)
-                completion_time = current_time + 1
-                flow_time = completion_time - selected_job.arrival_time
-                completed_flow_times.append(flow_time)
+        # Run it until its completion, its quantum expiry or the next arrival
+        run_time = mlf.ticks_until_event(selected_job)
+        if next_arrival is not None:
+            run_time = min(run_time, math.ceil(next_arrival - current_time))
+        mlf.advance(selected_job, run_time)
+        current_time += run_time
         
-        current_time += 1
+        if selected_job.is_completed():
+            mlf.remove(selected_job)
+            completed_flow_times.append(current_time - selected_job.arrival_time)
     
     # Calculate L2 norm
     l2_norm = math.sqrt(sum(t * t for t in completed_flow_times)) if completed_flow_times else 0
     return l2_norm
 
-def RFdynamic_NC(jobs: List[Dict[str, Any]], checkpoint = 100, mode: int = 1, input_filename=None) -> Tuple[float, float]:
+def RFdynamic_NC(jobs: List[Dict[str, Any]], checkpoint = 100, mode: int = 1, input_filename=None,
+                 return_completion_times: bool = False) -> Tuple[float, float]:
     if not jobs:
         return 0.0, 0.0
 
     def fcfs_selector(mlf: MLF) -> Optional[Job]:
-        """Select next job using FCFS policy"""
-        earliest_job = None
-        earliest_arrival = float('inf')
-        
-        for job in mlf.active_jobs:
-            if job.arrival_time < earliest_arrival and not job.is_completed():
-                earliest_arrival = job.arrival_time
-                earliest_job = job
-                
-        return earliest_job
+        """Select next job using FCFS policy (arrival-ordered index, ties by job id)"""
+        return mlf.earliest_job()
 
     def rmlf_selector(mlf: MLF) -> Optional[Job]:
-        """Select next job using RMLF policy"""
-        for queue in mlf.queues:
-            if not queue.is_empty:
-                jobs_in_queue = queue.get_jobs_list()
-                for job in jobs_in_queue:
-                    if not job.is_completed():
-                        return job
-        return None
+        """Select next job using RMLF policy (head of the lowest nonempty queue)"""
+        return mlf.first_job()
     
     # Initialize MLF and variables
     initial_queues = 1
@@ -339,8 +288,10 @@ def RFdynamic_NC(jobs: List[Dict[str, Any]], checkpoint = 100, mode: int = 1, in
     job_progress = {job['job_index']: 0 for job in sorted_jobs}
     job_sizes = {job['job_index']: int(job['job_size']) for job in sorted_jobs}
     
-    # Job pool for simulation
-    job_size_pool = []
+    # Job pool for simulation: only the latest `checkpoint` completions are ever simulated,
+    # so keep them in a ring buffer; cumulative weights (1, 1+2, ...) are maintained while it fills
+    job_size_pool = deque(maxlen=checkpoint)
+    pool_cum_weights = []
     job_finished_counter = 0
     n_arrival_jobs = 0
     
@@ -379,14 +330,14 @@ def RFdynamic_NC(jobs: List[Dict[str, Any]], checkpoint = 100, mode: int = 1, in
         
         if checkpoint_triggered:
             # Prepare job pool for simulation
-            simulation_pool = job_size_pool[-checkpoint:].copy() if len(job_size_pool) >= checkpoint else job_size_pool.copy()
+            simulation_pool = list(job_size_pool)
             
             # If not enough jobs, randomly sample from pool with preference for recent arrivals
+            # (the ring buffer has not wrapped yet here, so it still holds the whole history)
             if len(simulation_pool) < checkpoint and len(job_size_pool) > 0:
                 needed = checkpoint - len(simulation_pool)
-                # Create weighted sampling - more recent arrivals have higher weight
-                weights = [i + 1 for i in range(len(job_size_pool))]  # Later indices have higher weights
-                sampled_indices = random.choices(range(len(job_size_pool)), weights=weights, k=min(needed, len(job_size_pool)))
+                # Weighted sampling - later indices have higher weights (i + 1)
+                sampled_indices = random.choices(range(len(job_size_pool)), cum_weights=pool_cum_weights, k=min(needed, len(job_size_pool)))
                 
                 for idx in sampled_indices:
                     if len(simulation_pool) < checkpoint:
@@ -505,6 +456,8 @@ def RFdynamic_NC(jobs: List[Dict[str, Any]], checkpoint = 100, mode: int = 1, in
                     'job_size': selected_job.processing_time,
                     'remaining_time': selected_job.processing_time
                 })
+                if len(pool_cum_weights) < checkpoint:
+                    pool_cum_weights.append((pool_cum_weights[-1] if pool_cum_weights else 0) + len(pool_cum_weights) + 1)
                 
                 if n_completed_jobs == n_jobs:
                     break
@@ -518,4 +471,11 @@ def RFdynamic_NC(jobs: List[Dict[str, Any]], checkpoint = 100, mode: int = 1, in
     if input_filename:
         save_analysis_results(input_filename, checkpoint, mode, algorithm_history, current_round - 1)
     
+    if return_completion_times:
+        # Completion times in original job order
+        position = {job['job_index']: i for i, job in enumerate(jobs)}
+        completion_times = [0] * len(jobs)
+        for job in completed_jobs:
+            completion_times[position[job['job_index']]] = job['completion_time']
+        return avg_flow_time, l2_norm, completion_array(completion_times)
     return avg_flow_time, l2_norm
\ No newline at end of file
@@ -1,9 +1,11 @@
 import math
 import pandas as pd
 import csv
-from typing import Optional, List, Dict, Any, Tuple
-from MLF import Job, MLF
-from itertools import count
+from typing import List, Dict, Any, Tuple
+from MLF_3 import Job, MLF
+from Sim_Kernel import Policy, Kernel
+from FCFS_Kernel import flow_time_sums
+from Flow_Metrics import completion_array
 
 def read_jobs_from_csv(filename: str) -> List[Dict[str, Any]]:
     jobs = []
@@ -24,74 +26,59 @@ def read_jobs_from_csv(filename: str) -> List[Dict[str, Any]]:
         print(f"Error reading CSV file: {e}")
     return jobs
 
-def RMLF(jobs: List[Dict[str, Any]]) -> Tuple[float, float]:
+class RMLFPolicy(Policy):
+    """
+    RMLF on the shared Sim_Kernel: the head of the lowest nonempty MLF queue runs until the
+    next quantum expiry (policy event), its completion or the next arrival. Between those
+    events the tick-by-tick version keeps selecting the same job, so flow times (and the
+    order of random beta draws) are identical to it.
+    """
+
+    def bind(self, kernel):
+        super().bind(kernel)
+        self.mlf = MLF(initial_queues=1)
+        self.mlf_jobs = {}  # job -> MLF Job record
+
+    def on_arrival(self, job, t):
+        new_job = Job(id=job, arrival_time=self.kernel.arrival[job], processing_time=self.kernel.size[job])
+        self.mlf_jobs[job] = new_job
+        self.mlf.insert(new_job)
+
+    def select(self, t):
+        # Head of the lowest nonempty queue (nonempty-level bitmap)
+        selected_job = self.mlf.first_job()
+        return None if selected_job is None else selected_job.id
+
+    def next_policy_event(self, job, t):
+        return t + self.mlf.ticks_until_event(self.mlf_jobs[job])
+
+    def on_preempt(self, job, t):
+        self.mlf.advance(self.mlf_jobs[job], self.kernel.run_time)
+
+    def on_complete(self, job, t):
+        selected_job = self.mlf_jobs.pop(job)
+        self.mlf.advance(selected_job, self.kernel.run_time)
+        self.mlf.remove(selected_job)
+
+def RMLF(jobs: List[Dict[str, Any]], return_completion_times: bool = False) -> Tuple[float, float]:
+    """
+    RMLFPolicy on the shared Sim_Kernel. Returns (avg_flow_time, l2_norm_flow_time), plus the
+    completion times in original job order when return_completion_times is set.
+    """
     if not jobs:
-        return 0.0, 0.0
+        return (0.0, 0.0, completion_array([])) if return_completion_times else (0.0, 0.0)
 
     # Create log file and write header
     # with open('RMLF_time_slot_log.csv', 'w', newline='') as log_file:
     #     log_writer = csv.writer(log_file)
     #     log_writer.writerow(['time_slot', 'executed_job_id'])
 
-    def rmlf_selector(mlf: MLF) -> Optional[Job]:
-        for queue in mlf.queues:
-            if not queue.is_empty:
-                jobs_in_queue = queue.get_jobs_list()
-                for job in jobs_in_queue:
-                    if job.processing_time > 0:
-                        return job
-        return None
+    kernel = Kernel(jobs, RMLFPolicy()).run()
 
-    # def log_execution(time_slot: int, job_id: Optional[int]):
-    #     with open('RMLF_time_slot_log.csv', 'a', newline='') as log_file:
-    #         log_writer = csv.writer(log_file)
-    #         log_writer.writerow([time_slot, '' if job_id is None else job_id])
-
-    mlf = MLF(initial_queues=1)
-    completed_jobs = []
-    sorted_jobs = sorted(jobs, key=lambda x: x['arrival_time'])
-    jobs_pointer = 0
-    n_jobs = len(sorted_jobs)
-    n_completed_jobs = 0
-    
-    # Main simulation loop
-    for current_time in count():
-        # Insert new jobs that have arrived
-        while (jobs_pointer < len(sorted_jobs) and 
-               sorted_jobs[jobs_pointer]['arrival_time'] == current_time):
-            new_job = Job(
-                id=sorted_jobs[jobs_pointer]['job_index'],
-                arrival_time=sorted_jobs[jobs_pointer]['arrival_time'],
-                processing_time=sorted_jobs[jobs_pointer]['job_size']
-            )
-            mlf.insert(new_job)
-            jobs_pointer += 1
-        
-        # Select and process job
-        selected_job = rmlf_selector(mlf)
-        if selected_job:
-            # Log the execution
-            #log_execution(current_time, selected_job.id)
-            
-            # Process the job
-            mlf.increase(selected_job)   
-            if selected_job.is_completed():
-                mlf.remove(selected_job)
-                completed_jobs.append({
-                    'arrival_time': selected_job.arrival_time,
-                    'job_size': selected_job.processing_time,
-                    'job_index': selected_job.id,
-                    'completion_time': current_time + 1
-                })
-                n_completed_jobs += 1
-                if n_completed_jobs == n_jobs:
-                    # Log the final time slot
-                    #log_execution(current_time + 1, None)
-                    break
-    
     # Calculate metrics
-    flow_times = [job['completion_time'] - job['arrival_time'] for job in completed_jobs]
-    avg_flow_time = sum(flow_times) / len(flow_times) if flow_times else 0
-    l2_norm = math.sqrt(sum(t * t for t in flow_times)) if flow_times else 0
-    
-    return avg_flow_time, l2_norm
\ No newline at end of file
+    total_flow, sum_sq_flow, _ = flow_time_sums(kernel.flow_times())
+    avg_flow_time = total_flow / kernel.n_jobs
+    l2_norm = math.sqrt(sum_sq_flow)
+    if return_completion_times:
+        return avg_flow_time, l2_norm, completion_array(kernel.completion_times())
+    return avg_flow_time, l2_norm
@@ -1,6 +1,9 @@
 from typing import List, Tuple
 from collections import deque
 from RR_Selector import RR_Selector_optimized as RR_Selector
+from Sim_Kernel import Policy
+from Job_Set import JobSet
+from Flow_Metrics import completion_array
 import os
 import csv
 import re
@@ -13,18 +16,52 @@ import process_random_folders as prf
 import process_softrandom_folders as psf
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
-def RR(jobs: List, time_quantum: int = 1) -> Tuple[float, float,float]:
+
+class RRPolicy(Policy):
+    """
+    Round Robin on the shared Sim_Kernel: a slice ends at the quantum, the job's completion
+    or the next arrival, and the job then goes to the back of the ready queue (before the
+    jobs admitted at that instant), as in RR.
+    """
+
+    def __init__(self, time_quantum: int = 1):
+        self.time_quantum = time_quantum
+
+    def bind(self, kernel):
+        super().bind(kernel)
+        self.ready_queue = deque()
+
+    def on_arrival(self, job, t):
+        self.ready_queue.append(job)
+
+    def select(self, t):
+        return self.ready_queue.popleft() if self.ready_queue else None
+
+    def next_policy_event(self, job, t):
+        return t + self.time_quantum
+
+    # Put back at end (Round Robin)
+    on_preempt = on_arrival
+
+def RR(jobs: List, time_quantum: int = 1, batched: bool = True, return_completion_times: bool = False) -> Tuple[float, float,float]:
     """
     Optimized online Round Robin:
     - Event-driven time advance: run slices of size min(quantum, remaining, time_to_next_arrival).
     - O(1) amortized admission using deque for incoming jobs.
-    - Returns (average_flow_time, l2_norm).
+    - batched=True: between arrivals the ready queue only rotates, so whole rotations that
+      neither complete a job nor cross the next arrival (R = min((m - 1) // quantum,
+      gap // (k * quantum)) for k queued jobs with minimum remaining m) are applied in one
+      step. Flow times are identical to the per-slice loop; runtime follows events, not work.
+    - Returns (average_flow_time, l2_norm, max_flow), plus the int64 completion times in
+      original job order when return_completion_times is set.
     """
     if not jobs:
         return 0.0, 0.0,0.0
 
     # Normalize input into list of (arrival, size) and assign original indices
-    if isinstance(jobs[0], dict):
+    if isinstance(jobs, JobSet):
+        base = jobs.as_int().pairs()
+    elif isinstance(jobs[0], dict):
         base = [(int(j["arrival_time"]), int(j["job_size"])) for j in jobs]
     else:
         base = [(int(j[0]), int(j[1])) for j in jobs]
@@ -45,10 +82,26 @@ def RR(jobs: List, time_quantum: int = 1) -> Tuple[float, float,float]:
     l2_sum = 0.0
     flow_list = []
     max_flow= 0.0
+    slices_until_batch = 0  # try batching about once per rotation, so the O(k) scan stays amortized O(1)
     while completed < n:
         # Use optimized selector
         orig_idx, execution_time, has_job = RR_Selector(jobs_info, current_time, ready_queue, time_quantum)
 
+        if has_job and batched:
+            slices_until_batch -= 1
+            k = len(ready_queue)
+            if slices_until_batch <= 0:
+                slices_until_batch = k
+                rotations = (min(rem for _, rem in ready_queue) - 1) // time_quantum
+                if jobs_info:
+                    rotations = min(rotations, (jobs_info[0][1] - current_time) // (k * time_quantum))
+                if rotations > 0:
+                    # Full rotations leave the queue order unchanged
+                    work = rotations * time_quantum
+                    ready_queue = deque((idx, rem - work) for idx, rem in ready_queue)
+                    current_time += work * k
+                    continue
+
         if has_job:
             # Execute the job at the front for 'execution_time'
             orig0, rem0 = ready_queue[0]
@@ -82,6 +135,8 @@ def RR(jobs: List, time_quantum: int = 1) -> Tuple[float, float,float]:
     avg_flow = total_flow_sum / n
     l2 = (l2_sum) ** 0.5
     max_flow = max(flow_list)
+    if return_completion_times:
+        return avg_flow, l2, max_flow, completion_array(completion_times)
     return avg_flow, l2, max_flow
 
 def main():
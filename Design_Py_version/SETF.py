@@ -1,6 +1,9 @@
 from math import sqrt
 from typing import List, Tuple, Union, Dict
-from SETF_Selector import SETFSelector
+from SETF_Selector import SETFLevelSelector
+from Sim_Kernel import Policy
+from Job_Set import JobSet
+from Flow_Metrics import completion_array
 import os
 import csv
 import re
@@ -14,19 +17,46 @@ import logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
-def Setf(jobs: Union[List[Tuple[float, float]], List[Dict]]) -> Tuple[float, float,float]:
+class SETFPolicy(Policy):
+    """SETF on the shared Sim_Kernel: SETFLevelSelector on (elapsed_time, job)."""
+
+    def __init__(self, queue_type: str = 'heap'):
+        self.queue_type = queue_type
+
+    def bind(self, kernel):
+        super().bind(kernel)
+        self.selector = SETFLevelSelector(self.queue_type)
+
+    def on_arrival(self, job, t):
+        self.selector.add_job(job, self.kernel.arrival[job], self.kernel.size[job])
+
+    def select(self, t):
+        picked = self.selector.get_next_job()
+        return None if picked is None else picked[1]
+
+    def on_preempt(self, job, t):
+        self.selector.update_job_progress(job, self.kernel.run_time)
+        self.selector.requeue_job(job, self.kernel.arrival[job], self.kernel.size[job])
+
+def Setf(jobs: Union[List[Tuple[float, float]], List[Dict]], queue_type: str = 'heap',
+         return_completion_times: bool = False) -> Tuple[float, float,float]:
     """
     Shortest Elapsed Time First (SETF) scheduling algorithm
     
     Args:
         jobs: List of jobs, either as tuples (arrival_time, job_size) 
               or as dictionaries {'arrival_time': float, 'job_size': float}
+        queue_type: Priority_Queue backend of the level queue, 'heap' or 'bucket'
+              (the latter for integer job sizes)
     
     Returns:
-        Tuple of (average_flow_time, l2_norm_flow_time, maximum_flow_time)
+        Tuple of (average_flow_time, l2_norm_flow_time, maximum_flow_time), plus the
+        completion times in original job order when return_completion_times is set
     """
     # Convert dictionary format to tuple format if needed
-    if jobs and isinstance(jobs[0], dict):
+    if isinstance(jobs, JobSet):
+        jobs = jobs.pairs()
+    elif jobs and isinstance(jobs[0], dict):
         jobs = [(job['arrival_time'], job['job_size']) for job in jobs]
     
     current_time = 0
@@ -34,35 +64,35 @@ def Setf(jobs: Union[List[Tuple[float, float]], List[Dict]]) -> Tuple[float, flo
     squared_flow_time = 0
     completed_jobs = 0
     
-    # Initialize job selector
-    selector = SETFSelector()
+    # Initialize job selector (jobs grouped by attained service)
+    selector = SETFLevelSelector(queue_type)
     
-    # Sort jobs by arrival time
-    sorted_jobs = sorted(jobs, key=lambda x: x[0])
+    # Sort jobs by arrival time (order maps job_id -> original index)
+    order = sorted(range(len(jobs)), key=lambda i: jobs[i][0])
+    sorted_jobs = [jobs[i] for i in order]
     n_jobs = len(sorted_jobs)
+    completion_times = [0] * n_jobs
     job_pointer = 0
     flow_list =[]
     max_flow =0.0
     while job_pointer < n_jobs or selector.has_active_jobs():
-        # 1. Determine next event time
-        next_arrival = sorted_jobs[job_pointer][0] if job_pointer < n_jobs else float('inf')
+        # 1. Add all arrivals up to now, so no zero-length slice is ever run
+        while job_pointer < n_jobs and sorted_jobs[job_pointer][0] <= current_time:
+            selector.add_job(job_pointer, *sorted_jobs[job_pointer])
+            job_pointer += 1
         
         # If no active jobs, jump to next arrival
         if not selector.has_active_jobs():
-            current_time = next_arrival
-            if job_pointer < n_jobs:
-                selector.add_job(job_pointer, *sorted_jobs[job_pointer])
-                job_pointer += 1
+            current_time = sorted_jobs[job_pointer][0]
             continue
         
         # 2. Get job with shortest elapsed time
-        next_job = selector.get_next_job()
-        elapsed, job_id, arrival_time, size = next_job
-        remaining = size - selector.job_elapsed[job_id]
+        elapsed, job_id, arrival_time, size = selector.get_next_job()
+        remaining = size - elapsed
         
-        # 3. Determine how long to run current job
+        # 3. Determine how long to run current job: up to the next arrival or its completion
         if job_pointer < n_jobs:
-            run_time = min(remaining, next_arrival - current_time)
+            run_time = min(remaining, sorted_jobs[job_pointer][0] - current_time)
         else:
             run_time = remaining
             
@@ -73,17 +103,13 @@ def Setf(jobs: Union[List[Tuple[float, float]], List[Dict]]) -> Tuple[float, flo
         # 5. Check if job completed
         if selector.is_job_completed(job_id, size):
             flow_time = current_time - arrival_time
+            completion_times[order[job_id]] = current_time
             flow_list.append(flow_time)
             total_flow_time += flow_time
             squared_flow_time += flow_time * flow_time
             completed_jobs += 1
         else:
             selector.requeue_job(job_id, arrival_time, size)
-            
-        # 6. Add any new arrivals
-        while job_pointer < n_jobs and sorted_jobs[job_pointer][0] <= current_time:
-            selector.add_job(job_pointer, *sorted_jobs[job_pointer])
-            job_pointer += 1
     
     if completed_jobs == 0:
         return 0.0, 0.0,0.0
@@ -91,6 +117,8 @@ def Setf(jobs: Union[List[Tuple[float, float]], List[Dict]]) -> Tuple[float, flo
     average_flow_time = total_flow_time / completed_jobs
     l2_norm_flow_time = sqrt(squared_flow_time)
     max_flow = max(flow_list)
+    if return_completion_times:
+        return average_flow_time, l2_norm_flow_time, max_flow, completion_array(completion_times)
     return average_flow_time, l2_norm_flow_time,max_flow
 
 def main():
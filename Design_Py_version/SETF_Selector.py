@@ -1,4 +1,6 @@
 import heapq
+from collections import deque
+from Priority_Queue import make_priority_queue
 from typing import List, Tuple, Dict
 
 class SETFSelector:
@@ -76,4 +78,87 @@ class SETFSelector:
         Returns:
             bool: True if there are active jobs, False otherwise
         """
-        return len(self.active_jobs) > 0
\ No newline at end of file
+        return len(self.active_jobs) > 0
+
+class SETFLevelSelector:
+    """
+    SETF job selector that groups active jobs by attained service (elapsed time).
+    - Jobs that have not run yet form level 0: a FIFO in job_id order (ids follow arrival
+      order), so admitting a job is O(1) and never touches a heap.
+    - Preempted jobs are bucketed by elapsed level; a queue of distinct levels orders the
+      buckets and a small heap per level orders the job ids inside it.
+    - queue_type picks the Priority_Queue backend of the level queue: 'heap' or 'bucket'
+      (integer job sizes only).
+    Selection order is the same as SETFSelector: (elapsed_time, job_id).
+    """
+
+    def __init__(self, queue_type: str = 'heap'):
+        self.fresh = deque()   # level 0: job_id in increasing order
+        self.levels = {}       # elapsed_time > 0 -> min-heap of job_id
+        self.level_queue = make_priority_queue(queue_type)  # (level,) for each key of self.levels
+        self.jobs = {}         # job_id -> (arrival_time, job_size) of active jobs
+        self.job_elapsed = {}  # tracks elapsed time for each job_id
+
+    def add_job(self, job_id: int, arrival_time: float, job_size: float) -> None:
+        """
+        Add a new job to level 0. Job ids must be added in increasing order.
+        """
+        self.fresh.append(job_id)
+        self.jobs[job_id] = (arrival_time, job_size)
+        self.job_elapsed[job_id] = 0
+
+    def get_next_job(self) -> Tuple[float, int, float, float]:
+        """
+        Remove and return the job with the shortest elapsed time (ties by job_id).
+
+        Returns:
+            Tuple of (elapsed_time, job_id, arrival_time, job_size)
+        """
+        if self.fresh:
+            job_id = self.fresh.popleft()
+        elif len(self.level_queue):
+            level = self.level_queue.peek()[0]
+            group = self.levels[level]
+            job_id = heapq.heappop(group)
+            if not group:
+                del self.levels[level]
+                self.level_queue.pop()
+        else:
+            return None
+        arrival_time, job_size = self.jobs.pop(job_id)
+        return self.job_elapsed[job_id], job_id, arrival_time, job_size
+
+    def update_job_progress(self, job_id: int, run_time: float) -> None:
+        """
+        Update the progress of a job after it has run for some time.
+        """
+        self.job_elapsed[job_id] += run_time
+
+    def requeue_job(self, job_id: int, arrival_time: float, job_size: float) -> None:
+        """
+        Put a job that is not completed back into the group of its elapsed level.
+        """
+        self.jobs[job_id] = (arrival_time, job_size)
+        level = self.job_elapsed[job_id]
+        if level == 0:
+            # It was the head of level 0 and did not run
+            self.fresh.appendleft(job_id)
+            return
+        group = self.levels.get(level)
+        if group is None:
+            self.levels[level] = [job_id]
+            self.level_queue.push((level,))
+        else:
+            heapq.heappush(group, job_id)
+
+    def is_job_completed(self, job_id: int, job_size: float) -> bool:
+        """
+        Check if a job has completed its required processing time.
+        """
+        return self.job_elapsed[job_id] >= job_size
+
+    def has_active_jobs(self) -> bool:
+        """
+        Check if there are any active jobs in the queue.
+        """
+        return len(self.jobs) > 0
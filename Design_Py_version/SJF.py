@@ -1,4 +1,5 @@
 import pandas as pd
+import numpy as np
 import os
 import csv
 import re
@@ -7,13 +8,41 @@ import copy
 import process_avg_folders as paf
 import process_random_folders as prf
 import process_softrandom_folders as psf
+from FCFS_Kernel import flow_time_sums
+from Priority_Queue import make_priority_queue
+from Sim_Kernel import Policy
+from Job_Set import JobSet
+from Flow_Metrics import completion_array
 import logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
-def Sjf(jobs):
+class SJFPolicy(Policy):
+    """Non-preemptive SJF on the shared Sim_Kernel: ready queue on (job_size, job)."""
+    preemptive = False
+
+    def __init__(self, queue_type='heap'):
+        self.queue_type = queue_type
+
+    def bind(self, kernel):
+        super().bind(kernel)
+        self.jobs_queue = make_priority_queue(self.queue_type)
+
+    def on_arrival(self, job, t):
+        self.jobs_queue.push((self.kernel.size[job], job))
+
+    def select(self, t):
+        picked = self.jobs_queue.pop()
+        return None if picked is None else picked[1]
+
+def Sjf(jobs, queue_type='heap', return_completion_times=False):
     """
     Shortest Job First (SJF) scheduling algorithm - non-preemptive
+    - Arrivals are consumed through a pointer into the arrival-sorted jobs.
+    - Ready jobs sit in a min-heap on (job_size, arrival rank), the same tie-breaking
+      as the stable size sort over the arrival-ordered queue.
+    - job_logs are preallocated arrays indexed by arrival rank.
+    - queue_type picks the Priority_Queue backend: 'heap' (heapq) or 'bucket' (integer sizes).
     
     Args:
         jobs: List of jobs (either as lists or dictionaries)
@@ -21,53 +50,68 @@ def Sjf(jobs):
              If dicts: [{'arrival_time': int, 'job_size': int}, ...]
     
     Returns:
-        Tuple of (average_flow_time, l2_norm_flow_time,maximum_flow_time')
+        Tuple of (average_flow_time, l2_norm_flow_time,maximum_flow_time'), plus the int64
+        completion times in original job order when return_completion_times is set
     """
     # Convert dictionary format to list format if needed
-    if jobs and isinstance(jobs[0], dict):
+    if isinstance(jobs, JobSet):
+        jobs = jobs.pairs()
+    elif jobs and isinstance(jobs[0], dict):
         jobs = [[job['arrival_time'], job['job_size']] for job in jobs]
     
-    # Sort jobs by arrival time
-    jobs.sort(key=lambda x: x[0])
+    # Sort jobs by arrival time (order maps arrival rank -> original index)
+    order = sorted(range(len(jobs)), key=lambda i: jobs[i][0])
+    jobs = [jobs[i] for i in order]
+    arrival_times = [job[0] for job in jobs]
+    job_sizes = [job[1] for job in jobs]
+    n = len(jobs)
+    if n == 0:
+        if return_completion_times:
+            return 0.0, 0.0, 0.0, completion_array(np.zeros(0, dtype=np.int64))
+        return 0.0, 0.0, 0.0
+    dtype = np.result_type(np.asarray(arrival_times), np.asarray(job_sizes))
+    job_logs = {
+        "arrival_time": np.asarray(arrival_times, dtype=dtype),
+        "first_executed_time": np.zeros(n, dtype=dtype),
+        "completion_time": np.zeros(n, dtype=dtype),
+        "ifdone": np.zeros(n, dtype=bool),
+    }
+    first_executed_time = job_logs["first_executed_time"]
+    completion_time = job_logs["completion_time"]
+
     time = 0
-    waiting_time = []
-    job_logs = []
-    jobs_queue = []
-    max_flow =0.0
-    while jobs or jobs_queue:
+    next_arrival = 0
+    jobs_queue = make_priority_queue(queue_type)  # (job_size, arrival rank)
+    while next_arrival < n or jobs_queue:
         # Add jobs to the queue if they have arrived
-        while jobs and jobs[0][0] <= time:
-            # Add job to queue: [arrival_time, job_size]
-            jobs_queue.append(jobs.pop(0))
-        
-        # Sort jobs in queue by job size (Shortest Job First)
-        jobs_queue.sort(key=lambda x: x[1])
+        while next_arrival < n and arrival_times[next_arrival] <= time:
+            jobs_queue.push((job_sizes[next_arrival], next_arrival))
+            next_arrival += 1
         
         if jobs_queue:
-            job = jobs_queue.pop(0)
-            start_time = time  # Record actual start time when job begins execution
-            time += job[1]  # Execute the job for its full duration
-            flow_time = time - job[0]  # Completion time - arrival time
-            waiting_time.append(flow_time)
-            job_logs.append({
-                "arrival_time": job[0], 
-                "first_executed_time": start_time, 
-                "completion_time": time,
-                "ifdone": True
-            })
+            job_size, k = jobs_queue.pop()
+            first_executed_time[k] = time  # Record actual start time when job begins execution
+            time += job_size  # Execute the job for its full duration
+            completion_time[k] = time
         else:
             # If no jobs are ready to be executed, advance to next arrival
-            if jobs:
-                time = jobs[0][0]
+            time = arrival_times[next_arrival]
+    job_logs["ifdone"][:] = True
+    
+    # Flow time = completion time - arrival time
+    waiting_time = completion_time - job_logs["arrival_time"]
+    total_flow_time, total_squared_flow, max_flow = flow_time_sums(waiting_time)
     
     # Calculate average flow time
-    total_flow_time = sum(waiting_time)
-    avg_flow_time = total_flow_time / len(waiting_time) if waiting_time else 0
-    max_flow = max(waiting_time)
+    avg_flow_time = total_flow_time / n
     
     # Calculate L2 norm of flow time
-    l2_norm_flow_time = (sum(f ** 2 for f in waiting_time)) ** 0.5
+    l2_norm_flow_time = total_squared_flow ** 0.5
     
+    if return_completion_times:
+        completion_times = np.empty_like(completion_time)
+        completion_times[order] = completion_time
+        return avg_flow_time, l2_norm_flow_time, max_flow, completion_array(completion_times)
     return avg_flow_time, l2_norm_flow_time, max_flow
 
 def main():
@@ -1,6 +1,8 @@
 import csv
 import math
-from SRPT_Selector import select_next_job_optimized as srpt_select_next_job
+from SRPT_Selector import SRPTSelector
+from Sim_Kernel import Policy, simulate
+from Job_Set import JobSet
 import os
 import csv
 import re
@@ -12,102 +14,43 @@ import process_softrandom_folders as psf
 import logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
-def SRPT(jobs):
-    """
-    Optimized preemptive SRPT:
-    - Event-driven time advance: run until next arrival or completion (min step).
-    - Selection uses srpt_select_next_job (heap-backed) on dict views of waiting queue.
-    - Returns (avg_flow_time, l2_norm_flow_time, maximum flow time).
-    """
-    # Normalize & index
-    jobs = [{"arrival_time": int(j["arrival_time"]), "job_size": int(j["job_size"]), "job_index": i} 
-            for i, j in enumerate(jobs)]
-    jobs.sort(key=lambda x: x["arrival_time"])
-
-    total = len(jobs)
-    if total == 0:
-        return 0.0, 0.0,0.0
 
-    t = 0
-    i = 0
-    waiting = []
-    current = None
-    completed = []
+class SRPTPolicy(Policy):
+    """Preemptive SRPT on the shared Sim_Kernel: SRPTSelector on (remaining_time, arrival_time, job)."""
 
-    while len(completed) < total:
-        # Admit arrivals at time t
-        while i < total and jobs[i]["arrival_time"] <= t:
-            waiting.append({
-                "arrival_time": jobs[i]["arrival_time"],
-                "job_index": jobs[i]["job_index"],
-                "remaining_time": jobs[i]["job_size"],
-                "start_time": None,
-                "completion_time": None,
-            })
-            i += 1
+    def __init__(self, queue_type='heap'):
+        self.queue_type = queue_type
 
-        # If there's a current job, consider preemption by pushing it back to waiting
-        if current is not None:
-            waiting.append(current)
-            current = None
+    def bind(self, kernel):
+        super().bind(kernel)
+        self.selector = SRPTSelector(self.queue_type)
 
-        # Pick SRPT job if available
-        if waiting:
-            picked = srpt_select_next_job([
-                {"remaining_time": w["remaining_time"], "arrival_time": w["arrival_time"], "job_index": w["job_index"]}
-                for w in waiting
-            ])
-            # Find the selected in waiting
-            sel_idx = min(
-                range(len(waiting)),
-                key=lambda k: (waiting[k]["remaining_time"], waiting[k]["arrival_time"], waiting[k]["job_index"])
-            )
-            for k, w in enumerate(waiting):
-                if (w["remaining_time"], w["arrival_time"], w["job_index"]) == \
-                   (picked["remaining_time"], picked["arrival_time"], picked["job_index"]):
-                    sel_idx = k
-                    break
-            current = waiting.pop(sel_idx)
-            if current["start_time"] is None:
-                current["start_time"] = t
+    def on_arrival(self, job, t):
+        self.selector.add_job(job, self.kernel.arrival[job], self.kernel.remaining[job])
 
-            # Determine next arrival time
-            next_arrival_t = jobs[i]["arrival_time"] if i < total else None
+    def select(self, t):
+        picked = self.selector.pop_next_job()
+        return None if picked is None else picked[2]
 
-            if next_arrival_t is None:
-                # No more arrivals: run to completion
-                t += current["remaining_time"]
-                current["completion_time"] = t
-                current["remaining_time"] = 0
-                completed.append(current)
-                current = None
-                continue
-            else:
-                # Run until either next arrival or completion
-                delta = min(current["remaining_time"], max(1, next_arrival_t - t))
-                t += delta
-                current["remaining_time"] -= delta
-                if current["remaining_time"] == 0:
-                    current["completion_time"] = t
-                    completed.append(current)
-                    current = None
-                # Loop; new arrivals will be admitted at the updated t in the next iteration
-                continue
+    # A preempted job goes back with its new remaining time
+    on_preempt = on_arrival
 
-        # If nothing waiting, jump to next arrival
-        if i < total:
-            t = max(t, jobs[i]["arrival_time"])
-        else:
-            break
-
-    flows = [c["completion_time"] - c["arrival_time"] for c in completed]
-    n = len(flows)
-    if n == 0:
-        return 0.0, 0.0,0.0
-    avg_flow = sum(flows) / n
-    max_flow = max(flows)
-    l2 = (sum(f * f for f in flows)) ** 0.5
-    return avg_flow, l2, max_flow
+def SRPT(jobs, queue_type='heap', return_completion_times=False):
+    """
+    Optimized preemptive SRPT: SRPTPolicy on the shared Sim_Kernel.
+    - Event-driven time advance: run until next arrival or completion (min step).
+    - Selection uses a persistent SRPTSelector heap keyed by (remaining_time, arrival_time,
+      job_index); preempted jobs are pushed back in O(log n) instead of rebuilding the heap.
+    - queue_type picks the Priority_Queue backend: 'heap' (heapq) or 'bucket' (integer sizes).
+    - Returns (avg_flow_time, l2_norm_flow_time, maximum flow time), plus the int64
+      completion times in original job order when return_completion_times is set.
+    """
+    # Normalize (a JobSet is simulated straight from its arrays)
+    if isinstance(jobs, JobSet):
+        jobs = jobs.as_int()
+    else:
+        jobs = [(int(j["arrival_time"]), int(j["job_size"])) for j in jobs]
+    return simulate(jobs, SRPTPolicy(queue_type), return_completion_times)
 
 def main():
     """Main function to process all data"""
@@ -2,6 +2,7 @@
 # -*- coding: utf-8 -*-
 
 import heapq
+from Priority_Queue import make_priority_queue
 
 def select_next_job(job_queue):
     """Backward-compatible O(n) SRPT selector.
@@ -34,3 +35,66 @@ def select_next_job_optimized(job_queue):
         heap.append((j["remaining_time"], j["arrival_time"], j["job_index"], j))
     heapq.heapify(heap)
     return heapq.heappop(heap)[-1]
+
+
+class SRPTSelector:
+    """
+    Persistent SRPT priority queue shared across scheduling events.
+    Keeps one min-queue of (remaining_time, arrival_time, job_index) for the whole
+    simulation instead of rebuilding it on every event. Preempted jobs are pushed
+    back with their new remaining time in O(log n); superseded or removed entries
+    are skipped lazily when they reach the top of the queue.
+    queue_type selects the Priority_Queue backend ('heap' or 'bucket' for integer sizes).
+    """
+
+    def __init__(self, queue_type='heap'):
+        self.queue = make_priority_queue(queue_type)  # (remaining_time, arrival_time, job_index)
+        self.remaining = {}   # job_index -> remaining_time of its live queue entry
+
+    def add_job(self, job_index, arrival_time, remaining_time):
+        """Insert (or re-insert after preemption) a job with its current remaining time."""
+        self.remaining[job_index] = remaining_time
+        self.queue.push((remaining_time, arrival_time, job_index))
+
+    def remove_job(self, job_index):
+        """Drop a job from the queue without popping it (its queue entry becomes stale)."""
+        self.remaining.pop(job_index, None)
+
+    def _discard_stale(self):
+        queue = self.queue
+        remaining = self.remaining
+        top = queue.peek()
+        while top is not None and remaining.get(top[2]) != top[0]:
+            queue.pop()
+            top = queue.peek()
+        return top
+
+    def peek_next_job(self):
+        """Return the SRPT job as (remaining_time, arrival_time, job_index) without removing it."""
+        return self._discard_stale()
+
+    def pop_next_job(self):
+        """Remove and return the SRPT job as (remaining_time, arrival_time, job_index)."""
+        if self._discard_stale() is None:
+            return None
+        entry = self.queue.pop()
+        del self.remaining[entry[2]]
+        return entry
+
+    def has_active_jobs(self):
+        return len(self.remaining) > 0
+
+    def active_entries(self):
+        """Live (remaining_time, arrival_time, job_index) entries, unordered."""
+        remaining = self.remaining
+        return [entry for entry in self.queue if remaining.get(entry[2]) == entry[0]]
+
+    def copy(self):
+        """Independent copy (same backend), e.g. to branch a simulation state."""
+        clone = SRPTSelector.__new__(SRPTSelector)
+        clone.queue = self.queue.copy()
+        clone.remaining = dict(self.remaining)
+        return clone
+
+    def __len__(self):
+        return len(self.remaining)
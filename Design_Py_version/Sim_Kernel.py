@@ -0,0 +1,325 @@
+import math
+import numpy as np
+from FCFS_Kernel import flow_time_sums
+from Job_Set import JobSet
+
+def job_arrays(jobs):
+    """
+    (arrival_times, job_sizes) lists from any supported job format:
+    dicts {'arrival_time', 'job_size'}, [arrival_time, job_size] lists or tuples, or a JobSet.
+    """
+    if isinstance(jobs, JobSet):
+        return jobs.columns()
+    if len(jobs) and isinstance(jobs[0], dict):
+        return [job['arrival_time'] for job in jobs], [job['job_size'] for job in jobs]
+    return [job[0] for job in jobs], [job[1] for job in jobs]
+
+
+class ArrivalStream:
+    """
+    A trace parsed and sorted by arrival once (ties keep input order), shared read-only by
+    every Kernel built on it: order maps job id -> original job index, arrival and size
+    are indexed by job id.
+    """
+
+    def __init__(self, jobs):
+        arrival_times, job_sizes = job_arrays(jobs)
+        order = sorted(range(len(arrival_times)), key=arrival_times.__getitem__)
+        self.order = order
+        self.arrival = [arrival_times[i] for i in order]
+        self.size = [job_sizes[i] for i in order]
+
+    def __len__(self):
+        return len(self.order)
+
+
+class Policy:
+    """
+    Scheduling policy plug-in for Kernel.
+    Jobs are identified by their position in the arrival-sorted trace (ties keep input
+    order), so a job id also serves as the job_index tie-break of the existing selectors.
+    Job state (arrival, size, remaining) lives in the kernel's arrays; a policy only keeps
+    its ready structure. The protocol, in kernel call order:
+    - bind(kernel): called once before the first event.
+    - on_arrival(job, t): job was admitted at time t.
+    - select(t): remove and return the job to run next, or None when nothing is ready.
+    - next_policy_event(job, t): absolute time of the next internal event while job runs
+      (quantum expiry, starvation crossing, ...) or None.
+    - on_preempt(job, t): job stopped at t with work left; put it back.
+    - on_complete(job, t): job finished at t.
+    During the last two calls kernel.run_time holds the length of the slice that just ended.
+    `preemptive` tells the kernel whether the next arrival stops the running job; it is
+    read at every decision, so a policy may switch it (Dynamic's SRPT/FCFS rounds).
+    A policy with a closed form may also implement closed_form_flows(arrival, size), used
+    by compare_l2 instead of simulating it.
+    """
+    preemptive = True
+
+    def closed_form_flows(self, arrival, size):
+        """Flow times by job id without simulation, or None when there is no closed form."""
+        return None
+
+    def bind(self, kernel: 'Kernel') -> None:
+        self.kernel = kernel
+
+    def on_arrival(self, job: int, t) -> None:
+        raise NotImplementedError
+
+    def select(self, t):
+        raise NotImplementedError
+
+    def next_policy_event(self, job: int, t):
+        return None
+
+    def on_preempt(self, job: int, t) -> None:
+        raise NotImplementedError
+
+    def on_complete(self, job: int, t) -> None:
+        pass
+
+
+class Kernel:
+    """
+    Event-driven single-machine simulator shared by all policies:
+    - arrival admission through a pointer into the arrival-sorted arrays,
+    - time advances straight to the next preemption point: completion, next arrival
+      (preemptive policies) or the policy's own next event,
+    - idle periods jump to the next arrival,
+    - metrics from one completion-time array.
+    advance_until() lets several kernels over the same trace run in lockstep (simulate_many).
+    """
+
+    def __init__(self, jobs, policy: Policy):
+        # jobs may be an ArrivalStream shared with other kernels (see simulate_many)
+        stream = jobs if isinstance(jobs, ArrivalStream) else ArrivalStream(jobs)
+        self.order = stream.order  # job id -> original job index
+        self.arrival = stream.arrival
+        self.size = stream.size
+        self.remaining = list(self.size)
+        self.completion = [None] * len(stream)
+        self.n_jobs = len(stream)
+        self.n_completed = 0
+        self.next_job = 0  # next arrival pointer
+        self.t = 0
+        self.run_time = 0  # length of the last slice
+        self.policy = policy
+        policy.bind(self)
+
+    @property
+    def done(self) -> bool:
+        return self.n_completed == self.n_jobs
+
+    def admit(self) -> None:
+        """Hand every job that has arrived by the current time to the policy."""
+        arrival = self.arrival
+        t = self.t
+        while self.next_job < self.n_jobs and arrival[self.next_job] <= t:
+            self.policy.on_arrival(self.next_job, t)
+            self.next_job += 1
+
+    def step(self) -> None:
+        """One scheduling decision: admit, select, run until the next preemption point."""
+        self.admit()
+        policy = self.policy
+        t = self.t
+        job = policy.select(t)
+        if job is None:
+            if self.next_job < self.n_jobs:
+                # Idle until the next arrival
+                self.t = max(t, self.arrival[self.next_job])
+                return
+            raise RuntimeError(f"{type(policy).__name__} has no ready job but "
+                               f"{self.n_jobs - self.n_completed} jobs are unfinished")
+
+        # Run length (not end time), so a completing job's remaining time is exactly zero
+        run_time = self.remaining[job]
+        if policy.preemptive and self.next_job < self.n_jobs:
+            run_time = min(run_time, self.arrival[self.next_job] - t)
+        event = policy.next_policy_event(job, t)
+        if event is not None and event - t < run_time:
+            run_time = event - t
+
+        self.remaining[job] -= run_time
+        self.run_time = run_time
+        end = self.t = t + run_time
+        if self.remaining[job] <= 0:
+            self.completion[job] = end
+            self.n_completed += 1
+            policy.on_complete(job, end)
+        else:
+            policy.on_preempt(job, end)
+
+    def advance_until(self, t_stop) -> None:
+        """Run decisions while the clock is before t_stop (a running slice may end past it)."""
+        while self.n_completed < self.n_jobs and self.t < t_stop:
+            self.step()
+
+    def run(self) -> 'Kernel':
+        while self.n_completed < self.n_jobs:
+            self.step()
+        return self
+
+    def _by_original_order(self, values) -> np.ndarray:
+        values = np.asarray(values)
+        out = np.empty_like(values)
+        out[self.order] = values
+        return out
+
+    def completion_times(self) -> np.ndarray:
+        """Completion times indexed by original job order."""
+        return self._by_original_order(self.completion)
+
+    def flow_times(self) -> np.ndarray:
+        """Flow times (completion - arrival) indexed by original job order."""
+        return self._by_original_order(np.asarray(self.completion) - np.asarray(self.arrival))
+
+    def metrics(self):
+        """(avg_flow_time, l2_norm_flow_time, max_flow_time) of the finished run."""
+        if self.n_jobs == 0:
+            return 0.0, 0.0, 0.0
+        total_flow, sum_sq_flow, max_flow = flow_time_sums(np.asarray(self.completion) - np.asarray(self.arrival))
+        return total_flow / self.n_jobs, sum_sq_flow ** 0.5, max_flow
+
+
+def simulate(jobs, policy: Policy, return_completion_times=False):
+    """
+    Run policy over jobs on the shared kernel; returns (avg, l2, max) flow time, plus the
+    completion times in original job order when return_completion_times is set.
+    """
+    kernel = Kernel(jobs, policy).run()
+    if return_completion_times:
+        return (*kernel.metrics(), kernel.completion_times())
+    return kernel.metrics()
+
+def simulate_many(jobs, policies, return_completion_times=False, sync_every=1024):
+    """
+    Fused multi-policy run: every policy in the {name: Policy} dict gets its own Kernel
+    over one shared ArrivalStream, so the trace is parsed and sorted once for all of them.
+    The kernels advance in lockstep by event time, all catching up to the arrival of
+    every sync_every-th job before any moves past it, so they walk the same window of
+    the arrival arrays. Kernels are independent, so results equal separate simulate() calls.
+    Returns {name: (avg, l2, max)} (plus completion times, as simulate()).
+    """
+    stream = ArrivalStream(jobs)
+    kernels = {name: Kernel(stream, policy) for name, policy in policies.items()}
+    for k in range(sync_every, len(stream), sync_every):
+        t_sync = stream.arrival[k]
+        for kernel in kernels.values():
+            kernel.advance_until(t_sync)
+    results = {}
+    for name, kernel in kernels.items():
+        kernel.run()
+        if return_completion_times:
+            results[name] = (*kernel.metrics(), kernel.completion_times())
+        else:
+            results[name] = kernel.metrics()
+    return results
+
+
+class _L2Bound(Policy):
+    """
+    Transparent wrapper that keeps a running lower bound on a policy's final sum of squared
+    flow times. At time t an unfinished job cannot complete before t + remaining, so its
+    flow is at least t - arrival + remaining (its size when it has not arrived). With
+    c_j = remaining_j - arrival_j over the admitted unfinished jobs the bound is
+        done_sq + m t^2 + 2 t sum(c) + sum(c^2) + sum(size^2 of jobs not yet arrived),
+    kept in O(1) per kernel event (exact for integer traces).
+    """
+
+    def __init__(self, policy: Policy):
+        self.policy = policy
+
+    def bind(self, kernel):
+        super().bind(kernel)
+        self.policy.bind(kernel)
+        self.done_sq = 0
+        self.m = 0
+        self.sum_c = 0
+        self.sum_c2 = 0
+        self.unarrived_sq = sum(s * s for s in kernel.size)
+
+    @property
+    def preemptive(self):
+        return self.policy.preemptive
+
+    def lower_bound(self):
+        t = self.kernel.t
+        return self.done_sq + self.m * t * t + 2 * t * self.sum_c + self.sum_c2 + self.unarrived_sq
+
+    def on_arrival(self, job, t):
+        kernel = self.kernel
+        size = kernel.size[job]
+        self.unarrived_sq -= size * size
+        c = kernel.remaining[job] - kernel.arrival[job]
+        self.m += 1
+        self.sum_c += c
+        self.sum_c2 += c * c
+        self.policy.on_arrival(job, t)
+
+    def select(self, t):
+        return self.policy.select(t)
+
+    def next_policy_event(self, job, t):
+        return self.policy.next_policy_event(job, t)
+
+    def _ran(self, job):
+        # The job's c dropped by the slice length; return its old value
+        kernel = self.kernel
+        c_new = kernel.remaining[job] - kernel.arrival[job]
+        c_old = c_new + kernel.run_time
+        self.sum_c -= kernel.run_time
+        self.sum_c2 += c_new * c_new - c_old * c_old
+        return c_new
+
+    def on_preempt(self, job, t):
+        self._ran(job)
+        self.policy.on_preempt(job, t)
+
+    def on_complete(self, job, t):
+        c = self._ran(job)
+        self.m -= 1
+        self.sum_c -= c
+        self.sum_c2 -= c * c
+        flow = t - self.kernel.arrival[job]
+        self.done_sq += flow * flow
+        self.policy.on_complete(job, t)
+
+def compare_l2(window, policy_a: Policy, policy_b: Policy, check_every=32) -> bool:
+    """
+    True when policy_a's L2 norm of flow times on window is <= policy_b's (ties go to a),
+    without necessarily finishing both runs:
+    - a policy with closed_form_flows (FCFS) is evaluated exactly up front;
+    - simulated policies advance check_every decisions at a time, keeping the _L2Bound
+      lower bound on their sum of squared flows;
+    - as soon as one side's lower bound exceeds the other side's exact total the winner
+      is known and the remaining simulation is skipped.
+    Decisions compare math.sqrt of the exact totals when both are known, as the engines'
+    L2 norms do.
+    """
+    stream = ArrivalStream(window)
+    sides = []
+    for policy in (policy_a, policy_b):
+        flows = policy.closed_form_flows(np.asarray(stream.arrival), np.asarray(stream.size))
+        if flows is not None:
+            sides.append([None, flow_time_sums(flows)[1]])
+        else:
+            bound = _L2Bound(policy)
+            sides.append([Kernel(stream, bound), None])
+
+    while True:
+        for side in sides:
+            kernel = side[0]
+            if side[1] is None:
+                for _ in range(check_every):
+                    if kernel.done:
+                        break
+                    kernel.step()
+                if kernel.done:
+                    side[1] = kernel.policy.done_sq
+        (kernel_a, exact_a), (kernel_b, exact_b) = sides
+        if exact_a is not None and exact_b is not None:
+            return math.sqrt(exact_a) <= math.sqrt(exact_b)
+        if exact_b is not None and kernel_a.policy.lower_bound() > exact_b:
+            return False
+        if exact_a is not None and kernel_b.policy.lower_bound() > exact_a:
+            return True
@@ -0,0 +1,190 @@
+import os
+import sys
+import json
+import random
+import itertools
+import logging
+import numpy as np
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
+from Job_Set import JobSet
+from Sim_Kernel import simulate_many
+from Trace_Cache import TraceCache, seed_fields
+import RR, SRPT, SETF, FCFS, SJF, BAL, RMLF, Dynamic
+
+# Trace generators live in the repository root
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import Job_init
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+# Kernel policies a sweep can run; all of them advance together over one in-memory trace
+SWEEP_POLICIES = {
+    'RR': RR.RRPolicy,
+    'SRPT': SRPT.SRPTPolicy,
+    'SETF': SETF.SETFPolicy,
+    'FCFS': FCFS.FCFSPolicy,
+    'SJF': SJF.SJFPolicy,
+    'BAL': BAL.BALPolicy,
+    'RMLF': RMLF.RMLFPolicy,
+}
+
+def param_label(param):
+    """Short name of a job size parameter, e.g. BP_L7.918_H512 or Normal_30_6."""
+    if param["type"] == "BP":
+        return f"BP_L{param['L']}_H{int(param['H'])}"
+    return f"Normal_{param['mean']}_{param['std']}"
+
+def expand_sweep(spec):
+    """
+    Sweep spec -> list of points (one trace each). spec keys:
+    - params: list of job size parameters; an entry is one parameter dict
+      ({"type": "BP", "L", "H"} or {"type": "Normal", "mean", "std"}) or a list of them
+      to switch between every coherence_time
+    - inter_arrival: list of mean inter-arrival times; an entry may also be a list of means
+      drawn at every switch (as inter_arrival_time in Job_init)
+    - coherence_time: list of coherence times (default [1])
+    - transition: 'random' (uniform switch, default) or 'soft' (Job_init.soft_transition)
+    - replications (default 1), num_jobs (default 10000), seed (default None)
+    Points are the product params x inter_arrival x coherence_time x replications, in that order.
+    """
+    coherence_times = spec.get("coherence_time", [1])
+    replications = range(1, spec.get("replications", 1) + 1)
+    points = []
+    for params, inter_arrival, ct, rep in itertools.product(spec["params"], spec["inter_arrival"],
+                                                            coherence_times, replications):
+        params = params if isinstance(params, list) else [params]
+        choices = inter_arrival if isinstance(inter_arrival, list) else [inter_arrival]
+        points.append({
+            "params": params,
+            "inter_arrival_choices": choices,
+            "coherence_time": ct,
+            "replication": rep,
+            "transition": spec.get("transition", "random"),
+            "num_jobs": spec.get("num_jobs", 10000),
+        })
+    return points
+
+def generate_trace(point, rng):
+    """In-memory JobSet of one sweep point (one chunk of Job_init's streaming engine, no dicts, no CSV)."""
+    transition = Job_init.soft_transition if point["transition"] == "soft" else None
+    chunks = Job_init.iter_regime_switching_jobs(
+        point["num_jobs"], point["params"], point["coherence_time"],
+        inter_arrival_choices=point["inter_arrival_choices"], transition=transition,
+        chunk_size=max(point["num_jobs"], 1), rng=rng)
+    arrival_times, job_sizes = next(chunks, (np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)))
+    return JobSet(arrival_times, job_sizes)
+
+def sweep_policies(jobs, algorithms, nJobsPerRound=100, modes=(1, 2, 3, 4, 5, 6)):
+    """
+    {name: Policy} for the chosen algorithms. 'DYNAMIC' expands to one
+    DYNAMIC_mode{m}_njobs{n} policy per mode, planned in one plan_dynamic_decisions pass.
+    """
+    policies = {}
+    for name in algorithms:
+        if name == 'DYNAMIC':
+            plans = Dynamic.plan_dynamic_decisions(jobs, nJobsPerRound, modes)
+            for mode in modes:
+                policies[f"DYNAMIC_mode{mode}_njobs{nJobsPerRound}"] = Dynamic.DynamicPolicy(plans[mode], nJobsPerRound)
+        elif name in SWEEP_POLICIES:
+            policies[name] = SWEEP_POLICIES[name]()
+        else:
+            raise ValueError(f"Unknown algorithm {name!r}, expected 'DYNAMIC' or one of {sorted(SWEEP_POLICIES)}")
+    return policies
+
+def trace_fields(point, seed_sequence):
+    """TraceCache key fields of a sweep point's trace."""
+    return {
+        "generator": "iter_regime_switching_jobs",
+        "params": point["params"],
+        "inter_arrival_choices": point["inter_arrival_choices"],
+        "transition": point["transition"],
+        "coherence_time": point["coherence_time"],
+        "num_jobs": point["num_jobs"],
+        "seed": seed_fields(seed_sequence),
+    }
+
+def run_point(point, seed_sequence, algorithms, nJobsPerRound=100, modes=(1, 2, 3, 4, 5, 6),
+              cache_dir=None, cache_max_bytes=1 << 30):
+    """
+    Worker: generate one trace (or load it from the TraceCache at cache_dir) and run every
+    chosen algorithm on it; returns the metrics row.
+    """
+    if cache_dir is None:
+        jobs = generate_trace(point, np.random.default_rng(seed_sequence))
+    else:
+        jobs = TraceCache(cache_dir, cache_max_bytes).get_or_generate(
+            trace_fields(point, seed_sequence), lambda: generate_trace(point, np.random.default_rng(seed_sequence)))
+    # RMLF draws its betas from the random module; seed it per point as well
+    random.seed(int(seed_sequence.generate_state(1, np.uint64)[0]))
+    metrics = simulate_many(jobs, sweep_policies(jobs, algorithms, nJobsPerRound, modes))
+
+    row = {
+        "params": "+".join(param_label(p) for p in point["params"]),
+        "inter_arrival": "+".join(str(a) for a in point["inter_arrival_choices"]),
+        "coherence_time": point["coherence_time"],
+        "replication": point["replication"],
+        "num_jobs": len(jobs),
+    }
+    for name, (avg_flow, l2_norm_flow, max_flow) in metrics.items():
+        row[f"{name}_avg_flow_time"] = avg_flow
+        row[f"{name}_L2_norm_flow_time"] = l2_norm_flow
+        row[f"{name}_maximum_flow_time"] = max_flow
+    return row
+
+def run_sweep(spec, algorithms, output_file=None, n_workers=None, nJobsPerRound=100, modes=(1, 2, 3, 4, 5, 6),
+              cache_dir=None, cache_max_bytes=1 << 30):
+    """
+    Fused generate-and-simulate sweep: every point's trace is generated in memory and fed
+    straight to the chosen algorithms (Sim_Kernel.simulate_many over one JobSet), so no
+    trace CSV is written or parsed; only the metrics rows are kept.
+    - Point i draws from SeedSequence(spec['seed']).spawn(len(points))[i], so results do not
+      depend on n_workers.
+    - Points run on a process pool (n_workers, default CPU count; 1 runs in this process).
+    - With cache_dir, traces go through a TraceCache (LRU, at most cache_max_bytes on disk),
+      so a rerun with the same spec and seed, or any spec sharing points with it, reuses them.
+    Returns a DataFrame with one row per point (written to output_file when given).
+    """
+    points = expand_sweep(spec)
+    root = np.random.SeedSequence(spec.get("seed"))
+    if spec.get("seed") is None:
+        logger.info(f"Sweep seed entropy: {root.entropy}")
+    seeds = root.spawn(len(points))
+
+    n_workers = n_workers or os.cpu_count() or 1
+    logger.info(f"Running {len(points)} sweep points x {len(algorithms)} algorithms on {n_workers} worker(s)")
+    if n_workers == 1 or len(points) <= 1:
+        rows = [run_point(point, s, algorithms, nJobsPerRound, modes, cache_dir, cache_max_bytes)
+                for point, s in zip(points, seeds)]
+    else:
+        n = len(points)
+        with ProcessPoolExecutor(max_workers=n_workers) as executor:
+            rows = list(executor.map(run_point, points, seeds, [algorithms] * n, [nJobsPerRound] * n, [modes] * n,
+                                     [cache_dir] * n, [cache_max_bytes] * n,
+                                     chunksize=max(1, n // (n_workers * 8))))
+
+    df = pd.DataFrame(rows)
+    if output_file:
+        os.makedirs(os.path.dirname(output_file) or '.', exist_ok=True)
+        df.to_csv(output_file, index=False)
+        logger.info(f"Saved {len(df)} sweep rows to {output_file}")
+    return df
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Generate-and-simulate parameter sweep (no trace CSVs)')
+    parser.add_argument('spec', help='JSON sweep spec (see expand_sweep)')
+    parser.add_argument('--algorithms', nargs='+', default=['SRPT', 'FCFS', 'RR', 'SETF', 'BAL', 'SJF'],
+                        help=f"Algorithms to run: DYNAMIC or any of {sorted(SWEEP_POLICIES)}")
+    parser.add_argument('--output', default='sweep_results.csv', help='Metrics CSV')
+    parser.add_argument('--workers', type=int, default=None, help='Worker processes (default: CPU count)')
+    parser.add_argument('--cache-dir', default=None, help='Trace cache directory (default: no cache)')
+    parser.add_argument('--cache-max-mb', type=float, default=1024, help='Trace cache size cap in MB')
+    args = parser.parse_args()
+
+    with open(args.spec) as f:
+        sweep_spec = json.load(f)
+    run_sweep(sweep_spec, args.algorithms, output_file=args.output, n_workers=args.workers,
+              cache_dir=args.cache_dir, cache_max_bytes=int(args.cache_max_mb * 2**20))
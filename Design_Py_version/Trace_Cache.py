@@ -0,0 +1,165 @@
+import os
+import sys
+import json
+import hashlib
+import zipfile
+import tempfile
+import numpy as np
+from Job_Set import JobSet
+
+# Trace generators live in the repository root
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import Job_init
+
+# Bumped whenever generated traces change for the same key fields, so stale entries miss
+TRACE_FORMAT_VERSION = 1
+
+def seed_fields(seed):
+    """JSON form of a seed: an int, or a SeedSequence's (entropy, spawn_key)."""
+    if isinstance(seed, np.random.SeedSequence):
+        return {"entropy": seed.entropy, "spawn_key": list(seed.spawn_key)}
+    if seed is None:
+        raise ValueError("A cached trace needs a seed; seed=None traces are not reproducible")
+    return int(seed)
+
+def _json_value(obj):
+    """json.dumps default: NumPy scalars and arrays as the equal Python values, so np.int64(30) keys like 30."""
+    if isinstance(obj, np.ndarray):
+        return obj.tolist()
+    if isinstance(obj, np.generic):
+        return obj.item()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+def trace_key(fields) -> str:
+    """sha256 of the canonical JSON of the key fields (generator, parameters, seed, num_jobs, ...)."""
+    canonical = json.dumps({"version": TRACE_FORMAT_VERSION, **fields}, sort_keys=True, separators=(',', ':'),
+                           default=_json_value)
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+def _smallest_uint(values):
+    """values in the smallest unsigned dtype holding them (the columns are non-negative)."""
+    top = int(values.max()) if len(values) else 0
+    for dtype in (np.uint8, np.uint16, np.uint32):
+        if top <= np.iinfo(dtype).max:
+            return values.astype(dtype)
+    return values.astype(np.uint64)
+
+def save_trace(path, jobs, fields=None):
+    """
+    Compact .npz of an integer trace: arrival gaps (arrivals are sorted, so gaps are small)
+    and sizes, each in the smallest unsigned dtype, compressed. Written to a temporary
+    file and renamed, so concurrent writers of one key never leave a partial file.
+    """
+    arrival = jobs.arrival
+    gaps = np.diff(arrival, prepend=0)
+    if len(arrival) and (gaps.min() < 0 or jobs.size.min() < 0):
+        raise ValueError("save_trace expects arrival-sorted traces with non-negative sizes")
+    directory = os.path.dirname(path) or '.'
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            np.savez_compressed(f, gaps=_smallest_uint(gaps), size=_smallest_uint(jobs.size),
+                                fields=np.array(json.dumps(fields or {}, sort_keys=True, default=_json_value)))
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+def load_trace(path) -> JobSet:
+    with np.load(path) as data:
+        arrival = np.cumsum(data['gaps'], dtype=np.int64)
+        size = data['size'].astype(np.int64)
+    return JobSet(arrival, size)
+
+
+class TraceCache:
+    """
+    Content-addressed trace store: a trace is generated on first request and reused after.
+    - Entries are <cache_dir>/<key[:2]>/<key>.npz with key = trace_key(fields), so equal
+      (generator, parameters, coherence_time, seed, num_jobs) always hit the same file and
+      any change in them is a different entry.
+    - A file's mtime is its last use (hits touch it); after each insertion the least
+      recently used entries are deleted until the cache is under max_bytes.
+    - Safe to share between worker processes: writes are atomic renames and a racing
+      duplicate write stores the same content.
+    """
+
+    def __init__(self, cache_dir, max_bytes=1 << 30):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def path(self, key) -> str:
+        return os.path.join(self.cache_dir, key[:2], f"{key}.npz")
+
+    def get_or_generate(self, fields, generate) -> JobSet:
+        """Trace for the key fields; generate() -> JobSet is called only on a miss."""
+        key = trace_key(fields)
+        path = self.path(key)
+        try:
+            jobs = load_trace(path)
+        except (OSError, ValueError, KeyError, zipfile.BadZipFile):
+            jobs = None  # missing, evicted meanwhile, or unreadable: regenerate
+        if jobs is not None:
+            try:
+                os.utime(path)  # mark as recently used
+            except FileNotFoundError:
+                pass
+            return jobs
+        jobs = generate()
+        save_trace(path, jobs, fields)
+        self.evict(keep=path)
+        return jobs
+
+    def get_trace(self, generator, num_jobs, seed, **params) -> JobSet:
+        """
+        Trace of a Job_init generator by name, e.g.
+        get_trace('combination_random_job_init', 10000, seed=7, param_set=[...], coherence_time=64).
+        The generator runs as one chunk (chunk_size=num_jobs) on default_rng(seed).
+        """
+        fields = {"generator": generator, "num_jobs": num_jobs, "seed": seed_fields(seed), "params": params}
+
+        def generate():
+            chunks = getattr(Job_init, generator)(num_jobs, rng=np.random.default_rng(seed),
+                                                  chunk_size=max(num_jobs, 1), **params)
+            arrival_times, job_sizes = next(iter(chunks), (np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)))
+            return JobSet(arrival_times, job_sizes)
+
+        return self.get_or_generate(fields, generate)
+
+    def entries(self):
+        """[(mtime, bytes, path), ...] of the stored traces."""
+        found = []
+        for root, _, files in os.walk(self.cache_dir):
+            for name in files:
+                if name.endswith('.npz'):
+                    path = os.path.join(root, name)
+                    try:
+                        stat = os.stat(path)
+                    except FileNotFoundError:
+                        continue
+                    found.append((stat.st_mtime, stat.st_size, path))
+        return found
+
+    def total_bytes(self) -> int:
+        return sum(size for _, size, _ in self.entries())
+
+    def evict(self, keep=None) -> int:
+        """Delete least recently used traces until the cache fits max_bytes; returns bytes freed."""
+        entries = sorted(self.entries())
+        total = sum(size for _, size, _ in entries)
+        freed = 0
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            if path == keep:
+                continue
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass  # another process evicted it
+            total -= size
+            freed += size
+        return freed
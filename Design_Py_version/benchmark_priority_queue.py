@@ -0,0 +1,101 @@
+import os
+import csv
+import glob
+import time
+import logging
+import read_jobs_from_csv as rjfc
+import parse_avg_filename as paf
+from Priority_Queue import PRIORITY_QUEUES
+from SRPT import SRPT
+from SJF import Sjf
+from SETF import Setf
+from BAL import Bal
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+ALGORITHMS = {
+    'SRPT': SRPT,
+    'SJF': Sjf,
+    'SETF': Setf,
+    'BAL': Bal,
+}
+
+def time_algorithm(algo, jobs, queue_type, repeat=3):
+    """Best-of-`repeat` wall time of algo(jobs, queue_type=...) and its result."""
+    best = float('inf')
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = algo(jobs, queue_type=queue_type)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+def benchmark_avg30(data_dir='data', output_file='priority_queue_benchmark.csv', repeat=3):
+    """
+    Time every queue_type of SRPT, SJF, SETF and BAL on the avg_30_* traces.
+    Results of all backends must agree; one CSV row per (file, algorithm, queue_type)
+    with the speedup relative to the heapq backend.
+    """
+    csv_files = sorted(glob.glob(os.path.join(data_dir, 'avg_30_*', '*.csv')))
+    if not csv_files:
+        logger.warning(f"No avg_30 traces found under {data_dir}")
+        return []
+
+    rows = []
+    for csv_file in csv_files:
+        arrival_rate, bp_L, bp_H = paf.parse_avg_filename(os.path.basename(csv_file))
+        jobs = rjfc.read_jobs_from_csv(csv_file)
+        if jobs is None:
+            continue
+
+        for algo_name, algo in ALGORITHMS.items():
+            timings = {}
+            results = {}
+            for queue_type in PRIORITY_QUEUES:
+                timings[queue_type], results[queue_type] = time_algorithm(algo, jobs, queue_type, repeat)
+            if len(set(results.values())) != 1:
+                logger.error(f"{algo_name} results differ across queue types on {csv_file}: {results}")
+
+            for queue_type, seconds in timings.items():
+                rows.append({
+                    'file': os.path.relpath(csv_file, data_dir),
+                    'arrival_rate': arrival_rate,
+                    'bp_L': bp_L,
+                    'bp_H': bp_H,
+                    'num_jobs': len(jobs),
+                    'algorithm': algo_name,
+                    'queue_type': queue_type,
+                    'seconds': seconds,
+                    'speedup_vs_heap': timings['heap'] / seconds if seconds > 0 else float('inf'),
+                })
+            logger.info(f"  {algo_name} on {os.path.basename(csv_file)}: " +
+                        ", ".join(f"{q}={s:.4f}s" for q, s in timings.items()))
+
+    if not rows:
+        logger.warning(f"No avg_30 trace under {data_dir} could be read; nothing written to {output_file}")
+        return rows
+
+    with open(output_file, 'w', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=list(rows[0].keys()))
+        writer.writeheader()
+        writer.writerows(rows)
+    logger.info(f"Saved {len(rows)} timings to {output_file}")
+    return rows
+
+def main():
+    """Main function to benchmark the priority queue backends"""
+
+    # Configuration
+    data_dir = 'data'  # Base directory containing avg_30_* folders
+    output_file = 'priority_queue_benchmark.csv'
+    logger.info("="*60)
+    logger.info(f"Starting priority queue benchmark:")
+    logger.info(f"  Data directory: {data_dir}")
+    logger.info(f"  Queue types: {', '.join(PRIORITY_QUEUES)}")
+    logger.info("="*60)
+
+    benchmark_avg30(data_dir, output_file)
+
+if __name__ == "__main__":
+    main()
@@ -8,8 +8,9 @@ import os
 from concurrent.futures import ProcessPoolExecutor, as_completed
 from concurrent.futures import TimeoutError
 import logging
-from itertools import product
 import pickle
+from Sim_Kernel import simulate_many
+from Job_Set import as_job_set
 
 # Set up logging
 logging.basicConfig(level=logging.INFO)
@@ -123,6 +124,50 @@ def run_all_algorithms_parallel_optimized(job_list, base_algorithms, dynamic_con
     
     return results
 
+def fused_policies(jobs, nJobsPerRound=100, modes=(1, 2, 3, 4, 5, 6)):
+    """
+    Kernel policies of the standard comparison, keyed like run_algorithm_with_ref's results
+    (RR, Srpt, Setf, Fcfs, Bal, Sjf, DYNAMIC_mode{m}_njobs{n}).
+    Dynamic verdicts for all modes come from one plan_dynamic_decisions pass.
+    """
+    policies = {
+        'RR': RR.RRPolicy(),
+        'Srpt': SRPT.SRPTPolicy(),
+        'Setf': SETF.SETFPolicy(),
+        'Fcfs': FCFS.FCFSPolicy(),
+        'Bal': BAL.BALPolicy(),
+        'Sjf': SJF.SJFPolicy(),
+    }
+    plans = Dynamic.plan_dynamic_decisions(jobs, nJobsPerRound, modes)
+    for mode in modes:
+        policies[f"DYNAMIC_mode{mode}_njobs{nJobsPerRound}"] = Dynamic.DynamicPolicy(plans[mode], nJobsPerRound)
+    return policies
+
+def run_all_algorithms_fused(job_list, nJobsPerRound=100, modes=(1, 2, 3, 4, 5, 6), input_file_name=None):
+    """
+    Single-process alternative to run_all_algorithms_parallel_optimized: the trace is
+    parsed and sorted once and every policy advances over the shared arrival stream in
+    lockstep (Sim_Kernel.simulate_many). Returns {algo_key: L2 norm flow time}.
+    """
+    if not job_list:
+        return None
+    jobs = as_job_set(job_list)
+    policies = fused_policies(jobs, nJobsPerRound, modes)
+    try:
+        metrics = simulate_many(jobs, policies)
+    except Exception as e:
+        logger.error(f"Error in fused execution: {str(e)}")
+        return None
+
+    # Same per-mode analysis files as DYNAMIC(..., input_file_name=...)
+    if input_file_name:
+        for mode in modes:
+            algorithm_history = Dynamic.dynamic_algorithm_history(
+                policies[f"DYNAMIC_mode{mode}_njobs{nJobsPerRound}"].decisions, len(jobs), nJobsPerRound)
+            Dynamic.save_analysis_results(input_file_name, nJobsPerRound, mode, algorithm_history, len(algorithm_history))
+
+    return {algo_key: l2n for algo_key, (_, l2n, _) in metrics.items()}
+
 def execute_phase1(Arrival_rate, bp_parameter):
     """Execute phase 1 for normal data with fully parallel processing"""
     avg_statuses = ["avg_30", "avg_60", "avg_90"]
@@ -140,31 +185,9 @@ def execute_phase1(Arrival_rate, bp_parameter):
                     logger.warning(f"No data found in {file_path}")
                     continue
 
-                # Define algorithm parameters using list comprehension (no loops!)
-                modes = [1, 2, 3, 4, 5, 6]
-                njobs_per_round = [100]
-                
-                # Create all configurations at once using list comprehension
-                base_algorithms = [
-                    (RR.RR, job_list, False, True, {}),
-                    (SRPT.Srpt, job_list, False, False, {}),
-                    (SETF.Setf, job_list, False, True, {}),
-                    (FCFS.Fcfs, job_list, False, False, {}),
-                    (BAL.Bal, job_list, False, False, {}),
-                    (SJF.Sjf, job_list, False, True, {})
-                ]
-                
-                # Use product to create all combinations without explicit loops
-                dynamic_params = list(product(modes, njobs_per_round))
-                dynamic_configs = [
-                    (Dynamic.DYNAMIC, job_list, False, False, 
-                     {'nJobsPerRound': njobs, 'mode': mode, 'input_file_name': file_path})
-                    for mode, njobs in dynamic_params
-                ]
-                
-                # Run everything in parallel
-                all_results = run_all_algorithms_parallel_optimized(
-                    job_list, base_algorithms, dynamic_configs
+                # All algorithms and Dynamic modes in one fused pass over the trace
+                all_results = run_all_algorithms_fused(
+                    job_list, nJobsPerRound=100, modes=[1, 2, 3, 4, 5, 6], input_file_name=file_path
                 )
                 
                 if not all_results:
@@ -210,30 +233,9 @@ def execute_phase1_random(freq_folders):
                 logger.warning(f"No data found for {file_path}")
                 continue
             
-            # Create all configurations using list comprehensions
-            modes = [1, 2, 3, 4, 5, 6]
-            njobs_per_round = [100]
-            
-            base_algorithms = [
-                (RR.RR, job_list, False, True, {}),
-                (SRPT.Srpt, job_list, False, False, {}),
-                (SETF.Setf, job_list, False, True, {}),
-                (FCFS.Fcfs, job_list, False, False, {}),
-                (BAL.Bal, job_list, False, False, {}),
-                (SJF.Sjf, job_list, False, True, {})
-            ]
-            
-            # Use product for creating all combinations
-            dynamic_params = list(product(modes, njobs_per_round))
-            dynamic_configs = [
-                (Dynamic.DYNAMIC, job_list, False, False, 
-                 {'nJobsPerRound': njobs, 'mode': mode, 'input_file_name': file_path})
-                for mode, njobs in dynamic_params
-            ]
-            
-            # Run everything in parallel
-            freq_results = run_all_algorithms_parallel_optimized(
-                job_list, base_algorithms, dynamic_configs
+            # All algorithms and Dynamic modes in one fused pass over the trace
+            freq_results = run_all_algorithms_fused(
+                job_list, nJobsPerRound=100, modes=[1, 2, 3, 4, 5, 6], input_file_name=file_path
             )
             
             if not freq_results:
@@ -275,30 +277,9 @@ def execute_phase1_softrandom(freq_folders):
                 logger.warning(f"No data found for {file_path}")
                 continue
             
-            # Create all configurations using list comprehensions
-            modes = [1, 2, 3, 4, 5, 6]
-            njobs_per_round = [10]
-            
-            base_algorithms = [
-                (RR.RR, job_list, False, True, {}),
-                (SRPT.Srpt, job_list, False, False, {}),
-                (SETF.Setf, job_list, False, True, {}),
-                (FCFS.Fcfs, job_list, False, False, {}),
-                (BAL.Bal, job_list, False, False, {}),
-                (SJF.Sjf, job_list, False, True, {})
-            ]
-            
-            # Use product for creating all combinations
-            dynamic_params = list(product(modes, njobs_per_round))
-            dynamic_configs = [
-                (Dynamic.DYNAMIC, job_list, False, False, 
-                 {'nJobsPerRound': njobs, 'mode': mode, 'input_file_name': file_path})
-                for mode, njobs in dynamic_params
-            ]
-            
-            # Run everything in parallel
-            freq_results = run_all_algorithms_parallel_optimized(
-                job_list, base_algorithms, dynamic_configs
+            # All algorithms and Dynamic modes in one fused pass over the trace
+            freq_results = run_all_algorithms_fused(
+                job_list, nJobsPerRound=10, modes=[1, 2, 3, 4, 5, 6], input_file_name=file_path
             )
             
             if not freq_results:
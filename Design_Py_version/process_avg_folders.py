@@ -7,12 +7,14 @@ import logging
 import read_jobs_from_csv as rjfc
 import csv
 import parse_avg_filename as paf
+from Flow_Metrics import completion_path
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
-def process_avg_folders(algo, algo_name, data_dir, output_dir):
-    """Process all avg_30_*, avg_60_*, avg_90_* folders"""
+def process_avg_folders(algo, algo_name, data_dir, output_dir, completion_dir=None):
+    """Process all avg_30_*, avg_60_*, avg_90_* folders
+    With completion_dir set, each run's completion times are also saved there as .npy."""
     
     # Find all avg folders with version numbers
     avg_patterns = ['avg_30_*']
@@ -56,12 +58,13 @@ def process_avg_folders(algo, algo_name, data_dir, output_dir):
                 logger.info(f"  Processing {filename}: arrival_rate={arrival_rate}, bp_L={bp_L}, bp_H={bp_H}")
                 
                 # Read jobs
-                jobs = rjfc.read_jobs_from_csv(csv_file)
+                jobs = rjfc.read_job_set_from_csv(csv_file)
                 if jobs is None:
                     continue
                 
                 # Run Algorithm
-                _results = run.run(algo, jobs)
+                completion_file = completion_path(completion_dir, data_dir, csv_file, algo_name) if completion_dir else None
+                _results = run.run(algo, jobs, completion_file)
                 
                 # Store results
                 if arrival_rate not in results_by_arrival_rate:
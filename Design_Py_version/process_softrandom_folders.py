@@ -6,12 +6,14 @@ import read_jobs_from_csv as rjfc
 import csv
 import logging
 import run_random 
+from Flow_Metrics import completion_path
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
-def process_softrandom_folders(algo, algo_name, data_dir, output_dir):
-    """Process all softrandom_* folders"""
+def process_softrandom_folders(algo, algo_name, data_dir, output_dir, completion_dir=None):
+    """Process all softrandom_* folders
+    With completion_dir set, each run's completion times are also saved there as .npy."""
     
     # Create output directory
     softrandom_result_dir = os.path.join(output_dir, 'softrandom_result')
@@ -56,13 +58,14 @@ def process_softrandom_folders(algo, algo_name, data_dir, output_dir):
                 logger.info(f"    Processing {filename}")
                 
                 # Read jobs
-                jobs = rjfc.read_jobs_from_csv(softrandom_file)
+                jobs = rjfc.read_job_set_from_csv(softrandom_file)
                 if jobs is None:
                     continue
                 
                 # Run algorithm
                 try:
-                    l2_results, max_flow_results = run_random.run_random(algo, jobs)
+                    completion_file = completion_path(completion_dir, data_dir, softrandom_file, algo_name) if completion_dir else None
+                    l2_results, max_flow_results = run_random.run_random(algo, jobs, completion_file)
                     logger.info(f"  Results: L2={l2_results:.4f}, Max Flow={max_flow_results:.4f}")
                 except Exception as e:
                     logger.error(f"Error processing {softrandom_file}: {e}")  # FIXED: variable name
@@ -1,5 +1,8 @@
 import csv
 import logging
+import numpy as np
+import pandas as pd
+from Job_Set import JobSet
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
@@ -19,4 +22,23 @@ def read_jobs_from_csv(filepath):
         return jobs
     except Exception as e:
         logger.error(f"Error reading {filepath}: {e}")
-        return None
\ No newline at end of file
+        return None
+
+def read_job_set_from_csv(filepath):
+    """Read jobs from CSV file as a columnar JobSet (no per-job dicts)"""
+    try:
+        jobs = JobSet.from_csv(filepath)
+        logger.info(f"Successfully read {len(jobs)} jobs from {filepath}")
+        return jobs
+    except Exception as e:
+        logger.error(f"Error reading {filepath}: {e}")
+        return None
+
+def iter_job_set_chunks(filepath, chunk_size=2**16):
+    """Read a trace CSV as consecutive JobSet chunks of at most chunk_size jobs (constant memory);
+    each chunk's index holds the jobs' positions in the file"""
+    start = 0
+    for df in pd.read_csv(filepath, usecols=['arrival_time', 'job_size'], chunksize=chunk_size):
+        yield JobSet(df['arrival_time'].to_numpy(), df['job_size'].to_numpy(),
+                     np.arange(start, start + len(df), dtype=np.int64))
+        start += len(df)
@@ -1,8 +1,14 @@
-import copy
+from Flow_Metrics import save_completion_times
+from Job_Set import as_job_set
 
-def run(algo,jobs):
-    #Create a deep copy to ensure each mode gets fresh job data
-    jobs_copy = copy.deepcopy(jobs)
-    _, l2_norm_flow_time, _ = algo(jobs_copy)
-    
-    return l2_norm_flow_time
\ No newline at end of file
+def run(algo,jobs,completion_file=None):
+    # Engines never write to a JobSet, so every mode can share it without a deep copy
+    jobs = as_job_set(jobs)
+    if completion_file is None:
+        _, l2_norm_flow_time, _ = algo(jobs)
+        return l2_norm_flow_time
+
+    # Also persist the per-job completion times (original job order) as .npy
+    _, l2_norm_flow_time, _, completion_times = algo(jobs, return_completion_times=True)
+    save_completion_times(completion_file, completion_times)
+    return l2_norm_flow_time
@@ -4,7 +4,6 @@ import tqdm
 import Write_csv
 import math
 import os
-import random
 import pandas as pd
 from typing import List, Dict, Tuple
 
@@ -82,40 +81,184 @@ bp_parameter_sets = {
     "avg_90": bp_parameter_90
 }
 
-def generate_bounded_pareto(alpha, xmin, xmax, size=1):
+# Jobs per chunk of the streaming generators (two int64 arrays of 512 KB each)
+DEFAULT_CHUNK_SIZE = 2**16
+
+def generate_bounded_pareto(alpha, xmin, xmax, size=1, rng=None):
     """Generate bounded Pareto distributed random values."""
+    rng = np.random if rng is None else rng
     cdf_xmin = 1 - (xmin / xmax) ** alpha
-    u = np.random.uniform(0, cdf_xmin, size=size)
+    u = rng.uniform(0, cdf_xmin, size=size)
     x = xmin / ((1 - u) ** (1 / alpha))
     return x
 
-def generate_normal_job_size(mean, std, size=1):
+def generate_normal_job_size(mean, std, size=1, rng=None):
     """
     Generate job sizes from normal distribution.
     Ensures positive values and rounds to integers.
     Uses truncation at 1 to avoid negative or zero job sizes.
     """
-    samples = np.random.normal(mean, std, size=size)
+    rng = np.random if rng is None else rng
+    samples = rng.normal(mean, std, size=size)
     # Ensure all values are positive (minimum job size = 1)
     samples = np.maximum(samples, 1)
     return samples
 
-def generate_job_size(param, size=1):
+def generate_job_size(param, size=1, rng=None):
     """
     Generate job size based on parameter type.
     
     Parameters:
     param (dict): Parameter dictionary with 'type' key
     size (int): Number of samples to generate
+    rng (numpy.random.Generator): Source of randomness (default: the global np.random state)
     """
     if param["type"] == "BP":
-        return generate_bounded_pareto(1.1, param["L"], param["H"], size=size)
+        return generate_bounded_pareto(1.1, param["L"], param["H"], size=size, rng=rng)
     elif param["type"] == "Normal":
-        return generate_normal_job_size(param["mean"], param["std"], size=size)
+        return generate_normal_job_size(param["mean"], param["std"], size=size, rng=rng)
     else:
         raise ValueError(f"Unknown parameter type: {param['type']}")
 
-def job_init(num_jobs, avg_inter_arrival_time, param):
+def _generator(rng=None):
+    """
+    numpy Generator for the trace generators. rng may be a Generator or a seed; by default a
+    Generator is seeded from the global np.random state, so np.random.seed() still makes
+    traces reproducible.
+    """
+    if rng is None:
+        return np.random.default_rng(np.random.randint(0, 2**63 - 1, dtype=np.int64))
+    return np.random.default_rng(rng)
+
+def _job_list(arrival_times, job_sizes):
+    return [{"arrival_time": a, "job_size": s} for a, s in zip(arrival_times.tolist(), job_sizes.tolist())]
+
+def _sample_job_sizes(params, param_index, rng):
+    """ceil'd job sizes for jobs whose parameter is params[param_index[k]], one batch per parameter."""
+    job_sizes = np.empty(len(param_index), dtype=np.float64)
+    for p in np.unique(param_index):
+        mask = param_index == p
+        job_sizes[mask] = generate_job_size(params[p], size=int(mask.sum()), rng=rng)
+    return np.ceil(job_sizes).astype(np.int64)
+
+def soft_transition(index, num_params, u):
+    """
+    Soft-random move of a parameter index for a uniform draw u:
+    - at the lowest index: 1/2 stay, 1/2 move up
+    - at the highest index: 1/2 stay, 1/2 move down
+    - otherwise: 1/3 stay, 1/3 move down, 1/3 move up
+    With two parameters this is a switch with probability 1/2.
+    """
+    if index == 0:
+        return min(1, num_params - 1) if u < 0.5 else index
+    if index == num_params - 1:
+        return max(0, num_params - 2) if u < 0.5 else index
+    if u < 1/3:
+        return index
+    return index - 1 if u < 2/3 else index + 1
+
+def _concat_chunks(chunks):
+    """Job list of a chunk iterator (the list versions are one chunk of num_jobs jobs)."""
+    arrivals, sizes = [], []
+    for arrival_times, job_sizes in chunks:
+        arrivals.append(arrival_times)
+        sizes.append(job_sizes)
+    if not arrivals:
+        return []
+    return _job_list(np.concatenate(arrivals), np.concatenate(sizes))
+
+def iter_regime_switching_jobs(num_jobs, params, coherence_time=1, inter_arrival_choices=None,
+                               transition=None, first_index=None, chunk_size=DEFAULT_CHUNK_SIZE, rng=None):
+    """
+    Streaming engine of the regime-switching generators: yields (arrival_times, job_sizes)
+    int64 arrays of at most chunk_size jobs, so memory stays O(chunk_size) however long the
+    trace is. The regime (parameter index, mean inter-arrival time, clock, last change time)
+    carries over from chunk to chunk.
+    Before each job, once coherence_time time units have passed since the last change
+    (arrival of the previous job minus the change time), the parameter index moves by
+    `transition` (uniform choice when None, soft_transition for soft random) and a new mean
+    inter-arrival time is drawn.
+    - Per chunk, all random variates are drawn in bulk from one numpy Generator: standard
+      exponentials for the gaps and one uniform / one inter-arrival pick per job slot, used
+      when that job starts a new regime.
+    - A scalar scan over these arrays finds the change points (gaps decide when the next
+      change happens, so this part is sequential but does no NumPy calls).
+    - Job sizes are then sampled in one batch per parameter.
+    Gaps are round(Exp(mean)) with a minimum of 1 and sizes are ceil'd, as before.
+    For a given seed the trace depends on chunk_size (the draws are batched per chunk).
+
+    Parameters:
+    num_jobs (int): Number of jobs to generate
+    params (list): Job size parameters to switch between
+    coherence_time (int): Time units after which parameters may change
+    inter_arrival_choices (list): Mean inter-arrival times to draw from (default: inter_arrival_time)
+    transition (callable): (index, num_params, u) -> next index
+    first_index (int): Initial parameter index (default: uniform)
+    chunk_size (int): Jobs per yielded chunk
+    rng: numpy Generator or seed (default: seeded from np.random)
+    """
+    rng = _generator(rng)
+    choices = inter_arrival_time if inter_arrival_choices is None else inter_arrival_choices
+    num_params = len(params)
+
+    index = int(rng.integers(num_params)) if first_index is None else first_index
+    scale = choices[rng.integers(len(choices))]
+    current_time = 0
+    last_change_time = 0
+    for start in range(0, num_jobs, chunk_size):
+        n = min(chunk_size, num_jobs - start)
+        exponentials = rng.standard_exponential(n).tolist()
+        moves = rng.random(n).tolist()
+        rates = rng.integers(len(choices), size=n).tolist()
+
+        arrival_times = [0] * n
+        param_index = [0] * n
+        for k in range(n):
+            if current_time - last_change_time >= coherence_time:
+                u = moves[k]
+                index = int(u * num_params) if transition is None else transition(index, num_params, u)
+                scale = choices[rates[k]]
+                last_change_time = current_time
+            inter_arrival = round(scale * exponentials[k])
+            current_time += inter_arrival if inter_arrival > 1 else 1
+            arrival_times[k] = current_time
+            param_index[k] = index
+
+        job_sizes = _sample_job_sizes(params, np.array(param_index, dtype=np.int64), rng)
+        yield np.array(arrival_times, dtype=np.int64), job_sizes
+
+def regime_switching_job_init(num_jobs, params, coherence_time=1, inter_arrival_choices=None,
+                              transition=None, first_index=None, rng=None, chunk_size=None):
+    """
+    Shared engine of the regime-switching generators: iter_regime_switching_jobs as one
+    job list, or the chunk iterator itself when chunk_size is given (same parameters).
+    """
+    if chunk_size is not None:
+        return iter_regime_switching_jobs(num_jobs, params, coherence_time, inter_arrival_choices,
+                                          transition, first_index, chunk_size, rng)
+    return _concat_chunks(iter_regime_switching_jobs(num_jobs, params, coherence_time, inter_arrival_choices,
+                                                     transition, first_index, max(num_jobs, 1), rng))
+
+def iter_job_init(num_jobs, avg_inter_arrival_time, param, chunk_size=DEFAULT_CHUNK_SIZE, rng=None):
+    """
+    Streaming job_init: yields (arrival_times, job_sizes) int64 arrays of at most chunk_size
+    jobs; the clock carries over between chunks.
+    """
+    rng = _generator(rng)
+    current_time = 0
+    for start in range(0, num_jobs, chunk_size):
+        n = min(chunk_size, num_jobs - start)
+
+        # Generate job sizes based on distribution type
+        job_sizes = np.ceil(generate_job_size(param, size=n, rng=rng)).astype(np.int64)
+
+        # Generate integer arrival times
+        inter_arrivals = np.rint(rng.exponential(scale=avg_inter_arrival_time, size=n)).astype(np.int64)
+        arrival_times = current_time + np.cumsum(np.maximum(inter_arrivals, 1))
+        current_time = int(arrival_times[-1])
+        yield arrival_times, job_sizes
+
+def job_init(num_jobs, avg_inter_arrival_time, param, rng=None, chunk_size=None):
     """
     Create jobs with either bounded Pareto or Normal distribution.
     
@@ -123,27 +266,13 @@ def job_init(num_jobs, avg_inter_arrival_time, param):
     num_jobs (int): Number of jobs to generate
     avg_inter_arrival_time (float): Average inter-arrival time
     param (dict): Parameter dictionary with distribution info
+    chunk_size (int): When given, return an iterator of (arrival_times, job_sizes) chunks instead of a list
     """
-    samples = []
-    
-    # Generate job sizes based on distribution type
-    job_sizes = [math.ceil(size) for size in generate_job_size(param, size=num_jobs)]
-    
-    # Generate integer arrival times
-    current_time = 0
-    arrival_times = []
-    for _ in range(num_jobs):
-        inter_arrival = round(np.random.exponential(scale=avg_inter_arrival_time))
-        inter_arrival = max(1, inter_arrival)
-        current_time += inter_arrival
-        arrival_times.append(current_time)
-    
-    # Create job list
-    for k in range(num_jobs):
-        samples.append({"arrival_time": arrival_times[k], "job_size": job_sizes[k]})
-    return samples
+    if chunk_size is not None:
+        return iter_job_init(num_jobs, avg_inter_arrival_time, param, chunk_size, rng)
+    return _concat_chunks(iter_job_init(num_jobs, avg_inter_arrival_time, param, max(num_jobs, 1), rng))
 
-def random_job_init(num_jobs, coherence_time=1):
+def random_job_init(num_jobs, coherence_time=1, rng=None, chunk_size=None):
     """
     Create jobs with randomly selected parameters (BP or Normal) with equal probability.
     All parameters across all families have equal probability of selection.
@@ -152,41 +281,15 @@ def random_job_init(num_jobs, coherence_time=1):
     num_jobs (int): Number of jobs to generate
     coherence_time (int): Time units after which parameters may change
     """
-    samples = []
-    
     # Collect all parameters from all families (BP + Normal)
     all_parameters = []
     for param_set in parameter_sets.values():
         all_parameters.extend(param_set)
-    
+
     # Now each parameter (whether BP or Normal) has equal probability: 1/len(all_parameters)
-    
-    # Initialize with random parameter and inter-arrival time
-    current_param = random.choice(all_parameters)
-    current_avg_inter_arrival = random.choice(inter_arrival_time)
-    current_time = 0
-    last_change_time = 0
-    
-    # Generate jobs one by one
-    for _ in range(num_jobs):
-        if current_time - last_change_time >= coherence_time:
-            current_param = random.choice(all_parameters)
-            current_avg_inter_arrival = random.choice(inter_arrival_time)
-            last_change_time = current_time
-        
-        # Generate job size based on current parameter type
-        job_size = math.ceil(generate_job_size(current_param, size=1)[0])
-        
-        # Generate arrival time
-        inter_arrival = round(np.random.exponential(scale=current_avg_inter_arrival))
-        inter_arrival = max(1, inter_arrival)
-        current_time += inter_arrival
-        
-        samples.append({"arrival_time": current_time, "job_size": job_size})
-    
-    return samples
+    return regime_switching_job_init(num_jobs, all_parameters, coherence_time, rng=rng, chunk_size=chunk_size)
 
-def soft_random_job_init(num_jobs, coherence_time=1):
+def soft_random_job_init(num_jobs, coherence_time=1, rng=None, chunk_size=None):
     """
     Create jobs with soft randomness - smooth transitions within a chosen family.
     The family (avg_30, avg_60, avg_90) is chosen once at the start and contains
@@ -196,62 +299,17 @@ def soft_random_job_init(num_jobs, coherence_time=1):
     num_jobs (int): Number of jobs to generate
     coherence_time (int): Time units after which parameters may change
     """
-    samples = []
+    rng = _generator(rng)
     param_set_keys = list(parameter_sets.keys())
-    
+
     # Step 1: Choose family (which now contains both BP and Normal)
-    current_param_set_key = random.choice(param_set_keys)
-    current_param_set = parameter_sets[current_param_set_key]
-    
-    # Step 2: Start with random parameter within the family
-    current_param_index = random.randint(0, len(current_param_set) - 1)
-    
-    # Step 3: Initialize inter-arrival time
-    current_avg_inter_arrival = random.choice(inter_arrival_time)
-    
-    current_time = 0
-    last_change_time = 0
-    
-    # Generate jobs
-    for _ in range(num_jobs):
-        if current_time - last_change_time >= coherence_time:
-            num_params = len(current_param_set)
-            
-            # Apply transition rules (same as before)
-            if current_param_index == 0:
-                if random.random() < 0.5:
-                    current_param_index = 1
-            elif current_param_index == num_params - 1:
-                if random.random() < 0.5:
-                    current_param_index = num_params - 2
-            else:
-                choice = random.random()
-                if choice < 1/3:
-                    pass
-                elif choice < 2/3:
-                    current_param_index -= 1
-                else:
-                    current_param_index += 1
-            
-            current_avg_inter_arrival = random.choice(inter_arrival_time)
-            last_change_time = current_time
-        
-        # Get current parameter (could be BP or Normal)
-        current_param = current_param_set[current_param_index]
-        
-        # Generate job size based on parameter type
-        job_size = math.ceil(generate_job_size(current_param, size=1)[0])
-        
-        # Generate arrival time
-        inter_arrival = round(np.random.exponential(scale=current_avg_inter_arrival))
-        inter_arrival = max(1, inter_arrival)
-        current_time += inter_arrival
-        
-        samples.append({"arrival_time": current_time, "job_size": job_size})
-    
-    return samples
+    current_param_set = parameter_sets[param_set_keys[rng.integers(len(param_set_keys))]]
+
+    # Step 2: Start with random parameter within the family, then soft transitions
+    return regime_switching_job_init(num_jobs, current_param_set, coherence_time, transition=soft_transition,
+                                     first_index=int(rng.integers(len(current_param_set))), rng=rng, chunk_size=chunk_size)
 
-def bounded_pareto_random_job_init(num_jobs, coherence_time=1):
+def bounded_pareto_random_job_init(num_jobs, coherence_time=1, rng=None, chunk_size=None):
     """
     Create jobs with randomly selected Bounded Pareto parameters only from avg_30.
 
@@ -259,38 +317,10 @@ def bounded_pareto_random_job_init(num_jobs, coherence_time=1):
     num_jobs (int): Number of jobs to generate
     coherence_time (int): CPU time units after which parameters may change
     """
-    samples = []
-
     # Only use BP parameters from avg_30
-    all_bp_parameters = bp_parameter_30
+    return regime_switching_job_init(num_jobs, bp_parameter_30, coherence_time, rng=rng, chunk_size=chunk_size)
 
-    # Initialize with random parameter and inter-arrival time
-    current_param = random.choice(all_bp_parameters)
-    current_avg_inter_arrival = random.choice(inter_arrival_time)
-    current_time = 0
-    last_change_time = 0
-
-    # Generate jobs one by one
-    for _ in range(num_jobs):
-        # Check if coherence_time has passed (based on CPU time, not job count)
-        if current_time - last_change_time >= coherence_time:
-            current_param = random.choice(all_bp_parameters)
-            current_avg_inter_arrival = random.choice(inter_arrival_time)
-            last_change_time = current_time
-
-        # Generate job size using Bounded Pareto
-        job_size = math.ceil(generate_job_size(current_param, size=1)[0])
-
-        # Generate arrival time
-        inter_arrival = round(np.random.exponential(scale=current_avg_inter_arrival))
-        inter_arrival = max(1, inter_arrival)
-        current_time += inter_arrival
-
-        samples.append({"arrival_time": current_time, "job_size": job_size})
-
-    return samples
-
-def normal_random_job_init(num_jobs, coherence_time=1):
+def normal_random_job_init(num_jobs, coherence_time=1, rng=None, chunk_size=None):
     """
     Create jobs with randomly selected Normal distribution parameters only.
     H is set to 'std' for normal distribution.
@@ -299,40 +329,14 @@ def normal_random_job_init(num_jobs, coherence_time=1):
     num_jobs (int): Number of jobs to generate
     coherence_time (int): CPU time units after which parameters may change
     """
-    samples = []
-
     # Collect all Normal parameters from all families
     all_normal_parameters = []
     for param_set in normal_parameter_sets.values():
         all_normal_parameters.extend(param_set)
 
-    # Initialize with random parameter and inter-arrival time
-    current_param = random.choice(all_normal_parameters)
-    current_avg_inter_arrival = random.choice(inter_arrival_time)
-    current_time = 0
-    last_change_time = 0
+    return regime_switching_job_init(num_jobs, all_normal_parameters, coherence_time, rng=rng, chunk_size=chunk_size)
 
-    # Generate jobs one by one
-    for _ in range(num_jobs):
-        # Check if coherence_time has passed (based on CPU time, not job count)
-        if current_time - last_change_time >= coherence_time:
-            current_param = random.choice(all_normal_parameters)
-            current_avg_inter_arrival = random.choice(inter_arrival_time)
-            last_change_time = current_time
-
-        # Generate job size using Normal distribution
-        job_size = math.ceil(generate_job_size(current_param, size=1)[0])
-
-        # Generate arrival time
-        inter_arrival = round(np.random.exponential(scale=current_avg_inter_arrival))
-        inter_arrival = max(1, inter_arrival)
-        current_time += inter_arrival
-
-        samples.append({"arrival_time": current_time, "job_size": job_size})
-
-    return samples
-
-def bounded_pareto_soft_random_job_init(num_jobs, coherence_time=1):
+def bounded_pareto_soft_random_job_init(num_jobs, coherence_time=1, rng=None, chunk_size=None):
     """
     Create jobs with soft randomness for Bounded Pareto parameters only from avg_30.
     Modified transition rules:
@@ -344,63 +348,14 @@ def bounded_pareto_soft_random_job_init(num_jobs, coherence_time=1):
     num_jobs (int): Number of jobs to generate
     coherence_time (int): CPU time units after which parameters may change
     """
-    samples = []
+    rng = _generator(rng)
 
-    # Only use BP parameters from avg_30
+    # Only use BP parameters from avg_30, starting with a random parameter
     current_param_set = bp_parameter_30
+    return regime_switching_job_init(num_jobs, current_param_set, coherence_time, transition=soft_transition,
+                                     first_index=int(rng.integers(len(current_param_set))), rng=rng, chunk_size=chunk_size)
 
-    # Step 2: Start with random parameter within the family
-    current_param_index = random.randint(0, len(current_param_set) - 1)
-
-    # Step 3: Initialize inter-arrival time
-    current_avg_inter_arrival = random.choice(inter_arrival_time)
-
-    current_time = 0
-    last_change_time = 0
-
-    # Generate jobs
-    for _ in range(num_jobs):
-        # Check if coherence_time has passed (based on CPU time)
-        if current_time - last_change_time >= coherence_time:
-            num_params = len(current_param_set)
-
-            # Apply modified transition rules based on H position
-            if current_param_index == 0:  # Lowest H
-                if random.random() < 0.5:
-                    current_param_index = min(1, num_params - 1)  # Move up
-                # else: stay
-            elif current_param_index == num_params - 1:  # Highest H
-                if random.random() < 0.5:
-                    current_param_index = max(0, num_params - 2)  # Move down
-                # else: stay
-            else:  # Middle positions
-                choice = random.random()
-                if choice < 1/3:
-                    pass  # Stay
-                elif choice < 2/3:
-                    current_param_index -= 1  # Move down
-                else:
-                    current_param_index += 1  # Move up
-
-            current_avg_inter_arrival = random.choice(inter_arrival_time)
-            last_change_time = current_time
-
-        # Get current parameter (BP only)
-        current_param = current_param_set[current_param_index]
-
-        # Generate job size
-        job_size = math.ceil(generate_job_size(current_param, size=1)[0])
-
-        # Generate arrival time
-        inter_arrival = round(np.random.exponential(scale=current_avg_inter_arrival))
-        inter_arrival = max(1, inter_arrival)
-        current_time += inter_arrival
-
-        samples.append({"arrival_time": current_time, "job_size": job_size})
-
-    return samples
-
-def normal_soft_random_job_init(num_jobs, coherence_time=1):
+def normal_soft_random_job_init(num_jobs, coherence_time=1, rng=None, chunk_size=None):
     """
     Create jobs with soft randomness for Normal distribution parameters only.
     H is represented by 'std' (standard deviation).
@@ -413,65 +368,17 @@ def normal_soft_random_job_init(num_jobs, coherence_time=1):
     num_jobs (int): Number of jobs to generate
     coherence_time (int): CPU time units after which parameters may change
     """
-    samples = []
+    rng = _generator(rng)
     normal_set_keys = list(normal_parameter_sets.keys())
 
     # Step 1: Choose family (Normal only)
-    current_param_set_key = random.choice(normal_set_keys)
-    current_param_set = normal_parameter_sets[current_param_set_key]
-
-    # Step 2: Start with random parameter within the family
-    current_param_index = random.randint(0, len(current_param_set) - 1)
-
-    # Step 3: Initialize inter-arrival time
-    current_avg_inter_arrival = random.choice(inter_arrival_time)
-
-    current_time = 0
-    last_change_time = 0
-
-    # Generate jobs
-    for _ in range(num_jobs):
-        # Check if coherence_time has passed (based on CPU time)
-        if current_time - last_change_time >= coherence_time:
-            num_params = len(current_param_set)
-
-            # Apply modified transition rules based on std position
-            if current_param_index == 0:  # Lowest std
-                if random.random() < 0.5:
-                    current_param_index = min(1, num_params - 1)  # Move up
-                # else: stay
-            elif current_param_index == num_params - 1:  # Highest std
-                if random.random() < 0.5:
-                    current_param_index = max(0, num_params - 2)  # Move down
-                # else: stay
-            else:  # Middle positions
-                choice = random.random()
-                if choice < 1/3:
-                    pass  # Stay
-                elif choice < 2/3:
-                    current_param_index -= 1  # Move down
-                else:
-                    current_param_index += 1  # Move up
-
-            current_avg_inter_arrival = random.choice(inter_arrival_time)
-            last_change_time = current_time
+    current_param_set = normal_parameter_sets[normal_set_keys[rng.integers(len(normal_set_keys))]]
 
-        # Get current parameter (Normal only)
-        current_param = current_param_set[current_param_index]
+    # Step 2: Start with random parameter within the family, then soft transitions
+    return regime_switching_job_init(num_jobs, current_param_set, coherence_time, transition=soft_transition,
+                                     first_index=int(rng.integers(len(current_param_set))), rng=rng, chunk_size=chunk_size)
 
-        # Generate job size
-        job_size = math.ceil(generate_job_size(current_param, size=1)[0])
-
-        # Generate arrival time
-        inter_arrival = round(np.random.exponential(scale=current_avg_inter_arrival))
-        inter_arrival = max(1, inter_arrival)
-        current_time += inter_arrival
-
-        samples.append({"arrival_time": current_time, "job_size": job_size})
-
-    return samples
-
-def combination_random_job_init(num_jobs, param_set, coherence_time=1):
+def combination_random_job_init(num_jobs, param_set, coherence_time=1, rng=None, chunk_size=None):
     """
     Create jobs with random selection from a specific parameter set (2, 3, or 4 combinations).
     Each parameter in the set has equal probability of selection.
@@ -481,35 +388,9 @@ def combination_random_job_init(num_jobs, param_set, coherence_time=1):
     param_set (list): List of BP parameters to choose from (2, 3, or 4 parameters)
     coherence_time (int): CPU time units after which parameters may change
     """
-    samples = []
-    
-    # Initialize with random parameter from the set and inter-arrival time
-    current_param = random.choice(param_set)
-    current_avg_inter_arrival = random.choice(inter_arrival_time)
-    current_time = 0
-    last_change_time = 0
-    
-    # Generate jobs one by one
-    for _ in range(num_jobs):
-        # Check if coherence_time has passed (based on CPU time)
-        if current_time - last_change_time >= coherence_time:
-            current_param = random.choice(param_set)
-            current_avg_inter_arrival = random.choice(inter_arrival_time)
-            last_change_time = current_time
-        
-        # Generate job size using Bounded Pareto
-        job_size = math.ceil(generate_job_size(current_param, size=1)[0])
-        
-        # Generate arrival time
-        inter_arrival = round(np.random.exponential(scale=current_avg_inter_arrival))
-        inter_arrival = max(1, inter_arrival)
-        current_time += inter_arrival
-        
-        samples.append({"arrival_time": current_time, "job_size": job_size})
-    
-    return samples
+    return regime_switching_job_init(num_jobs, param_set, coherence_time, rng=rng, chunk_size=chunk_size)
 
-def combination_softrandom_job_init(num_jobs, param_set, coherence_time=1):
+def combination_softrandom_job_init(num_jobs, param_set, coherence_time=1, rng=None, chunk_size=None):
     """
     Create jobs with soft randomness within a specific parameter set (2, 3, or 4 combinations).
     Transitions follow soft random rules within the given set.
@@ -519,64 +400,12 @@ def combination_softrandom_job_init(num_jobs, param_set, coherence_time=1):
     param_set (list): List of BP parameters to choose from (2, 3, or 4 parameters)
     coherence_time (int): CPU time units after which parameters may change
     """
-    samples = []
-    
-    # Start with random parameter within the set
-    current_param_index = random.randint(0, len(param_set) - 1)
-    
-    # Initialize inter-arrival time
-    current_avg_inter_arrival = random.choice(inter_arrival_time)
-    
-    current_time = 0
-    last_change_time = 0
-    
-    # Generate jobs
-    for _ in range(num_jobs):
-        # Check if coherence_time has passed (based on CPU time)
-        if current_time - last_change_time >= coherence_time:
-            num_params = len(param_set)
-            
-            # Apply transition rules based on position
-            if num_params == 2:
-                # For 2 combinations: 1/2 probability to switch
-                if random.random() < 0.5:
-                    current_param_index = 1 - current_param_index  # Switch between 0 and 1
-            else:
-                # For 3 or 4 combinations: use standard soft random rules
-                if current_param_index == 0:  # Lowest H
-                    if random.random() < 0.5:
-                        current_param_index = min(1, num_params - 1)  # Move up
-                    # else: stay
-                elif current_param_index == num_params - 1:  # Highest H
-                    if random.random() < 0.5:
-                        current_param_index = max(0, num_params - 2)  # Move down
-                    # else: stay
-                else:  # Middle positions
-                    choice = random.random()
-                    if choice < 1/3:
-                        pass  # Stay
-                    elif choice < 2/3:
-                        current_param_index -= 1  # Move down
-                    else:
-                        current_param_index += 1  # Move up
-            
-            current_avg_inter_arrival = random.choice(inter_arrival_time)
-            last_change_time = current_time
-        
-        # Get current parameter
-        current_param = param_set[current_param_index]
-        
-        # Generate job size
-        job_size = math.ceil(generate_job_size(current_param, size=1)[0])
-        
-        # Generate arrival time
-        inter_arrival = round(np.random.exponential(scale=current_avg_inter_arrival))
-        inter_arrival = max(1, inter_arrival)
-        current_time += inter_arrival
-        
-        samples.append({"arrival_time": current_time, "job_size": job_size})
-    
-    return samples
+    rng = _generator(rng)
+
+    # Start with random parameter within the set; 2 parameters switch with probability 1/2,
+    # 3 or 4 follow the standard soft random rules (both are soft_transition)
+    return regime_switching_job_init(num_jobs, param_set, coherence_time, transition=soft_transition,
+                                     first_index=int(rng.integers(len(param_set))), rng=rng, chunk_size=chunk_size)
 
 def get_combination_folder_name(param_set):
     """
@@ -973,7 +802,7 @@ def Save_file(num_jobs, i):
             filename = f"{freq_folder}/quadruplet_{idx+1}_freq_{ct}.csv"
             Write_csv.Write_raw(filename, job_list)
 
-def experiment1_fixed_arrival_vary_coherence(num_jobs, fixed_inter_arrival=30, coherence_time=1):
+def experiment1_fixed_arrival_vary_coherence(num_jobs, fixed_inter_arrival=30, coherence_time=1, rng=None, chunk_size=None):
     """
     實驗1：固定到達率，改變coherence_time
 
@@ -987,40 +816,11 @@ def experiment1_fixed_arrival_vary_coherence(num_jobs, fixed_inter_arrival=30, c
     Returns:
     list: Job list with fixed arrival rate
     """
-    samples = []
-
-    # Use only BP parameters from avg_30
-    all_bp_parameters = bp_parameter_30
+    # Only change job size parameter (BP from avg_30), NOT arrival rate
+    return regime_switching_job_init(num_jobs, bp_parameter_30, coherence_time,
+                                     inter_arrival_choices=[fixed_inter_arrival], rng=rng, chunk_size=chunk_size)
 
-    # Initialize with random parameter but FIXED inter-arrival
-    current_param = random.choice(all_bp_parameters)
-    current_time = 0
-    last_change_time = 0
-
-    # Generate jobs one by one
-    for _ in range(num_jobs):
-        # Check if coherence_time has passed (based on CPU time)
-        if current_time - last_change_time >= coherence_time:
-            # Only change job size parameter, NOT arrival rate
-            current_param = random.choice(all_bp_parameters)
-            last_change_time = current_time
-
-        # Generate job size
-        job_size = math.ceil(generate_job_size(current_param, size=1)[0])
-
-        # Generate arrival time with FIXED inter-arrival
-        inter_arrival = round(np.random.exponential(scale=fixed_inter_arrival))
-        inter_arrival = max(1, inter_arrival)
-        current_time += inter_arrival
-
-        samples.append({
-            "arrival_time": current_time,
-            "job_size": job_size
-        })
-
-    return samples
-
-def experiment2_fixed_jobsize_vary_coherence(num_jobs, fixed_param_index=0, coherence_time=1):
+def experiment2_fixed_jobsize_vary_coherence(num_jobs, fixed_param_index=0, coherence_time=1, rng=None, chunk_size=None):
     """
     實驗2：固定工作大小，改變coherence_time
 
@@ -1034,40 +834,11 @@ def experiment2_fixed_jobsize_vary_coherence(num_jobs, fixed_param_index=0, cohe
     Returns:
     list: Job list with fixed job size parameter
     """
-    samples = []
-
-    # Use a fixed BP parameter
+    # Use a fixed BP parameter; only the arrival rate changes
     fixed_param = bp_parameter_30[fixed_param_index]
+    return regime_switching_job_init(num_jobs, [fixed_param], coherence_time, rng=rng, chunk_size=chunk_size)
 
-    # Initialize with random inter-arrival time
-    current_avg_inter_arrival = random.choice(inter_arrival_time)
-    current_time = 0
-    last_change_time = 0
-
-    # Generate jobs one by one
-    for _ in range(num_jobs):
-        # Check if coherence_time has passed (based on CPU time)
-        if current_time - last_change_time >= coherence_time:
-            # Only change arrival rate, NOT job size parameter
-            current_avg_inter_arrival = random.choice(inter_arrival_time)
-            last_change_time = current_time
-
-        # Generate job size with FIXED parameter
-        job_size = math.ceil(generate_job_size(fixed_param, size=1)[0])
-
-        # Generate arrival time
-        inter_arrival = round(np.random.exponential(scale=current_avg_inter_arrival))
-        inter_arrival = max(1, inter_arrival)
-        current_time += inter_arrival
-
-        samples.append({
-            "arrival_time": current_time,
-            "job_size": job_size
-        })
-
-    return samples
-
-def experiment3_record_switches(num_jobs, coherence_time=1):
+def experiment3_record_switches(num_jobs, coherence_time=1, rng=None):
     """
     實驗3：記錄參數切換歷史
 
@@ -1076,12 +847,14 @@ def experiment3_record_switches(num_jobs, coherence_time=1):
     Parameters:
     num_jobs (int): Number of jobs to generate
     coherence_time (int): Time units after which parameters may change
+    rng: numpy Generator or seed (default: seeded from np.random)
 
     Returns:
     tuple: (job_list, switch_history)
         - job_list: List of jobs with arrival_time and job_size
         - switch_history: List of parameter switches with detailed info
     """
+    rng = _generator(rng)
     samples = []
     switch_history = []
 
@@ -1089,8 +862,8 @@ def experiment3_record_switches(num_jobs, coherence_time=1):
     all_bp_parameters = bp_parameter_30
 
     # Initialize with random parameter and inter-arrival time
-    current_param = random.choice(all_bp_parameters)
-    current_avg_inter_arrival = random.choice(inter_arrival_time)
+    current_param = all_bp_parameters[rng.integers(len(all_bp_parameters))]
+    current_avg_inter_arrival = inter_arrival_time[rng.integers(len(inter_arrival_time))]
     current_time = 0
     last_change_time = 0
 
@@ -1119,8 +892,8 @@ def experiment3_record_switches(num_jobs, coherence_time=1):
             old_load = 30.0 / old_inter_arrival
 
             # Change parameters
-            current_param = random.choice(all_bp_parameters)
-            current_avg_inter_arrival = random.choice(inter_arrival_time)
+            current_param = all_bp_parameters[rng.integers(len(all_bp_parameters))]
+            current_avg_inter_arrival = inter_arrival_time[rng.integers(len(inter_arrival_time))]
 
             # Calculate new load
             new_load = 30.0 / current_avg_inter_arrival
@@ -1143,10 +916,10 @@ def experiment3_record_switches(num_jobs, coherence_time=1):
             last_change_time = current_time
 
         # Generate job size
-        job_size = math.ceil(generate_job_size(current_param, size=1)[0])
+        job_size = math.ceil(generate_job_size(current_param, size=1, rng=rng)[0])
 
         # Generate arrival time
-        inter_arrival = round(np.random.exponential(scale=current_avg_inter_arrival))
+        inter_arrival = round(rng.exponential(scale=current_avg_inter_arrival))
         inter_arrival = max(1, inter_arrival)
         current_time += inter_arrival
 
@@ -1160,7 +933,7 @@ def experiment3_record_switches(num_jobs, coherence_time=1):
 
     return samples, switch_history
 
-def experiment4_fixed_interarrival_20(num_jobs, coherence_time=1):
+def experiment4_fixed_interarrival_20(num_jobs, coherence_time=1, rng=None, chunk_size=None):
     """
     Experiment 4: Fixed inter-arrival time = 20 (Overload: ρ=1.5)
 
@@ -1174,40 +947,12 @@ def experiment4_fixed_interarrival_20(num_jobs, coherence_time=1):
     Returns:
     list: Job list with fixed arrival rate = 20
     """
-    samples = []
-
-    # Combine BP and Normal parameters from avg_30
+    # Combine BP and Normal parameters from avg_30; only job size parameters change
     all_parameters = bp_parameter_30 + normal_parameter_30
+    return regime_switching_job_init(num_jobs, all_parameters, coherence_time,
+                                     inter_arrival_choices=[20], rng=rng, chunk_size=chunk_size)
 
-    # Initialize with random parameter but FIXED inter-arrival = 20
-    current_param = random.choice(all_parameters)
-    current_time = 0
-    last_change_time = 0
-
-    # Generate jobs one by one
-    for _ in range(num_jobs):
-        # Check if coherence_time has passed (based on CPU time)
-        if current_time - last_change_time >= coherence_time:
-            # Only change job size parameter, NOT arrival rate
-            current_param = random.choice(all_parameters)
-            last_change_time = current_time
-
-        # Generate job size (can be BP or Normal)
-        job_size = math.ceil(generate_job_size(current_param, size=1)[0])
-
-        # Generate arrival time with FIXED inter-arrival = 20
-        inter_arrival = round(np.random.exponential(scale=20))
-        inter_arrival = max(1, inter_arrival)
-        current_time += inter_arrival
-
-        samples.append({
-            "arrival_time": current_time,
-            "job_size": job_size
-        })
-
-    return samples
-
-def experiment5_fixed_interarrival_30(num_jobs, coherence_time=1):
+def experiment5_fixed_interarrival_30(num_jobs, coherence_time=1, rng=None, chunk_size=None):
     """
     Experiment 5: Fixed inter-arrival time = 30 (Balanced: ρ=1.0)
 
@@ -1221,40 +966,12 @@ def experiment5_fixed_interarrival_30(num_jobs, coherence_time=1):
     Returns:
     list: Job list with fixed arrival rate = 30
     """
-    samples = []
-
-    # Combine BP and Normal parameters from avg_30
+    # Combine BP and Normal parameters from avg_30; only job size parameters change
     all_parameters = bp_parameter_30 + normal_parameter_30
+    return regime_switching_job_init(num_jobs, all_parameters, coherence_time,
+                                     inter_arrival_choices=[30], rng=rng, chunk_size=chunk_size)
 
-    # Initialize with random parameter but FIXED inter-arrival = 30
-    current_param = random.choice(all_parameters)
-    current_time = 0
-    last_change_time = 0
-
-    # Generate jobs one by one
-    for _ in range(num_jobs):
-        # Check if coherence_time has passed (based on CPU time)
-        if current_time - last_change_time >= coherence_time:
-            # Only change job size parameter, NOT arrival rate
-            current_param = random.choice(all_parameters)
-            last_change_time = current_time
-
-        # Generate job size (can be BP or Normal)
-        job_size = math.ceil(generate_job_size(current_param, size=1)[0])
-
-        # Generate arrival time with FIXED inter-arrival = 30
-        inter_arrival = round(np.random.exponential(scale=30))
-        inter_arrival = max(1, inter_arrival)
-        current_time += inter_arrival
-
-        samples.append({
-            "arrival_time": current_time,
-            "job_size": job_size
-        })
-
-    return samples
-
-def experiment6_fixed_interarrival_40(num_jobs, coherence_time=1):
+def experiment6_fixed_interarrival_40(num_jobs, coherence_time=1, rng=None, chunk_size=None):
     """
     Experiment 6: Fixed inter-arrival time = 40 (Stable: ρ=0.75)
 
@@ -1268,40 +985,12 @@ def experiment6_fixed_interarrival_40(num_jobs, coherence_time=1):
     Returns:
     list: Job list with fixed arrival rate = 40
     """
-    samples = []
-
-    # Combine BP and Normal parameters from avg_30
+    # Combine BP and Normal parameters from avg_30; only job size parameters change
     all_parameters = bp_parameter_30 + normal_parameter_30
+    return regime_switching_job_init(num_jobs, all_parameters, coherence_time,
+                                     inter_arrival_choices=[40], rng=rng, chunk_size=chunk_size)
 
-    # Initialize with random parameter but FIXED inter-arrival = 40
-    current_param = random.choice(all_parameters)
-    current_time = 0
-    last_change_time = 0
-
-    # Generate jobs one by one
-    for _ in range(num_jobs):
-        # Check if coherence_time has passed (based on CPU time)
-        if current_time - last_change_time >= coherence_time:
-            # Only change job size parameter, NOT arrival rate
-            current_param = random.choice(all_parameters)
-            last_change_time = current_time
-
-        # Generate job size (can be BP or Normal)
-        job_size = math.ceil(generate_job_size(current_param, size=1)[0])
-
-        # Generate arrival time with FIXED inter-arrival = 40
-        inter_arrival = round(np.random.exponential(scale=40))
-        inter_arrival = max(1, inter_arrival)
-        current_time += inter_arrival
-
-        samples.append({
-            "arrival_time": current_time,
-            "job_size": job_size
-        })
-
-    return samples
-
-def combination_fixed_arrival_job_init(num_jobs, param_set, fixed_inter_arrival, coherence_time=1):
+def combination_fixed_arrival_job_init(num_jobs, param_set, fixed_inter_arrival, coherence_time=1, rng=None, chunk_size=None):
     """
     Create jobs with FIXED inter-arrival time but RANDOM parameter switching.
     Similar to combination_random_job_init but with fixed arrival rate.
@@ -1315,31 +1004,8 @@ def combination_fixed_arrival_job_init(num_jobs, param_set, fixed_inter_arrival,
     Returns:
     list: Job list with fixed arrival rate but random parameter switching
     """
-    samples = []
-
-    # Initialize with random parameter from the set
-    current_param = random.choice(param_set)
-    current_time = 0
-    last_change_time = 0
-
-    # Generate jobs one by one
-    for _ in range(num_jobs):
-        # Check if coherence_time has passed (based on CPU time)
-        if current_time - last_change_time >= coherence_time:
-            current_param = random.choice(param_set)  # Switch parameter
-            last_change_time = current_time
-
-        # Generate job size using current parameter
-        job_size = math.ceil(generate_job_size(current_param, size=1)[0])
-
-        # Generate arrival time with FIXED inter-arrival
-        inter_arrival = round(np.random.exponential(scale=fixed_inter_arrival))
-        inter_arrival = max(1, inter_arrival)
-        current_time += inter_arrival
-
-        samples.append({"arrival_time": current_time, "job_size": job_size})
-
-    return samples
+    return regime_switching_job_init(num_jobs, param_set, coherence_time,
+                                     inter_arrival_choices=[fixed_inter_arrival], rng=rng, chunk_size=chunk_size)
 
 
 def Save_fix_combination_files(num_jobs, num_replications=10):
@@ -1742,13 +1408,17 @@ if __name__ == "__main__":
                        help='固定到達率實驗的重複次數')
     parser.add_argument('--output', type=str, default='test_results.csv',
                        help='測試結果輸出文件名')
+    parser.add_argument('--seed', type=int, default=None,
+                       help='生成數據的根隨機種子（用於複現）')
+    parser.add_argument('--workers', type=int, default=None,
+                       help='生成數據的並行進程數（默認 CPU 核數）')
 
     args = parser.parse_args()
 
     if args.mode == 'generate':
-        # 原始的數據生成模式
-        for i in range(1, 11):
-            Save_file(10000, i)
+        # 原始的數據生成模式（與 Save_file(10000, i), i = 1..10 相同的檔案，並行生成）
+        from experiments.generation_engine import generate_save_file_datasets
+        generate_save_file_datasets(10000, range(1, 11), seed=args.seed, n_workers=args.workers)
 
     elif args.mode == 'fix_combination':
         # 固定到達率組合實驗資料生成
@@ -3,4 +3,16 @@ import pandas as pd
 def Write_raw(filename,source):
     pd.DataFrame(source).to_csv(filename, index=None)
 def Write(filename,source):
-    pd.DataFrame(source).to_csv(filename, index=None)
\ No newline at end of file
+    pd.DataFrame(source).to_csv(filename, index=None)
+def Write_chunks(filename,chunks):
+    # Stream (arrival_times, job_sizes) chunks to one CSV (same format as Write_raw), one chunk in memory at a time
+    header = True
+    num_jobs = 0
+    with open(filename, 'w', newline='') as f:
+        for arrival_times, job_sizes in chunks:
+            pd.DataFrame({"arrival_time": arrival_times, "job_size": job_sizes}).to_csv(f, index=None, header=header)
+            header = False
+            num_jobs += len(arrival_times)
+        if header:
+            f.write("arrival_time,job_size\n")
+    return num_jobs
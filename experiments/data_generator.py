@@ -4,14 +4,16 @@
 """
 
 import numpy as np
-import math
 from typing import List, Dict
 
+# 流式生成每块的工作数量（两个 int64 数组各 512 KB）
+DEFAULT_CHUNK_SIZE = 2**16
+
 # ============================================================================
 # 分布生成函数
 # ============================================================================
 
-def generate_bounded_pareto(alpha, xmin, xmax, size=1):
+def generate_bounded_pareto(alpha, xmin, xmax, size=1, rng=None):
     """
     生成 Bounded Pareto 分布的随机值
 
@@ -20,16 +22,18 @@ def generate_bounded_pareto(alpha, xmin, xmax, size=1):
     - xmin: 最小值 (L)
     - xmax: 最大值 (H)
     - size: 生成数量
+    - rng: numpy Generator（默认使用全局 np.random）
 
     Returns:
     - 数组: Bounded Pareto 分布的随机值
     """
+    rng = np.random if rng is None else rng
     cdf_xmin = 1 - (xmin / xmax) ** alpha
-    u = np.random.uniform(0, cdf_xmin, size=size)
+    u = rng.uniform(0, cdf_xmin, size=size)
     x = xmin / ((1 - u) ** (1 / alpha))
     return x
 
-def generate_normal(mean, std, size=1):
+def generate_normal(mean, std, size=1, rng=None):
     """
     生成 Normal 分布的随机值（截断为正值）
 
@@ -37,30 +41,33 @@ def generate_normal(mean, std, size=1):
     - mean: 平均值
     - std: 标准差
     - size: 生成数量
+    - rng: numpy Generator（默认使用全局 np.random）
 
     Returns:
     - 数组: Normal 分布的随机值（最小为1）
     """
-    samples = np.random.normal(mean, std, size=size)
+    rng = np.random if rng is None else rng
+    samples = rng.normal(mean, std, size=size)
     # 确保所有值为正（最小工作大小 = 1）
     samples = np.maximum(samples, 1)
     return samples
 
-def generate_job_size(param, size=1):
+def generate_job_size(param, size=1, rng=None):
     """
     根据参数类型生成工作大小
 
     Parameters:
     - param: 参数字典（包含 type, L/H 或 mean/std）
     - size: 生成数量
+    - rng: numpy Generator（默认使用全局 np.random）
 
     Returns:
     - 数组: 工作大小
     """
     if param["type"] == "BP":
-        return generate_bounded_pareto(1.1, param["L"], param["H"], size=size)
+        return generate_bounded_pareto(1.1, param["L"], param["H"], size=size, rng=rng)
     elif param["type"] == "Normal":
-        return generate_normal(param["mean"], param["std"], size=size)
+        return generate_normal(param["mean"], param["std"], size=size, rng=rng)
     else:
         raise ValueError(f"Unknown parameter type: {param['type']}")
 
@@ -68,7 +75,43 @@ def generate_job_size(param, size=1):
 # 工作生成函数
 # ============================================================================
 
-def generate_jobs_fixed_arrival(num_jobs, fixed_mean_arrival, param, coherence_time=1):
+def _job_list(chunks):
+    """把 (arrival_times, job_sizes) 块合并为工作列表"""
+    jobs = []
+    for arrival_times, job_sizes in chunks:
+        jobs.extend({"arrival_time": a, "job_size": s}
+                    for a, s in zip(arrival_times.tolist(), job_sizes.tolist()))
+    return jobs
+
+def iter_jobs_fixed_arrival(num_jobs, fixed_mean_arrival, param, coherence_time=1,
+                            chunk_size=DEFAULT_CHUNK_SIZE, rng=None):
+    """
+    generate_jobs_fixed_arrival 的流式版本：逐块产生 (arrival_times, job_sizes) int64 数组，
+    每块最多 chunk_size 个工作，时钟跨块延续，内存占用与总工作数无关
+
+    Parameters:
+    - num_jobs: 工作数量
+    - fixed_mean_arrival: 固定的平均到达时间间隔
+    - param: 单一参数（BP 或 Normal）
+    - coherence_time: 参数切换间隔（单一参数时不影响结果）
+    - chunk_size: 每块工作数量
+    - rng: numpy Generator（默认使用全局 np.random）
+    """
+    rng = np.random if rng is None else rng
+    current_time = 0
+    for start in range(0, num_jobs, chunk_size):
+        n = min(chunk_size, num_jobs - start)
+
+        # 使用固定参数批量生成工作大小
+        job_sizes = np.ceil(generate_job_size(param, size=n, rng=rng)).astype(np.int64)
+
+        # 生成到达时间（指数分布，间隔至少为1）
+        inter_arrivals = np.rint(rng.exponential(scale=fixed_mean_arrival, size=n)).astype(np.int64)
+        arrival_times = current_time + np.cumsum(np.maximum(inter_arrivals, 1))
+        current_time = int(arrival_times[-1])
+        yield arrival_times, job_sizes
+
+def generate_jobs_fixed_arrival(num_jobs, fixed_mean_arrival, param, coherence_time=1, rng=None):
     """
     生成固定到达率的工作序列
 
@@ -82,31 +125,68 @@ def generate_jobs_fixed_arrival(num_jobs, fixed_mean_arrival, param, coherence_t
     - fixed_mean_arrival: 固定的平均到达时间间隔
     - param: 单一参数（BP 或 Normal）
     - coherence_time: 参数切换间隔（基于 CPU 时间）
+    - rng: numpy Generator（默认使用全局 np.random）
 
     Returns:
     - jobs: 工作列表 [{"arrival_time": int, "job_size": int}, ...]
     """
-    jobs = []
-    current_time = 0
-
-    # 使用固定参数生成所有工作
-    for _ in range(num_jobs):
-        # 生成工作大小
-        job_size = math.ceil(generate_job_size(param, size=1)[0])
+    # 一整块生成所有工作
+    return _job_list(iter_jobs_fixed_arrival(num_jobs, fixed_mean_arrival, param, coherence_time,
+                                             max(num_jobs, 1), rng))
 
-        # 生成到达时间（指数分布）
-        inter_arrival = round(np.random.exponential(scale=fixed_mean_arrival))
-        inter_arrival = max(1, inter_arrival)  # 确保至少为1
-        current_time += inter_arrival
+def iter_jobs_switching_params(num_jobs, fixed_mean_arrival, all_params, coherence_time=1,
+                               chunk_size=DEFAULT_CHUNK_SIZE, rng=None):
+    """
+    generate_jobs_switching_params 的流式版本：逐块产生 (arrival_times, job_sizes) int64 数组
 
-        jobs.append({
-            "arrival_time": current_time,
-            "job_size": job_size
-        })
+    - 每块的随机数批量生成（到达间隔、每个工作位置一个切换用的均匀数）
+    - 标量扫描找出切换点（切换时刻取决于到达间隔），当前参数与时钟跨块延续
+    - 工作大小按参数分批生成
 
-    return jobs
+    Parameters:
+    - num_jobs: 工作数量
+    - fixed_mean_arrival: 固定的平均到达时间间隔
+    - all_params: 参数列表（从中随机选择）
+    - coherence_time: 参数切换间隔
+    - chunk_size: 每块工作数量
+    - rng: numpy Generator（默认使用全局 np.random）
+    """
+    rng = np.random if rng is None else rng
+    num_params = len(all_params)
+    current_time = 0
+    last_change_time = 0
 
-def generate_jobs_switching_params(num_jobs, fixed_mean_arrival, all_params, coherence_time=1):
+    # 初始化参数
+    current_index = int(rng.random() * num_params)
+
+    for start in range(0, num_jobs, chunk_size):
+        n = min(chunk_size, num_jobs - start)
+        exponentials = rng.standard_exponential(n).tolist()
+        picks = rng.random(n).tolist()
+
+        arrival_times = [0] * n
+        param_index = [0] * n
+        for k in range(n):
+            # 检查是否需要切换参数
+            if current_time - last_change_time >= coherence_time:
+                current_index = int(picks[k] * num_params)
+                last_change_time = current_time
+
+            # 生成到达时间
+            inter_arrival = round(fixed_mean_arrival * exponentials[k])
+            current_time += inter_arrival if inter_arrival > 1 else 1
+            arrival_times[k] = current_time
+            param_index[k] = current_index
+
+        # 按参数分批生成工作大小
+        param_index = np.array(param_index, dtype=np.int64)
+        job_sizes = np.empty(n, dtype=np.float64)
+        for p in np.unique(param_index):
+            mask = param_index == p
+            job_sizes[mask] = generate_job_size(all_params[p], size=int(mask.sum()), rng=rng)
+        yield np.array(arrival_times, dtype=np.int64), np.ceil(job_sizes).astype(np.int64)
+
+def generate_jobs_switching_params(num_jobs, fixed_mean_arrival, all_params, coherence_time=1, rng=None):
     """
     生成固定到达率、参数切换的工作序列
 
@@ -119,37 +199,13 @@ def generate_jobs_switching_params(num_jobs, fixed_mean_arrival, all_params, coh
     - fixed_mean_arrival: 固定的平均到达时间间隔
     - all_params: 参数列表（从中随机选择）
     - coherence_time: 参数切换间隔
+    - rng: numpy Generator（默认使用全局 np.random）
 
     Returns:
     - jobs: 工作列表
     """
-    jobs = []
-    current_time = 0
-    last_change_time = 0
-
-    # 初始化参数
-    current_param = np.random.choice(all_params)
-
-    for _ in range(num_jobs):
-        # 检查是否需要切换参数
-        if current_time - last_change_time >= coherence_time:
-            current_param = np.random.choice(all_params)
-            last_change_time = current_time
-
-        # 生成工作大小
-        job_size = math.ceil(generate_job_size(current_param, size=1)[0])
-
-        # 生成到达时间
-        inter_arrival = round(np.random.exponential(scale=fixed_mean_arrival))
-        inter_arrival = max(1, inter_arrival)
-        current_time += inter_arrival
-
-        jobs.append({
-            "arrival_time": current_time,
-            "job_size": job_size
-        })
-
-    return jobs
+    return _job_list(iter_jobs_switching_params(num_jobs, fixed_mean_arrival, all_params, coherence_time,
+                                                max(num_jobs, 1), rng))
 
 # ============================================================================
 # 数据分析函数
@@ -5,8 +5,6 @@
 
 import os
 import sys
-import tqdm
-import pandas as pd
 from typing import Dict, List
 
 # 添加父目录到路径
@@ -22,7 +20,8 @@ from experiments.config import (
     NUM_REPLICATIONS,
     DATA_DIR
 )
-from experiments.data_generator import generate_jobs_fixed_arrival, analyze_jobs
+from experiments.data_generator import generate_jobs_fixed_arrival
+from experiments.generation_engine import expand_fixed_arrival_tasks, fixed_arrival_filename, generate_datasets
 import Write_csv
 
 # ============================================================================
@@ -30,7 +29,7 @@ import Write_csv
 # ============================================================================
 
 def generate_fixed_arrival_experiment(arrival_rate_name, arrival_rate_value,
-                                      param, coherence_time, replication_id):
+                                      param, coherence_time, replication_id, rng=None):
     """
     生成单个固定到达率实验数据
 
@@ -40,38 +39,31 @@ def generate_fixed_arrival_experiment(arrival_rate_name, arrival_rate_value,
     - param: 分布参数字典
     - coherence_time: coherence time 值
     - replication_id: 重复实验编号 (1-10)
+    - rng: numpy Generator（默认使用全局 np.random）
 
     Returns:
     - jobs: 工作列表
     - filename: 保存的文件路径
     """
     # 创建输出目录
-    exp_dir = os.path.join(
-        DATA_DIR,
-        f"fixed_arrival_{arrival_rate_name}_{replication_id}",
-        f"param_{param['name']}",
-        f"coherence_{coherence_time}"
-    )
-    os.makedirs(exp_dir, exist_ok=True)
+    filename = fixed_arrival_filename(DATA_DIR, arrival_rate_name, param, coherence_time, replication_id)
+    os.makedirs(os.path.dirname(filename), exist_ok=True)
 
     # 生成工作
     jobs = generate_jobs_fixed_arrival(
         num_jobs=NUM_JOBS,
         fixed_mean_arrival=arrival_rate_value,
         param=param,
-        coherence_time=coherence_time
+        coherence_time=coherence_time,
+        rng=rng
     )
 
     # 保存文件
-    filename = os.path.join(
-        exp_dir,
-        f"fixed_arrival_{arrival_rate_name}_{param['name']}_ct{coherence_time}.csv"
-    )
     Write_csv.Write_raw(filename, jobs)
 
     return jobs, filename
 
-def generate_all_experiments():
+def generate_all_experiments(seed=None, n_workers=None):
     """
     生成所有固定到达率实验的数据
 
@@ -81,6 +73,13 @@ def generate_all_experiments():
     - 16 个 coherence times (2^1 to 2^16)
     - 10 次重复
     - 总计：3 × 10 × 16 × 10 = 4,800 个数据集
+
+    每个数据集是 generation_engine 的一个任务，有独立的 SeedSequence 随机流，
+    在进程池上并行生成；相同 seed 在任意 n_workers 下结果相同。
+
+    Parameters:
+    - seed: 根种子（None 时使用新的熵）
+    - n_workers: 进程数（默认 CPU 核数）
     """
     print("=" * 70)
     print("固定到达率实验 - 数据生成")
@@ -92,60 +91,14 @@ def generate_all_experiments():
     print(f"总数据集: {len(FIXED_ARRIVAL_RATES) * len(ALL_PARAMETERS) * len(COHERENCE_TIMES) * NUM_REPLICATIONS}")
     print("=" * 70)
 
-    # 统计信息
-    total_generated = 0
-    stats_summary = []
-
-    # 遍历所有配置
-    for rep_id in range(1, NUM_REPLICATIONS + 1):
-        print(f"\n【重复 {rep_id}/{NUM_REPLICATIONS}】")
-
-        for arrival_name, arrival_value in FIXED_ARRIVAL_RATES.items():
-            theoretical_rho = 30 / arrival_value
-            print(f"\n  负载条件: {arrival_name} (arrival={arrival_value}, ρ={theoretical_rho:.2f})")
-
-            for param in tqdm.tqdm(ALL_PARAMETERS, desc=f"  参数"):
-                for ct in COHERENCE_TIMES:
-                    try:
-                        jobs, filename = generate_fixed_arrival_experiment(
-                            arrival_rate_name=arrival_name,
-                            arrival_rate_value=arrival_value,
-                            param=param,
-                            coherence_time=ct,
-                            replication_id=rep_id
-                        )
-
-                        # 分析统计
-                        stats = analyze_jobs(jobs)
-                        stats_summary.append({
-                            "replication": rep_id,
-                            "arrival_name": arrival_name,
-                            "arrival_value": arrival_value,
-                            "param_name": param["name"],
-                            "param_type": param["type"],
-                            "coherence_time": ct,
-                            "theoretical_rho": theoretical_rho,
-                            "estimated_rho": stats["estimated_rho"],
-                            "mean_job_size": stats["job_size_mean"],
-                            "mean_inter_arrival": stats["inter_arrival_mean"],
-                            "num_jobs": stats["num_jobs"],
-                            "filename": filename
-                        })
-
-                        total_generated += 1
-
-                    except Exception as e:
-                        print(f"\n    错误：{param['name']}, ct={ct}: {e}")
-                        continue
-
-    # 保存统计摘要
+    # 展开任务并并行生成，统计摘要按任务顺序合并
     summary_file = os.path.join(DATA_DIR, "experiment_generation_summary.csv")
-    df_summary = pd.DataFrame(stats_summary)
-    df_summary.to_csv(summary_file, index=False)
+    tasks = expand_fixed_arrival_tasks(NUM_JOBS, NUM_REPLICATIONS, DATA_DIR)
+    df_summary = generate_datasets(tasks, seed=seed, n_workers=n_workers, summary_file=summary_file)
 
     print("\n" + "=" * 70)
     print(f"✓ 数据生成完成！")
-    print(f"  成功生成: {total_generated} 个数据集")
+    print(f"  成功生成: {len(df_summary)} 个数据集")
     print(f"  统计摘要: {summary_file}")
     print("=" * 70)
 
@@ -199,13 +152,17 @@ def main():
                        help='生成小规模测试数据集')
     parser.add_argument('--full', action='store_true',
                        help='生成完整数据集')
+    parser.add_argument('--seed', type=int, default=None,
+                       help='根随机种子（用于复现）')
+    parser.add_argument('--workers', type=int, default=None,
+                       help='并行进程数（默认 CPU 核数）')
 
     args = parser.parse_args()
 
     if args.test:
         generate_test_subset()
     elif args.full:
-        generate_all_experiments()
+        generate_all_experiments(seed=args.seed, n_workers=args.workers)
     else:
         print("请指定运行模式：")
         print("  --test  : 生成测试数据集")
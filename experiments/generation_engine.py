@@ -0,0 +1,254 @@
+"""
+数据集生成引擎
+把整个数据集网格展开成独立任务，用进程池并行生成
+
+- 每个任务从 SeedSequence(seed).spawn() 得到自己的随机流（按任务在网格中的位置分配），
+  不再使用全局 np.random / random 状态，所以任意 worker 数量下输出都逐位相同
+- 每个任务写出自己的 CSV 并返回统计行，最后按任务顺序合并为 experiment_generation_summary.csv
+- 单个任务出错只记录为错误行并打印，不影响其余任务和统计摘要
+"""
+
+import os
+import sys
+import tqdm
+import numpy as np
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
+
+# 添加父目录到路径
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+from experiments.config import (
+    FIXED_ARRIVAL_RATES,
+    COHERENCE_TIMES,
+    ALL_PARAMETERS,
+    NUM_JOBS,
+    NUM_REPLICATIONS,
+    DATA_DIR
+)
+from experiments.data_generator import generate_jobs_fixed_arrival, analyze_jobs
+import Job_init
+import Write_csv
+
+# ============================================================================
+# 生成函数注册表
+# ============================================================================
+# 任务只记录函数名和参数（可 pickle），worker 在这里查找函数；每个函数都接受 rng 参数
+GENERATORS = {
+    "generate_jobs_fixed_arrival": generate_jobs_fixed_arrival,
+    "bounded_pareto_random_job_init": Job_init.bounded_pareto_random_job_init,
+    "normal_random_job_init": Job_init.normal_random_job_init,
+    "bounded_pareto_soft_random_job_init": Job_init.bounded_pareto_soft_random_job_init,
+    "normal_soft_random_job_init": Job_init.normal_soft_random_job_init,
+    "experiment1_fixed_arrival_vary_coherence": Job_init.experiment1_fixed_arrival_vary_coherence,
+    "experiment2_fixed_jobsize_vary_coherence": Job_init.experiment2_fixed_jobsize_vary_coherence,
+    "experiment3_record_switches": Job_init.experiment3_record_switches,
+    "experiment4_fixed_interarrival_20": Job_init.experiment4_fixed_interarrival_20,
+    "experiment5_fixed_interarrival_30": Job_init.experiment5_fixed_interarrival_30,
+    "experiment6_fixed_interarrival_40": Job_init.experiment6_fixed_interarrival_40,
+    "combination_random_job_init": Job_init.combination_random_job_init,
+    "combination_softrandom_job_init": Job_init.combination_softrandom_job_init,
+}
+
+def make_task(generator, kwargs, filename, **info):
+    """
+    一个生成任务
+
+    Parameters:
+    - generator: GENERATORS 中的函数名
+    - kwargs: 生成函数参数（不含 rng）
+    - filename: 输出 CSV 路径
+    - info: 写入统计摘要的额外字段（replication、coherence_time 等）
+    """
+    return {"generator": generator, "kwargs": kwargs, "filename": filename, "info": info}
+
+# ============================================================================
+# 网格展开
+# ============================================================================
+
+def fixed_arrival_filename(data_dir, arrival_rate_name, param, coherence_time, replication_id):
+    """固定到达率实验的输出路径（与 generate_fixed_arrival_experiment 一致）"""
+    return os.path.join(
+        data_dir,
+        f"fixed_arrival_{arrival_rate_name}_{replication_id}",
+        f"param_{param['name']}",
+        f"coherence_{coherence_time}",
+        f"fixed_arrival_{arrival_rate_name}_{param['name']}_ct{coherence_time}.csv"
+    )
+
+def expand_fixed_arrival_tasks(num_jobs=NUM_JOBS, num_replications=NUM_REPLICATIONS, data_dir=DATA_DIR):
+    """
+    固定到达率实验网格：重复 × 负载条件 × 参数 × coherence time
+    （默认 10 × 3 × 10 × 16 = 4,800 个任务，顺序与原来的串行循环相同）
+    """
+    tasks = []
+    for rep_id in range(1, num_replications + 1):
+        for arrival_name, arrival_value in FIXED_ARRIVAL_RATES.items():
+            for param in ALL_PARAMETERS:
+                for ct in COHERENCE_TIMES:
+                    tasks.append(make_task(
+                        "generate_jobs_fixed_arrival",
+                        {"num_jobs": num_jobs, "fixed_mean_arrival": arrival_value,
+                         "param": param, "coherence_time": ct},
+                        fixed_arrival_filename(data_dir, arrival_name, param, ct, rep_id),
+                        replication=rep_id,
+                        arrival_name=arrival_name,
+                        arrival_value=arrival_value,
+                        param_name=param["name"],
+                        param_type=param["type"],
+                        coherence_time=ct,
+                        theoretical_rho=30 / arrival_value
+                    ))
+    return tasks
+
+def sequential_combinations(params, k):
+    """相邻的 k 个参数组合，例如 k=2: [p0,p1], [p1,p2], ...（Save_file 使用的组合）"""
+    return [params[j:j + k] for j in range(len(params) - k + 1)]
+
+def expand_save_file_tasks(num_jobs, replications=range(1, 11), data_dir="data"):
+    """
+    Job_init.Save_file 的数据网格，文件路径与 Save_file 完全相同：
+    - BP / Normal 的 random 与 soft random
+    - 实验 1-6（实验 3 另外写出参数切换记录）
+    - BP / Normal 相邻 2/3/4 组合的 combination_random 与 combination_softrandom
+    每个都覆盖 2^1 到 2^16 的 coherence time
+    """
+    coherence_times = [pow(2, j) for j in range(1, 17, 1)]
+    combination_sets = [
+        ("two", "pair", 2),
+        ("three", "triplet", 3),
+        ("four", "quadruplet", 4),
+    ]
+
+    tasks = []
+    for i in replications:
+        def add(generator, kwargs, folder, csv_name, ct, group):
+            tasks.append(make_task(generator, dict(kwargs, num_jobs=num_jobs, coherence_time=ct),
+                                   f"{folder}/{csv_name}", replication=i, group=group, coherence_time=ct))
+
+        for generator, name in (("bounded_pareto_random_job_init", "Bounded_Pareto_random"),
+                                ("normal_random_job_init", "normal_random"),
+                                ("bounded_pareto_soft_random_job_init", "Bounded_Pareto_softrandom"),
+                                ("normal_soft_random_job_init", "normal_softrandom")):
+            for ct in coherence_times:
+                add(generator, {}, f"{data_dir}/{name}_{i}/freq_{ct}_{i}", f"{name}_freq_{ct}.csv", ct, name)
+
+        for ct in coherence_times:
+            add("experiment1_fixed_arrival_vary_coherence", {"fixed_inter_arrival": 30},
+                f"{data_dir}/experiment1_fixed_arrival_{i}/freq_{ct}_{i}",
+                f"exp1_fixed_arrival_freq_{ct}.csv", ct, "experiment1_fixed_arrival")
+
+        for param_idx, param in enumerate(Job_init.bp_parameter_30):
+            param_folder = f"{data_dir}/experiment2_fixed_jobsize_{i}/param_L{param['L']:.3f}_H{int(param['H'])}"
+            for ct in coherence_times:
+                add("experiment2_fixed_jobsize_vary_coherence", {"fixed_param_index": param_idx},
+                    f"{param_folder}/freq_{ct}_{i}",
+                    f"exp2_fixed_jobsize_param{param_idx}_freq_{ct}.csv", ct, "experiment2_fixed_jobsize")
+
+        for ct in coherence_times:
+            add("experiment3_record_switches", {},
+                f"{data_dir}/experiment3_record_switches_{i}/freq_{ct}_{i}",
+                f"exp3_jobs_freq_{ct}.csv", ct, "experiment3_record_switches")
+
+        for exp_id, arrival in ((4, 20), (5, 30), (6, 40)):
+            generator = f"experiment{exp_id}_fixed_interarrival_{arrival}"
+            for ct in coherence_times:
+                add(generator, {}, f"{data_dir}/experiment{exp_id}_fixed_arrival_{arrival}_{i}/freq_{ct}_{i}",
+                    f"exp{exp_id}_fixed_arrival{arrival}_freq_{ct}.csv", ct, f"experiment{exp_id}_fixed_arrival_{arrival}")
+
+        for mode in ("random", "softrandom"):
+            for family, params in (("Bounded_Pareto", Job_init.bp_parameter_30),
+                                   ("normal", Job_init.normal_parameter_30)):
+                base = f"{data_dir}/{family}_combination_{mode}_{i}"
+                for size_name, file_prefix, k in combination_sets:
+                    for idx, param_set in enumerate(sequential_combinations(params, k)):
+                        combo_name = Job_init.get_combination_folder_name(param_set)
+                        for ct in coherence_times:
+                            add(f"combination_{mode}_job_init", {"param_set": param_set},
+                                f"{base}/{size_name}_combination_{combo_name}/freq_{ct}_{i}",
+                                f"{file_prefix}_{idx+1}_freq_{ct}.csv", ct, f"{family}_combination_{mode}")
+    return tasks
+
+# ============================================================================
+# 执行
+# ============================================================================
+
+def run_task(task, seed_sequence):
+    """
+    Worker：用任务自己的随机流生成工作，写出 CSV，返回统计行
+    出错时不抛出异常（否则整个进程池中止），而是返回带 "error" 字段的行
+    """
+    filename = task["filename"]
+    try:
+        rng = np.random.default_rng(seed_sequence)
+        result = GENERATORS[task["generator"]](**task["kwargs"], rng=rng)
+
+        os.makedirs(os.path.dirname(filename) or ".", exist_ok=True)
+        if task["generator"] == "experiment3_record_switches":
+            jobs, switch_history = result
+            if switch_history:
+                switch_filename = filename.replace("exp3_jobs_", "exp3_switches_")
+                pd.DataFrame(switch_history).to_csv(switch_filename, index=False)
+        else:
+            jobs = result
+        Write_csv.Write_raw(filename, jobs)
+
+        # num_jobs=0 时 analyze_jobs 返回空字典
+        stats = analyze_jobs(jobs)
+        return {
+            **task["info"],
+            "estimated_rho": stats.get("estimated_rho", np.nan),
+            "mean_job_size": stats.get("job_size_mean", np.nan),
+            "mean_inter_arrival": stats.get("inter_arrival_mean", np.nan),
+            "num_jobs": stats.get("num_jobs", 0),
+            "filename": filename
+        }
+    except Exception as e:
+        return {**task["info"], "filename": filename, "error": f"{type(e).__name__}: {e}"}
+
+def generate_datasets(tasks, seed=None, n_workers=None, summary_file=None):
+    """
+    并行执行生成任务
+
+    Parameters:
+    - tasks: make_task 生成的任务列表
+    - seed: 根种子；第 i 个任务使用 SeedSequence(seed).spawn(len(tasks))[i]，
+      相同的 seed 与任务列表在任意 n_workers 下生成逐位相同的文件。
+      None 时使用新的熵，并打印出来以便复现
+    - n_workers: 进程数（默认 CPU 核数；1 时在当前进程执行）
+    - summary_file: 统计摘要 CSV 路径（None 时不写）
+
+    Returns:
+    - df_summary: 成功任务的统计摘要（按任务顺序）；失败的任务逐个打印，不写入摘要
+    """
+    root = np.random.SeedSequence(seed)
+    if seed is None:
+        print(f"  随机种子 (entropy): {root.entropy}")
+    seeds = root.spawn(len(tasks))
+
+    n_workers = n_workers or os.cpu_count() or 1
+    if n_workers == 1 or len(tasks) <= 1:
+        rows = [run_task(task, s) for task, s in tqdm.tqdm(zip(tasks, seeds), total=len(tasks), desc="  生成")]
+    else:
+        chunksize = max(1, len(tasks) // (n_workers * 16))
+        with ProcessPoolExecutor(max_workers=n_workers) as executor:
+            rows = list(tqdm.tqdm(executor.map(run_task, tasks, seeds, chunksize=chunksize),
+                                  total=len(tasks), desc="  生成"))
+
+    failed = [row for row in rows if "error" in row]
+    for row in failed:
+        print(f"\n    错误：{row['filename']}: {row['error']}")
+    if failed:
+        print(f"  失败: {len(failed)} 个数据集")
+
+    df_summary = pd.DataFrame([row for row in rows if "error" not in row])
+    if summary_file is not None:
+        os.makedirs(os.path.dirname(summary_file) or ".", exist_ok=True)
+        df_summary.to_csv(summary_file, index=False)
+    return df_summary
+
+def generate_save_file_datasets(num_jobs, replications=range(1, 11), seed=None, n_workers=None, data_dir="data"):
+    """Job_init.Save_file 的所有重复，并行生成；摘要写入 <data_dir>/experiment_generation_summary.csv"""
+    tasks = expand_save_file_tasks(num_jobs, replications, data_dir)
+    return generate_datasets(tasks, seed=seed, n_workers=n_workers,
+                             summary_file=os.path.join(data_dir, "experiment_generation_summary.csv"))